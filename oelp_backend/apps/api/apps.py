@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+
+
+class ApiConfig(AppConfig):
+    name = "apps.api"
+    label = "api"
+
+    def ready(self) -> None:
+        # Connect cache invalidation receivers in every process, not only once views load
+        from . import catalog_cache  # noqa: F401
+        from . import entitlements  # noqa: F401
+        from . import notification_stream  # noqa: F401
+        from . import recommendations  # noqa: F401
+        from . import role_cache  # noqa: F401
+        from . import token_cache  # noqa: F401
@@ -0,0 +1,110 @@
+"""Async variants of the hottest API views, for serving under ``oelp_backend.asgi``.
+
+DRF views are sync-only, so these are plain Django async views that reuse
+the API's token auth, serializers and pagination. Serializers only ever see
+rows loaded with the async ORM (related rows via ``select_related``), so
+serialization never touches the database from the event loop.
+"""
+
+from __future__ import annotations
+
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, JsonResponse
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.renderers import JSONRenderer
+
+from apps.models_app.dashboard import DashboardSummary
+from apps.models_app.field import FieldIrrigationPractice
+from apps.models_app.models import UserActivity
+from apps.models_app.notifications import Notification
+from apps.models_app.user_plan import UserPlan
+
+from .auth import TokenAuthentication
+from .conditional import async_user_conditional
+from .pagination import KeysetPagination
+from .serializers import NotificationSerializer
+from .payments import IdempotencyConflict, PaymentGatewayError, acreate_order
+from .views import NotificationViewSet, dashboard_payload, parse_order_request
+
+
+def json_response(data, status: int = 200) -> HttpResponse:
+    # Same renderer as the DRF views, so both variants return identical bodies
+    return HttpResponse(JSONRenderer().render(data), status=status, content_type="application/json")
+
+
+class AsyncAPIView(View):
+    """Async Django view that authenticates with the API token, like the DRF views."""
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        # Token auth is not cookie based, so CSRF does not apply (as with DRF's APIView)
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        header = request.headers.get("Authorization", "").split()
+        if len(header) != 2 or header[0].lower() != TokenAuthentication.keyword.lower():
+            return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+        try:
+            request.user, _ = await TokenAuthentication().aauthenticate_credentials(header[1])
+        except AuthenticationFailed as exc:
+            return JsonResponse({"detail": str(exc.detail)}, status=401)
+        return await super().dispatch(request, *args, **kwargs)
+
+
+class AsyncDashboardView(AsyncAPIView):
+    @async_user_conditional(("fields", "notifications", "plans", "practices", "activity"), catalogs=("plans", "irrigation_methods"))
+    async def get(self, request):
+        user = request.user
+        summary = await DashboardSummary.objects.filter(pk=user.pk).afirst()
+        if summary is None:
+            summary = await sync_to_async(DashboardSummary.rebuild)(user.pk)
+        current_plan = await UserPlan.objects.filter(user=user, is_active=True).select_related("plan").afirst()
+        recent_practices = [
+            practice
+            async for practice in FieldIrrigationPractice.objects
+            .filter(field__user=user)
+            .select_related("field", "irrigation_method")
+            .order_by("-performed_at")[:3]
+        ]
+        recent_activity = [activity async for activity in UserActivity.objects.filter(user=user).order_by("-created_at")[:5]]
+        return json_response(dashboard_payload(summary, current_plan, recent_practices, recent_activity))
+
+
+class AsyncNotificationListView(AsyncAPIView):
+    keyset_ordering = NotificationViewSet.keyset_ordering
+
+    @async_user_conditional(("notifications",))
+    async def get(self, request):
+        paginator = KeysetPagination()
+        rows = await paginator.apaginate_queryset(Notification.objects.filter(receiver=request.user), request, view=self)
+        return json_response({"next": paginator.get_next_link(), "previous": None, "results": NotificationSerializer(rows, many=True).data})
+
+
+class AsyncUnreadCountView(AsyncAPIView):
+    @async_user_conditional(("notifications",))
+    async def get(self, request):
+        count = await Notification.objects.filter(receiver=request.user, is_read=False).acount()
+        return json_response({"count": count})
+
+
+class AsyncRazorpayCreateOrderView(AsyncAPIView):
+    async def post(self, request):
+        try:
+            body = json.loads(request.body or b"{}")
+        except ValueError:
+            return json_response({"detail": "Invalid JSON"}, status=400)
+        order_request, error = parse_order_request(body, request.headers)
+        if error:
+            return json_response({"detail": error}, status=400)
+        try:
+            order = await acreate_order(request.user, **order_request)
+        except IdempotencyConflict as exc:
+            return json_response({"detail": str(exc)}, status=409)
+        except PaymentGatewayError as exc:
+            return json_response({"detail": f"Payment gateway error: {exc}"}, status=502)
+        return json_response(order)
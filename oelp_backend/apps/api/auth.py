@@ -5,7 +5,9 @@ from typing import Optional, Tuple
 from django.utils.translation import gettext_lazy as _
 from rest_framework import authentication, exceptions
 
-from apps.models_app.token import UserAuthToken
+from apps.models_app.token import UserAuthToken, digest_token
+
+from .token_cache import token_cache
 
 
 class TokenAuthentication(authentication.BaseAuthentication):
@@ -23,13 +25,44 @@ class TokenAuthentication(authentication.BaseAuthentication):
             token = auth[1].decode()
         except UnicodeError:
             raise exceptions.AuthenticationFailed(_("Invalid token header. Token string should not contain invalid characters."))
+        return self.authenticate_credentials(token)
 
-        try:
-            user_token = UserAuthToken.objects.select_related("user").get(access_token=token)
-        except UserAuthToken.DoesNotExist:
-            raise exceptions.AuthenticationFailed(_("Invalid token."))
-        if not user_token.user.is_active:
-            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+    def authenticate_credentials(self, token: str) -> Tuple[object, str]:
+        return self.authenticate_digest(digest_token(token))
+
+    async def aauthenticate_credentials(self, token: str) -> Tuple[object, str]:
+        return await self.aauthenticate_digest(digest_token(token))
 
-        return (user_token.user, None)
+    def authenticate_digest(self, digest: str) -> Tuple[object, str]:
+        """(user, token digest) for a token's digest; the digest becomes ``request.auth``."""
+        user = token_cache.get(digest)
+        if user is None:
+            try:
+                user_token = UserAuthToken.objects.select_related("user").get(token_digest=digest)
+            except UserAuthToken.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_("Invalid token."))
+            user = self._remember(digest, user_token.user)
+        return self._check_active(user, digest)
 
+    async def aauthenticate_digest(self, digest: str) -> Tuple[object, str]:
+        """``authenticate_digest`` for async views, using the async ORM on a cache miss."""
+        user = token_cache.get(digest)
+        if user is None:
+            try:
+                user_token = await UserAuthToken.objects.select_related("user").aget(token_digest=digest)
+            except UserAuthToken.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_("Invalid token."))
+            user = self._remember(digest, user_token.user)
+        return self._check_active(user, digest)
+
+    @staticmethod
+    def _remember(digest: str, user):
+        if user.is_active:
+            token_cache.set(digest, user)
+        return user
+
+    @staticmethod
+    def _check_active(user, digest: str) -> Tuple[object, str]:
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+        return (user, digest)
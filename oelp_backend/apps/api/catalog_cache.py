@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models.signals import post_delete, post_save
+
+from apps.models_app.crop_variety import Crop, CropVariety
+from apps.models_app.feature import Feature, FeatureType
+from apps.models_app.irrigation import IrrigationMethods
+from apps.models_app.plan import Plan
+from apps.models_app.soil_report import SoilTexture
+
+from .conditional import make_etag
+
+# Catalog name -> model whose writes invalidate it
+CATALOG_MODELS = {
+    "crops": Crop,
+    "crop_varieties": CropVariety,
+    "soil_textures": SoilTexture,
+    "irrigation_methods": IrrigationMethods,
+    "plans": Plan,
+    "features": Feature,
+    "feature_types": FeatureType,
+}
+
+
+def shared_timeout(timeout: Optional[int]) -> Optional[int]:
+    """``timeout`` for entries other processes must see invalidated; short-lived with a per-process cache.
+
+    ``django.core.cache.cache`` is a proxy, so the backend is checked
+    through ``caches``.
+    """
+    return settings.CATALOG_CACHE_LOCAL_TTL if isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache) else timeout
+
+
+class CatalogCache:
+    """Versioned read-through cache of rendered catalog responses.
+
+    Each catalog has a version counter in the Django cache; writes bump it
+    from signals, which retires every cached payload (and ETag) built on
+    the old version. Payloads live in a small per-process LRU in front of
+    the Django cache, so a hit costs one version lookup and no DB query.
+
+    With Redis configured versions are shared by all workers. With the
+    local-memory backend each process keeps its own versions, so they
+    expire after ``CATALOG_CACHE_LOCAL_TTL`` seconds to bound staleness.
+    """
+
+    version_prefix = "catalog:version:"
+    payload_prefix = "catalog:payload:"
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def version_timeout(self) -> Optional[int]:
+        return shared_timeout(None)
+
+    @staticmethod
+    def initial_version() -> int:
+        # Time based so a version evicted from the cache never restarts at an old value
+        return time.time_ns() // 1000
+
+    def versions(self, names: Iterable[str]) -> list[int]:
+        keys = [self.version_prefix + name for name in names]
+        found = cache.get_many(keys)
+        missing = {key: self.initial_version() for key in keys if key not in found}
+        if missing:
+            for key, value in missing.items():
+                cache.add(key, value, timeout=self.version_timeout)
+            found.update(cache.get_many(list(missing)))
+        return [found.get(key, missing.get(key)) for key in keys]
+
+    def bump(self, name: str) -> None:
+        key = self.version_prefix + name
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, self.initial_version(), timeout=self.version_timeout)
+
+    def etag(self, names: Iterable[str], variant: str = "") -> str:
+        names = list(names)
+        return make_etag(*names, *self.versions(names), variant)
+
+    def get_or_build(self, etag: str, builder: Callable[[], bytes]) -> bytes:
+        with self._lock:
+            payload = self._entries.get(etag)
+            if payload is not None:
+                self._entries.move_to_end(etag)
+                return payload
+        payload = cache.get(self.payload_prefix + etag)
+        if payload is None:
+            payload = builder()
+            cache.set(self.payload_prefix + etag, payload, timeout=settings.CATALOG_CACHE_TIMEOUT)
+        with self._lock:
+            self._entries[etag] = payload
+            self._entries.move_to_end(etag)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return payload
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        cache.delete_many([self.version_prefix + name for name in CATALOG_MODELS])
+
+
+catalog_cache = CatalogCache()
+
+
+def _bump_receiver(name: str):
+    def bump_catalog_version(sender, **kwargs):
+        catalog_cache.bump(name)
+
+    return bump_catalog_version
+
+
+# Receivers are kept referenced here; signals hold them weakly
+_receivers = {name: _bump_receiver(name) for name in CATALOG_MODELS}
+for _name, _model in CATALOG_MODELS.items():
+    post_save.connect(_receivers[_name], sender=_model, dispatch_uid=f"catalog_cache_{_name}_save")
+    post_delete.connect(_receivers[_name], sender=_model, dispatch_uid=f"catalog_cache_{_name}_delete")
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from functools import wraps
+from typing import Iterable, Optional
+
+from asgiref.sync import sync_to_async
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from apps.models_app.data_version import UserDataVersion
+
+
+def make_etag(*parts: object) -> str:
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def with_etag(response, etag: str, last_modified: Optional[datetime] = None):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    # Clients may keep the body but must revalidate it on every use
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_response(request, etag: str, last_modified: Optional[datetime] = None):
+    """A 304 (or 412) response when the request's preconditions say so, else None.
+
+    Follows RFC 9110 precedence: If-None-Match wins over If-Modified-Since.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified is not None else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None:
+        with_etag(response, etag, last_modified)
+    return response
+
+
+def _user_etag(request, scopes: tuple, versions: list, catalog_versions: list) -> str:
+    return make_etag(
+        request.user.pk, *scopes, *versions, *catalog_versions,
+        request.get_full_path(), getattr(request, "accepted_media_type", ""),
+    )
+
+
+def user_conditional(scopes: Iterable[str], catalogs: Iterable[str] = ()):
+    """Make a GET handler conditional on the requesting user's data versions.
+
+    ETag and Last-Modified come from one ``UserDataVersion`` read (plus the
+    versions of any catalogs whose names the payload embeds), so a matching
+    request is answered with 304 before the handler runs a single query.
+    Handlers find the ETag on ``request.data_etag``, e.g. to key a cache.
+    """
+    scopes, catalogs = tuple(scopes), tuple(catalogs)
+
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(self, request, *args, **kwargs):
+            from .catalog_cache import catalog_cache
+
+            if request.method not in ("GET", "HEAD") or not request.user.is_authenticated:
+                return handler(self, request, *args, **kwargs)
+            versions, last_modified = UserDataVersion.state(request.user.pk, scopes)
+            catalog_versions = catalog_cache.versions(catalogs) if catalogs else []
+            etag = _user_etag(request, scopes, versions, catalog_versions)
+            not_modified = conditional_response(request, etag, last_modified)
+            if not_modified is not None:
+                return not_modified
+            request.data_etag = etag
+            response = handler(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                with_etag(response, etag, last_modified)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def async_user_conditional(scopes: Iterable[str], catalogs: Iterable[str] = ()):
+    """``user_conditional`` for async handlers."""
+    scopes, catalogs = tuple(scopes), tuple(catalogs)
+
+    def decorator(handler):
+        @wraps(handler)
+        async def wrapper(self, request, *args, **kwargs):
+            from .catalog_cache import catalog_cache
+
+            if request.method not in ("GET", "HEAD") or not request.user.is_authenticated:
+                return await handler(self, request, *args, **kwargs)
+            versions, last_modified = await UserDataVersion.astate(request.user.pk, scopes)
+            catalog_versions = await sync_to_async(catalog_cache.versions)(catalogs) if catalogs else []
+            etag = _user_etag(request, scopes, versions, catalog_versions)
+            not_modified = conditional_response(request, etag, last_modified)
+            if not_modified is not None:
+                return not_modified
+            request.data_etag = etag
+            response = await handler(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                with_etag(response, etag, last_modified)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,159 @@
+"""Season timelines, stage durations and yield per hectare, computed in the database.
+
+Every season row carries the crop and area it was grown with, so yield per
+hectare is a column expression; comparisons across a field's seasons and
+against the crop's other seasons are window functions over those rows, and
+per-crop statistics are one grouped aggregate.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Optional
+
+from django.db.models import Avg, Case, Count, DurationField, ExpressionWrapper, F, FloatField, Max, Min, Q, Sum, When, Window
+from django.db.models.functions import Lag, Rank, RowNumber
+
+from apps.models_app.field import CropLifecycleDates
+
+# (stage, start date, end date)
+STAGES = (
+    ("germination", "sowing_date", "growth_start_date"),
+    ("vegetative", "growth_start_date", "flowering_date"),
+    ("reproductive", "flowering_date", "harvesting_date"),
+    ("season", "sowing_date", "harvesting_date"),
+)
+
+YIELD_PER_HA = Case(
+    When(yield_amount__isnull=False, area_hectares__gt=0, then=F("yield_amount") / F("area_hectares")),
+    default=None,
+    output_field=FloatField(),
+)
+
+# A field's seasons in growing order
+_FIELD_ORDER = {"partition_by": [F("field_id")], "order_by": [F("sowing_date").asc(nulls_last=True), F("id").asc()]}
+
+
+def stage_duration(start: str, end: str) -> ExpressionWrapper:
+    return ExpressionWrapper(F(end) - F(start), output_field=DurationField())
+
+
+def days(value: Optional[timedelta]) -> Optional[float]:
+    return None if value is None else round(value.total_seconds() / 86400, 1)
+
+
+def ratio(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 4)
+
+
+def timeline_queryset(user):
+    """The user's seasons with yield per hectare, stage durations and window comparisons.
+
+    ``season_number`` and ``previous_yield_per_ha`` follow each field's
+    seasons in order; ``crop_avg_yield_per_ha`` and ``crop_yield_rank``
+    compare a season with every season of the same crop.
+    """
+    return (
+        CropLifecycleDates.objects.filter(field__user=user)
+        .select_related("field", "crop", "crop_variety")
+        .annotate(
+            yield_per_ha=YIELD_PER_HA,
+            **{f"{stage}_duration": stage_duration(start, end) for stage, start, end in STAGES},
+        )
+        .annotate(
+            season_number=Window(RowNumber(), **_FIELD_ORDER),
+            previous_yield_per_ha=Window(Lag("yield_per_ha"), **_FIELD_ORDER),
+            crop_avg_yield_per_ha=Window(Avg("yield_per_ha"), partition_by=[F("crop_id")]),
+            crop_yield_rank=Window(Rank(), partition_by=[F("crop_id")], order_by=F("yield_per_ha").desc(nulls_last=True)),
+        )
+    )
+
+
+def crop_statistics(user) -> list[dict]:
+    """Stage durations and yield per hectare per crop, in one grouped query."""
+    yields = Q(yield_amount__isnull=False, area_hectares__gt=0)
+    aggregates = {
+        "seasons": Count("id"),
+        "harvested": Count("harvesting_date"),
+        "total_yield": Sum("yield_amount", filter=yields),
+        "total_hectares": Sum("area_hectares", filter=yields),
+        "avg_yield_per_ha": Avg(YIELD_PER_HA),
+        "min_yield_per_ha": Min(YIELD_PER_HA),
+        "max_yield_per_ha": Max(YIELD_PER_HA),
+    }
+    for stage, start, end in STAGES:
+        duration = stage_duration(start, end)
+        aggregates.update({f"{stage}_avg": Avg(duration), f"{stage}_min": Min(duration), f"{stage}_max": Max(duration)})
+    rows = (
+        CropLifecycleDates.objects.filter(field__user=user)
+        .values("crop_id", "crop__name")
+        .annotate(**aggregates)
+        .order_by("crop__name")
+    )
+    return [
+        {
+            "crop": row["crop_id"],
+            "crop_name": row["crop__name"],
+            "seasons": row["seasons"],
+            "harvested": row["harvested"],
+            "yield": {
+                "total": ratio(row["total_yield"]),
+                "hectares": ratio(row["total_hectares"]),
+                # Pooled over the crop's land, so large fields weigh more than in the average
+                "per_ha": ratio(row["total_yield"] / row["total_hectares"]) if row["total_hectares"] else None,
+                "avg_per_ha": ratio(row["avg_yield_per_ha"]),
+                "min_per_ha": ratio(row["min_yield_per_ha"]),
+                "max_per_ha": ratio(row["max_yield_per_ha"]),
+            },
+            "stage_days": {
+                stage: {"avg": days(row[f"{stage}_avg"]), "min": days(row[f"{stage}_min"]), "max": days(row[f"{stage}_max"])}
+                for stage, _, _ in STAGES
+            },
+        }
+        for row in rows
+    ]
+
+
+def field_statistics(user) -> list[dict]:
+    """Per field, across its harvested seasons: yield averages and the latest season against the one before.
+
+    Window functions run over every harvested season with a yield before
+    the filter keeps one row (the latest) per field.
+    """
+    rows = (
+        CropLifecycleDates.objects.filter(field__user=user, yield_amount__isnull=False, area_hectares__gt=0)
+        .annotate(yield_per_ha=YIELD_PER_HA)
+        .annotate(
+            previous_yield_per_ha=Window(Lag("yield_per_ha"), **_FIELD_ORDER),
+            seasons=Window(Count("id"), partition_by=[F("field_id")]),
+            avg_yield_per_ha=Window(Avg("yield_per_ha"), partition_by=[F("field_id")]),
+            best_yield_per_ha=Window(Max("yield_per_ha"), partition_by=[F("field_id")]),
+            latest_rank=Window(RowNumber(), partition_by=[F("field_id")], order_by=[F("sowing_date").desc(nulls_last=True), F("id").desc()]),
+        )
+        .filter(latest_rank=1)
+        .order_by("field_id")
+        .values(
+            "field_id", "field__name", "id", "crop_id", "seasons",
+            "yield_per_ha", "previous_yield_per_ha", "avg_yield_per_ha", "best_yield_per_ha",
+        )
+    )
+    result = []
+    for row in rows:
+        latest, previous = row["yield_per_ha"], row["previous_yield_per_ha"]
+        result.append({
+            "field": row["field_id"],
+            "field_name": row["field__name"],
+            "seasons": row["seasons"],
+            "avg_yield_per_ha": ratio(row["avg_yield_per_ha"]),
+            "best_yield_per_ha": ratio(row["best_yield_per_ha"]),
+            "latest_season": row["id"],
+            "latest_crop": row["crop_id"],
+            "latest_yield_per_ha": ratio(latest),
+            "previous_yield_per_ha": ratio(previous),
+            "change_pct": round((latest - previous) / previous * 100, 1) if previous else None,
+        })
+    return result
+
+
+def season_statistics(user) -> dict:
+    return {"crops": crop_statistics(user), "fields": field_statistics(user)}
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Union
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.models_app.feature_plan import PlanFeature
+from apps.models_app.user_plan import PlanFeatureUsage, UserPlan
+
+from .catalog_cache import catalog_cache
+
+# Catalog version bumped on any PlanFeature write; cached entitlements built
+# on an older version are rebuilt on next use
+PLAN_FEATURES_CATALOG = "plan_features"
+
+
+@dataclass(frozen=True)
+class Grant:
+    """One active plan's allowance of a feature, counted on a PlanFeatureUsage row."""
+
+    usage_id: int
+    limit: int
+    period_start: datetime
+    # The counter restarts on the first use after this
+    period_end: datetime
+
+
+@dataclass(frozen=True)
+class Entitlements:
+    catalog_version: int
+    # Feature name -> grants, earliest-expiring plan first
+    grants: dict[str, tuple[Grant, ...]]
+    # Feature names that some plan limits; features outside it are open to everyone
+    gated: frozenset[str]
+    valid_until: Optional[datetime]
+
+    def allows(self, feature: str) -> bool:
+        return feature not in self.gated or feature in self.grants
+
+    def limit(self, feature: str) -> Optional[int]:
+        grants = self.grants.get(feature)
+        return sum(grant.limit for grant in grants) if grants else None
+
+
+def _cache_key(user_id: int) -> str:
+    return f"entitlements:user:{user_id}"
+
+
+def get_entitlements(user_id: int) -> Entitlements:
+    """The user's cached plan-feature limits, resolved from the database on a miss.
+
+    Entries are dropped when the user's plans change, go stale when any
+    PlanFeature changes, and expire with the user's earliest-expiring plan.
+    """
+    catalog_version = catalog_cache.versions([PLAN_FEATURES_CATALOG])[0]
+    entitlements = cache.get(_cache_key(user_id))
+    if (
+        entitlements is not None
+        and entitlements.catalog_version == catalog_version
+        and (entitlements.valid_until is None or entitlements.valid_until > timezone.now())
+    ):
+        return entitlements
+    entitlements = resolve_entitlements(user_id, catalog_version)
+    timeout = settings.ENTITLEMENT_CACHE_TIMEOUT
+    if entitlements.valid_until is not None:
+        timeout = max(1, min(timeout, int((entitlements.valid_until - timezone.now()).total_seconds())))
+    cache.set(_cache_key(user_id), entitlements, timeout=timeout)
+    return entitlements
+
+
+def resolve_entitlements(user_id: int, catalog_version: int) -> Entitlements:
+    """Build a user's entitlements, creating the usage counters their active plans are missing."""
+    now = timezone.now()
+    user_plans = list(UserPlan.objects.filter(user_id=user_id, is_active=True, expire_at__gt=now).order_by("expire_at", "pk"))
+    plan_features = list(
+        PlanFeature.objects.filter(plan_id__in={user_plan.plan_id for user_plan in user_plans}).select_related("feature")
+    )
+    usages = {
+        (usage.user_plan_id, usage.feature_id): usage
+        for usage in PlanFeatureUsage.objects.filter(user_plan__in=user_plans)
+    }
+    missing = [
+        PlanFeatureUsage(user_plan=user_plan, feature_id=plan_feature.feature_id, max_count=plan_feature.max_count, duration_days=plan_feature.duration_days)
+        for user_plan in user_plans
+        for plan_feature in plan_features
+        if plan_feature.plan_id == user_plan.plan_id and (user_plan.pk, plan_feature.feature_id) not in usages
+    ]
+    if missing:
+        with transaction.atomic():
+            for usage in PlanFeatureUsage.objects.bulk_create(missing):
+                usages[(usage.user_plan_id, usage.feature_id)] = usage
+        if any(usage.pk is None for usage in missing):
+            # Backends that cannot return ids from bulk inserts
+            usages = {(usage.user_plan_id, usage.feature_id): usage for usage in PlanFeatureUsage.objects.filter(user_plan__in=user_plans)}
+
+    names = {plan_feature.feature_id: plan_feature.feature.name for plan_feature in plan_features}
+    grants: dict[str, list[Grant]] = {}
+    valid_until = min((user_plan.expire_at for user_plan in user_plans), default=None)
+    for user_plan in user_plans:
+        for plan_feature in plan_features:
+            usage = usages.get((user_plan.pk, plan_feature.feature_id))
+            if plan_feature.plan_id != user_plan.plan_id or usage is None:
+                continue
+            period_end = usage.created_at + timedelta(days=max(usage.duration_days, 1))
+            grants.setdefault(names[plan_feature.feature_id], []).append(Grant(usage.pk, usage.max_count, usage.created_at, period_end))
+    return Entitlements(
+        catalog_version=catalog_version,
+        grants={name: tuple(feature_grants) for name, feature_grants in grants.items()},
+        gated=gated_features(catalog_version),
+        valid_until=valid_until,
+    )
+
+
+def gated_features(catalog_version: int) -> frozenset[str]:
+    key = f"entitlements:gated:{catalog_version}"
+    gated = cache.get(key)
+    if gated is None:
+        gated = frozenset(PlanFeature.objects.values_list("feature__name", flat=True).distinct())
+        cache.set(key, gated, timeout=settings.ENTITLEMENT_CACHE_TIMEOUT)
+    return gated
+
+
+# consume() result for features no plan limits
+UNLIMITED = 0
+
+
+def consume(user_id: int, feature: str, amount: int = 1) -> Optional[int]:
+    """Spend ``amount`` of the user's quota for ``feature``.
+
+    Returns the id of the PlanFeatureUsage row charged, ``UNLIMITED`` for
+    features no plan limits, or None when the quota is used up. Each grant
+    is tried with one conditional ``F()`` UPDATE, so concurrent requests
+    can never overspend.
+    """
+    entitlements = get_entitlements(user_id)
+    if feature not in entitlements.gated:
+        return UNLIMITED
+    now = timezone.now()
+    for grant in entitlements.grants.get(feature, ()):
+        usage = PlanFeatureUsage.objects.filter(pk=grant.usage_id)
+        if grant.period_end <= now and amount <= grant.limit:
+            # First use in a new period restarts the counter; matching on the old
+            # period start lets only one concurrent request do so
+            invalidate_entitlements(user_id)
+            if usage.filter(created_at=grant.period_start).update(used_count=amount, created_at=now):
+                return grant.usage_id
+        if usage.filter(used_count__lte=F("max_count") - amount).update(used_count=F("used_count") + amount):
+            return grant.usage_id
+    return None
+
+
+def release(usage_id: int, amount: int = 1) -> None:
+    """Give back quota spent by ``consume`` for a request that then failed."""
+    PlanFeatureUsage.objects.filter(pk=usage_id, used_count__gte=amount).update(used_count=F("used_count") - amount)
+
+
+def invalidate_entitlements(user_ids: Union[int, Iterable[int]]) -> None:
+    ids = [user_ids] if isinstance(user_ids, int) else list(user_ids)
+    if ids:
+        cache.delete_many([_cache_key(user_id) for user_id in ids])
+
+
+@receiver(post_save, sender=UserPlan, dispatch_uid="entitlements_user_plan_save")
+@receiver(post_delete, sender=UserPlan, dispatch_uid="entitlements_user_plan_delete")
+def invalidate_user_plan_entitlements(sender, instance, **kwargs):
+    # After commit, so a concurrent miss cannot re-cache the old plans
+    transaction.on_commit(lambda: invalidate_entitlements(instance.user_id))
+
+
+@receiver(post_save, sender=PlanFeature, dispatch_uid="entitlements_plan_feature_save")
+@receiver(post_delete, sender=PlanFeature, dispatch_uid="entitlements_plan_feature_delete")
+def bump_plan_features_version(sender, **kwargs):
+    catalog_cache.bump(PLAN_FEATURES_CATALOG)
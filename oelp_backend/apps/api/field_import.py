@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import Any, Iterable, Optional
+
+from django.db import transaction
+
+from apps.models_app.activity import record_activity
+from apps.models_app.crop_variety import Crop, CropVariety
+from apps.models_app.dashboard import DashboardSummary
+from apps.models_app.data_version import UserDataVersion
+from apps.models_app.farm import Farm
+from apps.models_app.field import Field
+from apps.models_app.geometry import boundary_bounds, boundary_error, measure_boundaries
+from apps.models_app.soil_report import SoilTexture
+
+GEOMETRY_TYPES = {"Polygon", "MultiPolygon"}
+TRUE_VALUES = {"1", "true", "yes", "y", "t"}
+
+
+class FieldImportError(ValueError):
+    pass
+
+
+def parse_import_rows(upload=None, data: Any = None) -> list[dict]:
+    """Flatten a CSV upload or a GeoJSON FeatureCollection into plain row dicts."""
+    if upload is not None:
+        name = (getattr(upload, "name", "") or "").lower()
+        raw = upload.read()
+        text = raw.decode("utf-8-sig") if isinstance(raw, bytes) else raw
+        if name.endswith((".json", ".geojson")) or text.lstrip().startswith("{"):
+            try:
+                data = json.loads(text)
+            except ValueError as exc:
+                raise FieldImportError(f"Invalid GeoJSON: {exc}")
+        else:
+            return [dict(row) for row in csv.DictReader(io.StringIO(text))]
+    if not isinstance(data, dict) or data.get("type") != "FeatureCollection":
+        raise FieldImportError("Expected a CSV file or a GeoJSON FeatureCollection")
+    rows = []
+    for feature in data.get("features") or []:
+        feature = feature if isinstance(feature, dict) else {}
+        row = dict(feature.get("properties") or {})
+        row["boundary"] = feature.get("geometry")
+        rows.append(row)
+    return rows
+
+
+class FieldImporter:
+    """Validates import rows against the user's reference data and bulk inserts them.
+
+    Foreign keys are checked against id sets loaded once per import, so
+    validation costs a fixed number of queries regardless of row count.
+    """
+
+    batch_size = 1000
+
+    def __init__(self, user, default_farm: Optional[str] = None) -> None:
+        self.user = user
+        self.default_farm = default_farm
+        self.farm_ids = set(Farm.objects.filter(user=user).values_list("id", flat=True))
+        self.crop_ids = set(Crop.objects.values_list("id", flat=True))
+        self.variety_crops = dict(CropVariety.objects.values_list("id", "crop_id"))
+        self.soil_type_ids = set(SoilTexture.objects.values_list("id", flat=True))
+
+    def run(self, rows: Iterable[dict]) -> dict:
+        valid: list[Field] = []
+        errors: list[dict] = []
+        for index, row in enumerate(rows, start=1):
+            field, row_errors = self.build(row)
+            if row_errors:
+                errors.append({"row": index, "errors": row_errors})
+            else:
+                valid.append(field)
+
+        # One vectorized pass computes area/centroid/bbox for every imported boundary
+        boundaries = [field.boundary for field in valid]
+        for field, measured, bounds in zip(valid, measure_boundaries(boundaries), boundary_bounds(boundaries)):
+            if measured is not None:
+                field.area = measured
+            field.set_bounds(bounds)
+
+        created: list[Field] = []
+        if valid:
+            with transaction.atomic():
+                for start in range(0, len(valid), self.batch_size):
+                    created.extend(Field.objects.bulk_create(valid[start:start + self.batch_size]))
+                # bulk_create skips post_save, so log one aggregated activity and refresh the summary
+                first_pk = created[0].pk
+                if first_pk is not None:
+                    record_activity(self.user.pk, "create", Field, first_pk, description=f"Field bulk import ({len(created)} fields)")
+                DashboardSummary.rebuild(self.user.pk)
+                UserDataVersion.bump(self.user.pk, "fields")
+        return {"created": len(created), "failed": len(errors), "errors": errors}
+
+    def build(self, row: dict) -> tuple[Optional[Field], dict]:
+        errors: dict = {}
+        name = str(row.get("name") or "").strip()
+        if not name:
+            errors["name"] = "This field is required."
+        elif len(name) > 50:
+            errors["name"] = "Ensure this field has no more than 50 characters."
+
+        farm_id = self._int(row.get("farm") or self.default_farm, "farm", errors, required=True)
+        if farm_id is not None and farm_id not in self.farm_ids:
+            errors["farm"] = "Invalid farm."
+        crop_id = self._int(row.get("crop"), "crop", errors)
+        if crop_id is not None and crop_id not in self.crop_ids:
+            errors["crop"] = "Invalid crop."
+        variety_id = self._int(row.get("crop_variety"), "crop_variety", errors)
+        if variety_id is not None and (variety_id not in self.variety_crops or (crop_id and self.variety_crops[variety_id] != crop_id)):
+            errors["crop_variety"] = "Invalid crop_variety."
+        soil_type_id = self._int(row.get("soil_type"), "soil_type", errors)
+        if soil_type_id is not None and soil_type_id not in self.soil_type_ids:
+            errors["soil_type"] = "Invalid soil_type."
+
+        boundary = row.get("boundary")
+        if isinstance(boundary, str):
+            try:
+                boundary = json.loads(boundary) if boundary.strip() else None
+            except ValueError:
+                errors["boundary"] = "Invalid GeoJSON."
+        if boundary is not None and "boundary" not in errors:
+            if not isinstance(boundary, dict) or boundary.get("type") not in GEOMETRY_TYPES:
+                errors["boundary"] = "Expected a Polygon or MultiPolygon geometry."
+            else:
+                # Rings and positions too, so one bad row cannot fail the whole insert
+                error = boundary_error(boundary)
+                if error:
+                    errors["boundary"] = error
+
+        if errors:
+            return None, errors
+        is_active = row.get("is_active")
+        return (
+            Field(
+                name=name,
+                farm_id=farm_id,
+                crop_id=crop_id,
+                crop_variety_id=variety_id,
+                soil_type_id=soil_type_id,
+                user=self.user,
+                boundary=boundary,
+                location_name=(str(row.get("location_name")).strip() or None) if row.get("location_name") else None,
+                is_active=True if is_active in (None, "") else str(is_active).strip().lower() in TRUE_VALUES,
+            ),
+            errors,
+        )
+
+    @staticmethod
+    def _int(value: Any, key: str, errors: dict, required: bool = False) -> Optional[int]:
+        if value in (None, ""):
+            if required:
+                errors[key] = "This field is required."
+            return None
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            errors[key] = "A valid integer is required."
+            return None
@@ -0,0 +1,99 @@
+"""Irrigation time series read from the rollups, and compaction of the raw event history."""
+
+from __future__ import annotations
+
+import logging
+from datetime import date, timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Sum
+from django.utils import timezone
+
+from apps.models_app.data_version import UserDataVersion
+from apps.models_app.field import FieldIrrigationPractice
+from apps.models_app.irrigation_rollup import IrrigationRollup
+
+logger = logging.getLogger(__name__)
+
+GROUP_BY = {"field": "field_id", "irrigation_method": "irrigation_method_id"}
+
+
+def irrigation_series(
+    user,
+    granularity: str,
+    start: date,
+    end: date,
+    field: Optional[int] = None,
+    farm: Optional[int] = None,
+    irrigation_method: Optional[int] = None,
+    group_by: Optional[str] = None,
+) -> list[dict]:
+    """Events, minutes and water per period from ``start`` to ``end``, optionally split by field or method.
+
+    Periods are those of ``granularity``; the first one is the period
+    containing ``start``. Reads one rollup row per period and group, never
+    the raw events.
+    """
+    first = IrrigationRollup.period_starts(start)[granularity]
+    rollups = IrrigationRollup.objects.filter(user=user, granularity=granularity, period_start__gte=first, period_start__lte=end)
+    if field is not None:
+        rollups = rollups.filter(field_id=field)
+    if farm is not None:
+        rollups = rollups.filter(field__farm_id=farm)
+    if irrigation_method is not None:
+        rollups = rollups.filter(irrigation_method_id=irrigation_method)
+    keys = ["period_start"] + ([GROUP_BY[group_by]] if group_by else [])
+    rows = (
+        rollups.values(*keys)
+        .annotate(events_sum=Sum("events"), minutes_sum=Sum("duration_minutes"), volume_sum=Sum("water_volume"))
+        .order_by(*keys)
+    )
+    series = []
+    for row in rows:
+        point = {
+            "period": row["period_start"].isoformat(),
+            "events": row["events_sum"],
+            "duration_minutes": round(row["minutes_sum"], 2),
+            "water_volume": round(row["volume_sum"], 2),
+        }
+        if group_by:
+            point[group_by] = row[GROUP_BY[group_by]]
+        series.append(point)
+    return series
+
+
+def compact_irrigation_history(
+    raw_retention_days: Optional[int] = None, daily_retention_days: Optional[int] = None, batch_size: Optional[int] = None
+) -> dict[str, int]:
+    """Delete raw events and daily rollups past their retention; returns the rows removed of each.
+
+    The weekly and monthly rollups already hold the totals of the deleted
+    events, so the rows are removed in batches of plain DELETEs, without
+    loading them or sending delete signals (which would subtract them from
+    the rollups).
+    """
+    raw_retention_days = settings.IRRIGATION_RAW_RETENTION_DAYS if raw_retention_days is None else raw_retention_days
+    daily_retention_days = settings.IRRIGATION_DAILY_ROLLUP_RETENTION_DAYS if daily_retention_days is None else daily_retention_days
+    batch_size = batch_size or settings.IRRIGATION_COMPACTION_BATCH_SIZE
+    now = timezone.now()
+
+    expired = FieldIrrigationPractice.objects.filter(performed_at__lt=now - timedelta(days=raw_retention_days))
+    meta = FieldIrrigationPractice._meta
+    delete_sql = f"DELETE FROM {connection.ops.quote_name(meta.db_table)} WHERE {connection.ops.quote_name(meta.pk.column)} IN "
+    raw_deleted = 0
+    while True:
+        batch = list(expired.order_by("pk").values_list("pk", "field__user_id")[:batch_size])
+        if not batch:
+            break
+        with connection.cursor() as cursor:
+            cursor.execute(delete_sql + f"({', '.join(['%s'] * len(batch))})", [pk for pk, _ in batch])
+            raw_deleted += cursor.rowcount
+        # The practice lists changed for these users
+        UserDataVersion.bump({user_id for _, user_id in batch}, "practices")
+
+    daily_cutoff = timezone.localdate(now) - timedelta(days=daily_retention_days)
+    daily_deleted, _ = IrrigationRollup.objects.filter(granularity=IrrigationRollup.Granularity.DAY, period_start__lt=daily_cutoff).delete()
+    logger.info("Compacted irrigation history: %s raw events, %s daily rollups", raw_deleted, daily_deleted)
+    return {"raw_events": raw_deleted, "daily_rollups": daily_deleted}
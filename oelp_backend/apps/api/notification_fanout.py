@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.db.models import F
+
+from apps.models_app.dashboard import DashboardSummary
+from apps.models_app.data_version import UserDataVersion
+from apps.models_app.notifications import Notification
+from apps.models_app.user import CustomUser
+
+from .notification_stream import publish_user_event, publish_user_events
+
+
+def fan_out_recipients(roles: Iterable[str] = (), plans: Iterable[int] = (), crops: Iterable[int] = ()):
+    """Ids of active users matching every given criterion: role name, active plan and grown crop."""
+    users = CustomUser.objects.filter(is_active=True)
+    roles, plans, crops = list(roles), list(plans), list(crops)
+    if roles:
+        users = users.filter(user_roles__role__name__in=roles)
+    if plans:
+        users = users.filter(userplan__is_active=True, userplan__plan_id__in=plans)
+    if crops:
+        users = users.filter(field__crop_id__in=crops)
+    return users.order_by("pk").values_list("pk", flat=True).distinct()
+
+
+def create_notifications(sender_id: Optional[int], message: str, receiver_ids: Iterable[int], batch_size: int = 1000) -> int:
+    """Insert one notification per receiver in chunked ``bulk_create`` batches.
+
+    ``bulk_create`` skips signals, so each chunk applies the unread-count
+    delta, data-version bump and stream events itself, in the same
+    transaction as its rows.
+    """
+    created = 0
+    chunk: list[int] = []
+    for receiver_id in receiver_ids:
+        chunk.append(receiver_id)
+        if len(chunk) >= batch_size:
+            created += _create_chunk(sender_id, message, chunk)
+            chunk = []
+    if chunk:
+        created += _create_chunk(sender_id, message, chunk)
+    return created
+
+
+def _create_chunk(sender_id: Optional[int], message: str, receiver_ids: list[int]) -> int:
+    from .serializers import NotificationSerializer
+
+    with transaction.atomic():
+        rows = Notification.objects.bulk_create(
+            [Notification(sender_id=sender_id, receiver_id=receiver_id, message=message) for receiver_id in receiver_ids]
+        )
+        DashboardSummary.objects.filter(pk__in=receiver_ids).update(unread_notifications=F("unread_notifications") + 1)
+        UserDataVersion.bump(receiver_ids, "notifications")
+        if rows and rows[0].pk is not None:
+            events = [(row.receiver_id, {"type": "notification", "notification": dict(data)}) for row, data in zip(rows, NotificationSerializer(rows, many=True).data)]
+        else:
+            events = [(receiver_id, {"type": "unread_changed"}) for receiver_id in receiver_ids]
+        transaction.on_commit(lambda: publish_user_events(events))
+    return len(rows)
+
+
+def mark_notifications_read(user, ids: Optional[Iterable[int]] = None) -> int:
+    """Mark the user's unread notifications (all, or only ``ids``) read with a single UPDATE."""
+    unread = Notification.objects.filter(receiver=user, is_read=False)
+    if ids is not None:
+        unread = unread.filter(pk__in=list(ids))
+    with transaction.atomic():
+        updated = unread.update(is_read=True)
+        if updated:
+            # update() bypasses the signal handlers that maintain these
+            DashboardSummary.apply_delta(user.pk, unread_notifications=-updated)
+            UserDataVersion.bump(user.pk, "notifications")
+            transaction.on_commit(lambda: publish_user_event(user.pk, {"type": "unread_changed"}))
+    return updated
@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import checks, signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from apps.models_app.dashboard import DashboardSummary
+from apps.models_app.notifications import Notification
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription(ABC):
+    """One connected stream's view of a user's events."""
+
+    async def start(self) -> None:
+        """Begin receiving; events published after this returns are delivered."""
+
+    @abstractmethod
+    async def get(self, timeout: float) -> Optional[dict]:
+        """Next event, or None when ``timeout`` seconds pass without one."""
+
+    async def close(self) -> None:
+        pass
+
+
+class NotificationBroker(ABC):
+    """Fans per-user events out to every connected stream of that user.
+
+    ``publish`` is called from synchronous signal handlers in any worker;
+    ``subscribe`` from the async stream view.
+    """
+
+    @abstractmethod
+    def publish(self, user_id: int, event: dict) -> None:
+        """Deliver ``event`` to the user's streams, in whichever processes serve them."""
+
+    def publish_many(self, events: list[tuple[int, dict]]) -> None:
+        for user_id, event in events:
+            self.publish(user_id, event)
+
+    @abstractmethod
+    def subscribe(self, user_id: int) -> Subscription:
+        """A subscription to the user's events; call from the event loop that will read it."""
+
+
+class _QueueSubscription(Subscription):
+    def __init__(self, broker: "InProcessBroker", user_id: int, loop: asyncio.AbstractEventLoop, maxsize: int) -> None:
+        self.broker = broker
+        self.user_id = user_id
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def push(self, event: dict) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            self.broker.unsubscribe(self)  # event loop already closed
+
+    def _put(self, event: dict) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()  # a slow client loses the oldest event, not the newest
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker(NotificationBroker):
+    """Delivers only to streams served by this process; for tests and single-process servers."""
+
+    def __init__(self, queue_size: int = 100) -> None:
+        self.queue_size = queue_size
+        self._subscribers: dict[int, set[_QueueSubscription]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, user_id: int, event: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscription in subscribers:
+            subscription.push(event)
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = _QueueSubscription(self, user_id, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: _QueueSubscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+
+class _RedisSubscription(Subscription):
+    def __init__(self, url: str, channel: str) -> None:
+        self.url = url
+        self.channel = channel
+        self.client = None
+        self.pubsub = None
+
+    async def start(self) -> None:
+        import redis.asyncio as redis
+
+        self.client = redis.Redis.from_url(self.url)
+        self.pubsub = self.client.pubsub()
+        await self.pubsub.subscribe(self.channel)
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if message is None or message.get("type") != "message":
+            return None
+        return json.loads(message["data"])
+
+    async def close(self) -> None:
+        if self.pubsub is not None:
+            await self.pubsub.unsubscribe(self.channel)
+            await self.pubsub.aclose()
+        if self.client is not None:
+            await self.client.aclose()
+
+
+class RedisBroker(NotificationBroker):
+    """Redis pub/sub fan-out, so a write in any web or worker process reaches every stream."""
+
+    channel_prefix = "notifications:user:"
+
+    def __init__(self, url: Optional[str] = None) -> None:
+        self.url = url or settings.REDIS_URL
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            import redis
+
+            self._client = redis.Redis.from_url(self.url)
+        return self._client
+
+    def publish(self, user_id: int, event: dict) -> None:
+        self.client.publish(f"{self.channel_prefix}{user_id}", json.dumps(event, cls=DjangoJSONEncoder))
+
+    def publish_many(self, events: list[tuple[int, dict]]) -> None:
+        pipeline = self.client.pipeline(transaction=False)
+        for user_id, event in events:
+            pipeline.publish(f"{self.channel_prefix}{user_id}", json.dumps(event, cls=DjangoJSONEncoder))
+        pipeline.execute()
+
+    def subscribe(self, user_id: int) -> Subscription:
+        return _RedisSubscription(self.url, f"{self.channel_prefix}{user_id}")
+
+
+BROKER_ALIASES = {
+    "memory": "apps.api.notification_stream.InProcessBroker",
+    "redis": "apps.api.notification_stream.RedisBroker",
+}
+
+_broker: Optional[NotificationBroker] = None
+_broker_lock = threading.Lock()
+
+
+def uses_in_process_broker() -> bool:
+    path = settings.NOTIFICATION_BROKER
+    return BROKER_ALIASES.get(path, path) == BROKER_ALIASES["memory"]
+
+
+@checks.register()
+def check_notification_broker(app_configs, **kwargs):
+    """The in-process broker only reaches streams of the publishing process; refuse it with several web processes."""
+    processes = int(os.environ.get("WEB_CONCURRENCY") or 1)
+    if processes > 1 and uses_in_process_broker():
+        return [
+            checks.Error(
+                f"NOTIFICATION_BROKER 'memory' cannot reach streams across the {processes} web processes of WEB_CONCURRENCY.",
+                hint="Set REDIS_URL or NOTIFICATION_BROKER=redis.",
+                id="api.E001",
+            )
+        ]
+    return []
+
+
+def get_broker() -> NotificationBroker:
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                path = settings.NOTIFICATION_BROKER
+                _broker = import_string(BROKER_ALIASES.get(path, path))()
+    return _broker
+
+
+def publish_user_event(user_id: int, event: dict) -> None:
+    """Publish without ever failing the write that triggered it; streams resync on reconnect."""
+    try:
+        get_broker().publish(user_id, event)
+    except Exception:
+        logger.exception("Could not publish notification event for user %s", user_id)
+
+
+def publish_user_events(events: list[tuple[int, dict]]) -> None:
+    """Batch form of ``publish_user_event`` for bulk writes that bypass signals."""
+    try:
+        get_broker().publish_many(events)
+    except Exception:
+        logger.exception("Could not publish %s notification events", len(events))
+
+
+STREAM_TICKET_SALT = "apps.api.notification_stream.ticket"
+
+
+def issue_stream_ticket(token_digest: str) -> str:
+    """A credential that only opens the notification stream, for the EventSource URL.
+
+    It expires after ``NOTIFICATION_STREAM_TICKET_TTL`` seconds, so the copy
+    that lands in access and proxy logs is useless soon after; the API token
+    itself never goes into a URL.
+    """
+    return signing.dumps(token_digest, salt=STREAM_TICKET_SALT)
+
+
+def read_stream_ticket(ticket: str) -> Optional[str]:
+    """Token digest a ticket was issued for, or None when it is forged or expired."""
+    try:
+        return signing.loads(ticket, salt=STREAM_TICKET_SALT, max_age=settings.NOTIFICATION_STREAM_TICKET_TTL)
+    except signing.BadSignature:
+        return None
+
+
+def format_event(event: dict, event_id: Optional[int] = None) -> str:
+    lines = [f"event: {event['type']}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append("data: " + json.dumps(event, cls=DjangoJSONEncoder))
+    return "\n".join(lines) + "\n\n"
+
+
+def _unread_count(user_id: int) -> int:
+    summary = DashboardSummary.objects.filter(pk=user_id).values_list("unread_notifications", flat=True).first()
+    if summary is None:
+        return Notification.objects.filter(receiver_id=user_id, is_read=False).count()
+    return summary
+
+
+def _missed_notifications(user_id: int, last_event_id: Optional[str]) -> list[dict]:
+    from .serializers import NotificationSerializer
+
+    try:
+        after = int(last_event_id) if last_event_id else None
+    except ValueError:
+        after = None
+    if after is None:
+        return []
+    rows = Notification.objects.filter(receiver_id=user_id, pk__gt=after).order_by("pk")[: settings.NOTIFICATION_STREAM_REPLAY_LIMIT]
+    return list(NotificationSerializer(rows, many=True).data)
+
+
+async def notification_events(user_id: int, last_event_id: Optional[str] = None) -> AsyncIterator[str]:
+    """Server-sent events for one user: missed notifications, then live ones and unread counts.
+
+    Writers only publish hints; the unread count is read here, so idle users
+    cost nothing. The stream closes after ``NOTIFICATION_STREAM_MAX_AGE``
+    seconds and EventSource reconnects with ``Last-Event-ID``.
+    """
+    subscription = get_broker().subscribe(user_id)
+    try:
+        await subscription.start()
+        yield f"retry: {settings.NOTIFICATION_STREAM_RETRY_MS}\n\n"
+        for notification in await sync_to_async(_missed_notifications)(user_id, last_event_id):
+            yield format_event({"type": "notification", "notification": notification}, notification["id"])
+        count = await sync_to_async(_unread_count)(user_id)
+        yield format_event({"type": "unread_count", "count": count})
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.NOTIFICATION_STREAM_MAX_AGE
+        while loop.time() < deadline:
+            event = await subscription.get(timeout=settings.NOTIFICATION_STREAM_KEEPALIVE)
+            if event is None:
+                yield ": keepalive\n\n"
+                continue
+            if event["type"] == "notification":
+                yield format_event(event, event["notification"]["id"])
+            new_count = await sync_to_async(_unread_count)(user_id)
+            if new_count != count:
+                count = new_count
+                yield format_event({"type": "unread_count", "count": count})
+    finally:
+        await subscription.close()
+
+
+@receiver(post_save, sender=Notification, dispatch_uid="notification_stream_save")
+def publish_notification_change(sender, instance, created, **kwargs):
+    from .serializers import NotificationSerializer
+
+    user_id = instance.receiver_id
+    if created:
+        event = {"type": "notification", "notification": dict(NotificationSerializer(instance).data)}
+    else:
+        event = {"type": "unread_changed"}
+    transaction.on_commit(lambda: publish_user_event(user_id, event))
+
+
+@receiver(post_delete, sender=Notification, dispatch_uid="notification_stream_delete")
+def publish_notification_delete(sender, instance, **kwargs):
+    user_id = instance.receiver_id
+    transaction.on_commit(lambda: publish_user_event(user_id, {"type": "unread_changed"}))
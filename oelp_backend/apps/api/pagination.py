@@ -1,7 +1,171 @@
-from rest_framework.pagination import PageNumberPagination
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any, Optional
+
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
 
 
 class DefaultPageNumberPagination(PageNumberPagination):
     page_size_query_param = "page_size"
     max_page_size = 100
 
+
+class BatchPageNumberPagination(DefaultPageNumberPagination):
+    """Larger pages for endpoints that process rows in vectorized batches."""
+
+    page_size = 500
+    max_page_size = 5000
+
+
+class KeysetPagination(BasePagination):
+    """Forward-only keyset pagination over a unique composite ordering.
+
+    The cursor carries the ordering values of the last row served, so each
+    page is an indexed range scan with no COUNT(*) and no OFFSET. Views set
+    ``keyset_ordering``, e.g. ``("-created_at", "-id")``.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering: tuple[str, ...] = ("-created_at", "-id")
+    invalid_cursor_message = _("Invalid cursor")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.page_queryset(queryset, request, view)
+        return None if queryset is None else self.take_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset`` for async views; ``request`` may be a plain Django request."""
+        queryset = self.page_queryset(queryset, request, view)
+        return None if queryset is None else self.take_page([row async for row in queryset])
+
+    def page_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.ordering = tuple(getattr(view, "keyset_ordering", self.ordering))
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self.after(position))
+        return queryset[: self.page_size + 1]
+
+    def take_page(self, rows: list) -> list:
+        self.has_next = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        self.next_position = [getattr(rows[-1], name.lstrip("-")) for name in self.ordering] if self.has_next else None
+        return rows
+
+    @staticmethod
+    def query_params(request):
+        return getattr(request, "query_params", None) or request.GET
+
+    def get_page_size(self, request) -> Optional[int]:
+        try:
+            size = int(self.query_params(request)[self.page_size_query_param])
+            if size > 0:
+                return min(size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return api_settings.PAGE_SIZE
+
+    def after(self, position: list) -> Q:
+        # (a, b) after (x, y) in descending order: a < x OR (a = x AND b < y)
+        condition = Q()
+        equal = Q()
+        for name, value in zip(self.ordering, position):
+            field = name.lstrip("-")
+            lookup = "lt" if name.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{field}__{lookup}": value})
+            equal &= Q(**{field: value})
+        return condition
+
+    def decode_cursor(self, request, model) -> Optional[list]:
+        encoded = self.query_params(request).get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")).decode("utf-8"))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                model._meta.get_field(name.lstrip("-")).to_python(value)
+                for name, value in zip(self.ordering, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position: list) -> str:
+        # isoformat keeps microseconds; DjangoJSONEncoder would truncate them and skip rows
+        payload = json.dumps([value.isoformat() if hasattr(value, "isoformat") else value for value in position])
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "previous": None, "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class KeysetOrPageNumberPagination(BasePagination):
+    """Keyset pages or numbered pages, chosen per request.
+
+    ``?pagination=cursor|page`` picks explicitly; a ``cursor`` parameter
+    implies keyset. Otherwise the view's ``pagination_mode`` (default
+    ``"page"``, which keeps the numbered response shape with ``count``)
+    decides. Keyset mode needs the view's ``keyset_ordering``.
+    """
+
+    def __init__(self) -> None:
+        self.delegate: Any = None
+
+    def get_delegate(self, request, view):
+        mode = request.query_params.get("pagination")
+        if mode not in ("cursor", "page"):
+            mode = "cursor" if KeysetPagination.cursor_query_param in request.query_params else getattr(view, "pagination_mode", "page")
+        if mode == "cursor" and getattr(view, "keyset_ordering", None):
+            return KeysetPagination()
+        return DefaultPageNumberPagination()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.delegate = self.get_delegate(request, view)
+        keyset_ordering = getattr(view, "keyset_ordering", None)
+        if keyset_ordering and not queryset.ordered:
+            queryset = queryset.order_by(*keyset_ordering)
+        return self.delegate.paginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response(self, data):
+        return self.delegate.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return DefaultPageNumberPagination().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        return DefaultPageNumberPagination().get_schema_operation_parameters(view) + [
+            {"name": "pagination", "required": False, "in": "query", "schema": {"type": "string", "enum": ["cursor", "page"]}},
+            {"name": KeysetPagination.cursor_query_param, "required": False, "in": "query", "schema": {"type": "string"}},
+        ]
@@ -0,0 +1,157 @@
+"""Password hashing off the request thread, in a bounded per-process pool.
+
+Argon2 (argon2-cffi) and PBKDF2 (hashlib) release the GIL while hashing,
+so a thread pool gives real parallelism. Its size caps how many CPUs a
+worker process spends on hashing. Requests that cannot get a slot within
+``PASSWORD_HASHING_WAIT_TIMEOUT`` fail fast with ``HashingPoolBusy``
+instead of piling up behind a login storm.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional, TypeVar
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import Argon2PasswordHasher, check_password, get_hasher, identify_hasher, make_password
+
+T = TypeVar("T")
+
+
+class ConfigurableArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2 with its cost taken from settings.
+
+    The algorithm name is unchanged, so existing hashes keep verifying and
+    are re-hashed at the new cost on the user's next login.
+    """
+
+    time_cost = settings.ARGON2_TIME_COST
+    memory_cost = settings.ARGON2_MEMORY_COST
+    parallelism = settings.ARGON2_PARALLELISM
+
+
+class HashingPoolBusy(Exception):
+    pass
+
+
+class HashTimings:
+    """Time one request spent waiting for a hashing slot and hashing."""
+
+    def __init__(self) -> None:
+        self.wait_ms = 0.0
+        self.hash_ms = 0.0
+        self.count = 0
+
+    def server_timing(self) -> str:
+        return f'hash;dur={self.hash_ms:.1f};desc="password hash x{self.count}", hash-wait;dur={self.wait_ms:.1f}'
+
+
+_timings_var: ContextVar[Optional[HashTimings]] = ContextVar("password_hash_timings", default=None)
+
+_pool: Optional[ThreadPoolExecutor] = None
+_slots: Optional[threading.BoundedSemaphore] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> tuple[ThreadPoolExecutor, threading.BoundedSemaphore]:
+    global _pool, _slots
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                workers = settings.PASSWORD_HASHING_WORKERS
+                _slots = threading.BoundedSemaphore(workers + settings.PASSWORD_HASHING_MAX_PENDING)
+                _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+    return _pool, _slots
+
+
+def run_hashing(func: Callable[..., T], *args) -> T:
+    """Run a hashing call in the pool and wait for it, recording its timing on the current request."""
+    pool, slots = _get_pool()
+    queued = time.perf_counter()
+    if not slots.acquire(timeout=settings.PASSWORD_HASHING_WAIT_TIMEOUT):
+        raise HashingPoolBusy("Too many concurrent sign-ins, retry shortly")
+    started = [0.0]
+
+    def timed():
+        started[0] = time.perf_counter()
+        return func(*args)
+
+    try:
+        result = pool.submit(timed).result()
+    finally:
+        slots.release()
+    timings = _timings_var.get()
+    if timings is not None:
+        finished = time.perf_counter()
+        timings.wait_ms += (started[0] - queued) * 1000
+        timings.hash_ms += (finished - started[0]) * 1000
+        timings.count += 1
+    return result
+
+
+@contextmanager
+def measure_hashing():
+    """Collect ``run_hashing`` timings for the enclosed block, e.g. one request."""
+    timings = HashTimings()
+    token = _timings_var.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings_var.reset(token)
+
+
+def hash_password(raw_password: str) -> str:
+    return run_hashing(make_password, raw_password)
+
+
+def set_password(user, raw_password: str) -> None:
+    """``user.set_password`` with the hashing done in the pool."""
+    user.password = hash_password(raw_password)
+    # Lets password validators see the change on save, as set_password does
+    user._password = raw_password
+
+
+def verify_password(user, raw_password: str) -> bool:
+    """``user.check_password`` with the hashing done in the pool.
+
+    Outdated hashes are upgraded in the caller's thread, so the pool never
+    touches the database.
+    """
+    encoded = user.password
+    if not run_hashing(check_password, raw_password, encoded):
+        return False
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return True
+    preferred = get_hasher("default")
+    if hasher.algorithm != preferred.algorithm or preferred.must_update(encoded):
+        set_password(user, raw_password)
+        user.save(update_fields=["password"])
+    return True
+
+
+class PooledHashingBackend(ModelBackend):
+    """``ModelBackend`` whose password checks run in the hashing pool."""
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash anyway so unknown usernames take as long as wrong passwords
+            hash_password(password)
+            return None
+        if verify_password(user, password) and self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.models_app.data_version import UserDataVersion
+from apps.models_app.payment_event import PaymentWebhookEvent
+from apps.models_app.user_plan import Transaction, UserPlan
+
+from .entitlements import invalidate_entitlements
+
+logger = logging.getLogger(__name__)
+
+# Transaction status each handled event type moves its order to
+EVENT_STATUSES = {
+    "payment.authorized": "authorized",
+    "payment.captured": "paid",
+    "order.paid": "paid",
+    "payment.failed": "failed",
+    "refund.processed": "refunded",
+}
+
+# Events may arrive out of order; a status never moves back to an earlier
+# stage, so a late "payment.failed" for an earlier attempt cannot undo a payment
+STATUS_RANK = {"created": 0, "authorized": 1, "failed": 1, "paid": 2, "refunded": 3}
+
+
+def record_webhook_event(body: bytes, event_id: str = "") -> PaymentWebhookEvent:
+    """Store a verified webhook body in the inbox with a single INSERT.
+
+    Redeliveries of a known event id are dropped by the database. Bodies
+    without an event id are keyed by their digest. Raises ``ValueError``
+    for bodies that are not a JSON object.
+    """
+    payload = json.loads(body)
+    if not isinstance(payload, dict):
+        raise ValueError("Webhook body is not a JSON object")
+    event = PaymentWebhookEvent(
+        event_id=(event_id or hashlib.sha256(body).hexdigest())[:64],
+        event_type=str(payload.get("event", ""))[:64],
+        payload=payload,
+    )
+    PaymentWebhookEvent.objects.bulk_create([event], ignore_conflicts=True)
+    return event
+
+
+def enqueue_processing() -> None:
+    from .tasks import process_payment_events
+
+    try:
+        process_payment_events.delay()
+    except Exception:
+        # The event is already stored; the process_payment_events command sweeps it up
+        logger.exception("Could not enqueue payment event processing")
+
+
+def event_order_id(payload: dict) -> str:
+    """Gateway order id an event refers to: the order entity's id or the payment's order_id."""
+    entities = payload.get("payload") or {}
+    order = (entities.get("order") or {}).get("entity") or {}
+    payment = (entities.get("payment") or {}).get("entity") or {}
+    return str(order.get("id") or payment.get("order_id") or "")
+
+
+def process_pending_events(batch_size: int) -> int:
+    """Apply pending inbox events in batches until the inbox is drained; returns the events handled."""
+    handled = 0
+    while True:
+        count = _process_batch(batch_size)
+        handled += count
+        if count < batch_size:
+            return handled
+
+
+def _process_batch(batch_size: int) -> int:
+    with transaction.atomic():
+        # skip_locked lets several workers drain the inbox side by side
+        events = list(
+            PaymentWebhookEvent.objects.select_for_update(skip_locked=True)
+            .filter(status=PaymentWebhookEvent.Status.PENDING)
+            .order_by("received_at", "id")[:batch_size]
+        )
+        if not events:
+            return 0
+        order_ids = {event_order_id(event.payload) for event in events} - {""}
+        txns = {
+            txn.gateway_order_id: txn
+            for txn in Transaction.objects.select_for_update(of=("self",)).select_related("plan").filter(gateway_order_id__in=order_ids)
+        }
+
+        now = timezone.now()
+        changed: dict[int, Transaction] = {}
+        for event in events:
+            event.processed_at = now
+            status = EVENT_STATUSES.get(event.event_type)
+            txn = txns.get(event_order_id(event.payload))
+            if status is None:
+                event.status, event.note = PaymentWebhookEvent.Status.IGNORED, "Unhandled event type"
+            elif txn is None:
+                event.status, event.note = PaymentWebhookEvent.Status.IGNORED, "Unknown order"
+            else:
+                event.status = PaymentWebhookEvent.Status.PROCESSED
+                if status != txn.status and STATUS_RANK[status] >= STATUS_RANK.get(txn.status, 0):
+                    if status == "paid":
+                        txn._newly_paid = True
+                    txn.status, txn.updated_at = status, now
+                    changed[txn.pk] = txn
+
+        # Bulk writes skip the signals that bump data versions, so bump here
+        Transaction.objects.bulk_update(list(changed.values()), ["status", "updated_at"])
+        paid = [txn for txn in changed.values() if getattr(txn, "_newly_paid", False) and txn.status == "paid"]
+        UserDataVersion.bump({txn.user_id for txn in changed.values()}, "transactions")
+        UserDataVersion.bump(activate_plans(paid, now), "plans")
+        PaymentWebhookEvent.objects.bulk_update(events, ["status", "note", "processed_at"])
+    return len(events)
+
+
+def activate_plans(txns: Iterable[Transaction], now: datetime) -> set[int]:
+    """Start or renew the plan bought by each paid transaction; returns the affected user ids.
+
+    Buying the plan a user already has extends it from its current expiry;
+    buying a different plan replaces the user's active plan of the same type.
+    """
+    txns = [txn for txn in txns if txn.plan_id]
+    if not txns:
+        return set()
+    active: dict[int, list[UserPlan]] = {}
+    for user_plan in (
+        UserPlan.objects.select_for_update(of=("self",)).select_related("plan")
+        .filter(user_id__in={txn.user_id for txn in txns}, is_active=True)
+    ):
+        active.setdefault(user_plan.user_id, []).append(user_plan)
+
+    created: list[UserPlan] = []
+    updated: dict[int, UserPlan] = {}
+    for txn in txns:
+        plan, current = txn.plan, active.setdefault(txn.user_id, [])
+        same = next((user_plan for user_plan in current if user_plan.plan_id == plan.pk), None)
+        if same is not None:
+            same.expire_at = max(same.expire_at, now) + timedelta(days=plan.duration)
+        else:
+            for user_plan in [user_plan for user_plan in current if user_plan.plan.type == plan.type]:
+                user_plan.is_active = False
+                current.remove(user_plan)
+                if user_plan.pk:
+                    updated[user_plan.pk] = user_plan
+            same = UserPlan(user_id=txn.user_id, plan=plan, start_date=timezone.localdate(now), expire_at=now + timedelta(days=plan.duration))
+            created.append(same)
+            current.append(same)
+        same.end_date = timezone.localdate(same.expire_at)
+        same.updated_at = now
+        if same.pk:
+            updated[same.pk] = same
+
+    UserPlan.objects.bulk_update(list(updated.values()), ["is_active", "end_date", "expire_at", "updated_at"])
+    UserPlan.objects.bulk_create([user_plan for user_plan in created if user_plan.is_active])
+    user_ids = {txn.user_id for txn in txns}
+    transaction.on_commit(lambda: invalidate_entitlements(user_ids))
+    return user_ids
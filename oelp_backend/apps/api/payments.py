@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from decimal import Decimal
+from typing import Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from apps.models_app.data_version import UserDataVersion
+from apps.models_app.user_plan import Transaction
+
+
+class PaymentGatewayError(Exception):
+    pass
+
+
+class IdempotencyConflict(PaymentGatewayError):
+    """The idempotency key was already used for a different order."""
+
+
+class PaymentGateway(ABC):
+    """Outbound payment gateway API; one long-lived instance per process."""
+
+    webhook_secret = ""
+
+    @abstractmethod
+    def create_order(self, amount: int, currency: str, receipt: str, notes: Optional[dict] = None) -> dict:
+        """Create an order for ``amount`` in the currency's minor unit; returns the gateway's order dict."""
+
+    def verify_webhook_signature(self, body: bytes, signature: str) -> bool:
+        """Whether ``signature`` is the hex HMAC-SHA256 of the raw webhook body under the webhook secret."""
+        if not self.webhook_secret or not signature:
+            return False
+        expected = hmac.new(self.webhook_secret.encode(), body, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, signature)
+
+
+class RazorpayGateway(PaymentGateway):
+    """Razorpay over one pooled keep-alive session, with timeouts and retry/backoff.
+
+    Retries cover failed connects and 429/502/503/504 answers. The order
+    receipt carries our idempotency key, so a retried create that did land
+    is traceable to the same Transaction.
+    """
+
+    def __init__(self) -> None:
+        import razorpay
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=settings.PAYMENT_GATEWAY_RETRIES,
+            connect=settings.PAYMENT_GATEWAY_RETRIES,
+            read=0,
+            status=settings.PAYMENT_GATEWAY_RETRIES,
+            backoff_factor=settings.PAYMENT_GATEWAY_BACKOFF,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False,
+        )
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=settings.PAYMENT_GATEWAY_POOL_SIZE, max_retries=retry))
+        self.client = razorpay.Client(session=session, auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
+        self.timeout = (settings.PAYMENT_GATEWAY_CONNECT_TIMEOUT, settings.PAYMENT_GATEWAY_TIMEOUT)
+        self.webhook_secret = settings.RAZORPAY_WEBHOOK_SECRET
+
+    def create_order(self, amount: int, currency: str, receipt: str, notes: Optional[dict] = None) -> dict:
+        import requests
+        from razorpay.errors import BadRequestError, GatewayError, ServerError
+
+        try:
+            return self.client.order.create({"amount": amount, "currency": currency, "receipt": receipt, "notes": notes or {}}, timeout=self.timeout)
+        except (requests.RequestException, BadRequestError, GatewayError, ServerError, ValueError) as exc:
+            raise PaymentGatewayError(str(exc) or exc.__class__.__name__)
+
+
+class FakeGateway(PaymentGateway):
+    """In-memory gateway for local runs and load tests; no network access.
+
+    ``FAKE_GATEWAY_LATENCY_MS`` simulates the upstream round trip, and
+    orders are deduplicated by receipt the way a real idempotent API would.
+    """
+
+    def __init__(self) -> None:
+        self.latency = settings.FAKE_GATEWAY_LATENCY_MS / 1000.0
+        self.webhook_secret = settings.FAKE_GATEWAY_WEBHOOK_SECRET
+        self._orders: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def create_order(self, amount: int, currency: str, receipt: str, notes: Optional[dict] = None) -> dict:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            order = self._orders.get(receipt)
+            if order is None:
+                order = {
+                    "id": f"order_fake{secrets.token_hex(7)}",
+                    "entity": "order",
+                    "amount": amount,
+                    "amount_paid": 0,
+                    "amount_due": amount,
+                    "currency": currency,
+                    "receipt": receipt,
+                    "status": "created",
+                    "attempts": 0,
+                    "notes": notes or {},
+                    "created_at": int(time.time()),
+                }
+                self._orders[receipt] = order
+        return dict(order)
+
+
+GATEWAY_ALIASES = {
+    "razorpay": "apps.api.payments.RazorpayGateway",
+    "fake": "apps.api.payments.FakeGateway",
+}
+
+_gateway: Optional[PaymentGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> PaymentGateway:
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                path = settings.PAYMENT_GATEWAY
+                _gateway = import_string(GATEWAY_ALIASES.get(path, path))()
+    return _gateway
+
+
+def _order_payload(txn: Transaction, amount: int) -> dict:
+    return {"id": txn.gateway_order_id, "amount": amount, "currency": txn.currency, "receipt": txn.idempotency_key, "status": "created", "transaction": txn.pk}
+
+
+def open_order(user, amount: int, currency: str, plan_id: Optional[int] = None, idempotency_key: Optional[str] = None) -> tuple[Transaction, Optional[dict]]:
+    """The ``created`` Transaction behind an order, and the order to replay if its key already has one."""
+    key = idempotency_key or secrets.token_hex(16)
+    major_amount = (Decimal(amount) / 100).quantize(Decimal("0.01"))
+    try:
+        with transaction.atomic():
+            txn = Transaction.objects.create(
+                user=user, plan_id=plan_id, amount=major_amount, currency=currency, status="created", idempotency_key=key
+            )
+    except IntegrityError:
+        txn = Transaction.objects.get(user=user, idempotency_key=key)
+        if txn.amount != major_amount or txn.currency != currency or txn.plan_id != plan_id:
+            raise IdempotencyConflict("Idempotency key already used for a different order")
+        if txn.gateway_order_id:
+            return txn, _order_payload(txn, amount)
+    return txn, None
+
+
+def request_order(txn: Transaction, amount: int) -> dict:
+    """The gateway call alone; no database access, so async callers may run it on any thread."""
+    return get_gateway().create_order(amount, txn.currency, receipt=txn.idempotency_key, notes={"transaction": str(txn.pk), "user": str(txn.user_id)})
+
+
+def record_order(txn: Transaction, amount: int, order: dict) -> dict:
+    # A retry after a failed gateway call reopens the transaction
+    if Transaction.objects.filter(pk=txn.pk, gateway_order_id__isnull=True).update(
+        gateway_order_id=order["id"], status="created", updated_at=timezone.now()
+    ):
+        UserDataVersion.bump(txn.user_id, "transactions")
+    txn.refresh_from_db(fields=["gateway_order_id"])
+    if txn.gateway_order_id != order["id"]:
+        # A concurrent retry with the same key won the race; hand back its order
+        return _order_payload(txn, amount)
+    return {**order, "transaction": txn.pk}
+
+
+def fail_order(txn: Transaction) -> None:
+    """Mark a transaction whose gateway call failed, unless a concurrent retry got an order for it."""
+    if Transaction.objects.filter(pk=txn.pk, gateway_order_id__isnull=True).update(status="failed", updated_at=timezone.now()):
+        UserDataVersion.bump(txn.user_id, "transactions")
+
+
+def create_order(user, amount: int, currency: str, plan_id: Optional[int] = None, idempotency_key: Optional[str] = None) -> dict:
+    """Create (or replay) a gateway order backed by a ``created`` Transaction.
+
+    The same idempotency key always yields the same order, so client retries
+    and double submits never open a second order. The gateway call runs
+    outside any DB transaction; if it fails the Transaction is marked
+    ``failed``, and a retry with the same key reopens it.
+    """
+    txn, replay = open_order(user, amount, currency, plan_id, idempotency_key)
+    if replay is not None:
+        return replay
+    try:
+        order = request_order(txn, amount)
+    except PaymentGatewayError:
+        fail_order(txn)
+        raise
+    return record_order(txn, amount, order)
+
+
+async def acreate_order(user, amount: int, currency: str, plan_id: Optional[int] = None, idempotency_key: Optional[str] = None) -> dict:
+    """``create_order`` for async views.
+
+    The ORM steps run on Django's thread-sensitive executor, whose
+    connections are closed at the end of the request like any sync view's;
+    only the gateway's HTTP call gets a thread of its own, so a slow upstream
+    does not queue behind other requests' ORM work.
+    """
+    txn, replay = await sync_to_async(open_order)(user, amount, currency, plan_id, idempotency_key)
+    if replay is not None:
+        return replay
+    try:
+        order = await sync_to_async(request_order, thread_sensitive=False)(txn, amount)
+    except PaymentGatewayError:
+        await sync_to_async(fail_order)(txn)
+        raise
+    return await sync_to_async(record_order)(txn, amount, order)
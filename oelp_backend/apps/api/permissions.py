@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
+from .entitlements import consume
+from .role_cache import request_role_names
+
 
 class IsOwnerOrReadOnly(BasePermission):
     def has_object_permission(self, request, view, obj) -> bool:
@@ -17,6 +20,37 @@ class HasRole(BasePermission):
     def has_permission(self, request, view) -> bool:
         if not self.required_roles:
             return True
-        user_roles = set(request.user.user_roles.select_related("role").values_list("role__name", flat=True))
-        return any(role in user_roles for role in self.required_roles) or request.user.is_staff
+        if request.user.is_staff:
+            return True
+        user_roles = request_role_names(request)
+        return any(role in user_roles for role in self.required_roles)
+
+
+class CanBroadcastNotifications(HasRole):
+    required_roles = ["SuperAdmin", "Admin", "Agronomist"]
+
+
+class CanReviewSoilReports(HasRole):
+    required_roles = ["SuperAdmin", "Admin", "Agronomist"]
 
+
+class HasFeatureQuota(BasePermission):
+    """Spend one unit of the plan quota for ``view.quota_feature`` on ``view.quota_actions``.
+
+    Limits come from the cached entitlements, so the check is a single
+    conditional UPDATE for limited features and free for the rest. The
+    charge, (usage row id, amount), is left on ``request.quota_charge`` for
+    refunds.
+    """
+
+    message = "Your plan does not include this feature or its quota is used up."
+
+    def has_permission(self, request, view) -> bool:
+        feature = getattr(view, "quota_feature", None)
+        if not feature or getattr(view, "action", None) not in getattr(view, "quota_actions", ("create",)):
+            return True
+        if not (request.user and request.user.is_authenticated):
+            return False
+        usage_id = consume(request.user.pk, feature)
+        request.quota_charge = None if usage_id is None else (usage_id, 1)
+        return usage_id is not None
@@ -0,0 +1,203 @@
+"""Fertilizer and amendment recommendations for soil reports, from precomputed rule tables.
+
+``NutrientRule`` rows are compiled once per process into a dense lookup
+table indexed by (crop, variety, soil texture, nutrient slot) that holds
+the winning rule for every combination, plus one float array per rule
+parameter. Evaluating a batch of reports is then a handful of array
+gathers and comparisons, whatever the number of reports or rules. The
+table is rebuilt when a rule changes, on the next use after the
+``nutrient_rules`` catalog version moves.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.models_app.nutrient_rule import NutrientRule
+from apps.models_app.soil_report import NUTRIENT_FIELDS, SoilReport
+
+from .catalog_cache import catalog_cache
+
+NUTRIENT_RULES_CATALOG = "nutrient_rules"
+
+# One slot per (nutrient, direction); a report gets at most one recommendation per slot
+DIRECTIONS = (NutrientRule.Direction.RAISE, NutrientRule.Direction.LOWER)
+SLOTS = tuple((nutrient, direction) for nutrient in NUTRIENT_FIELDS for direction in DIRECTIONS)
+_SLOT_INDEX = {slot: index for index, slot in enumerate(SLOTS)}
+_SLOT_COLUMNS = np.array([NUTRIENT_FIELDS.index(nutrient) for nutrient, _ in SLOTS])
+_SLOT_RAISES = np.array([direction == NutrientRule.Direction.RAISE for _, direction in SLOTS])
+
+# Columns pulled per report: ids first, then the measurements
+REPORT_COLUMNS = ("id", "field_id", "field__crop_id", "field__crop_variety_id", "soil_type_id", *NUTRIENT_FIELDS)
+
+
+def _round(values) -> list:
+    return [None if np.isnan(value) else round(float(value), 2) for value in values]
+
+
+def _positions(known: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """Table position of each id: 1 + its index in the sorted ``known`` ids, or 0 for ids no rule names."""
+    if not len(known):
+        return np.zeros(len(ids), dtype=np.intp)
+    index = np.searchsorted(known, ids)
+    clipped = np.minimum(index, len(known) - 1)
+    return np.where(known[clipped] == ids, clipped + 1, 0)
+
+
+@dataclass(frozen=True)
+class RuleTable:
+    version: int
+    crop_ids: np.ndarray
+    variety_ids: np.ndarray
+    soil_ids: np.ndarray
+    # (crops + 1, varieties + 1, soils + 1, slots) -> rule index, -1 where no rule applies
+    lookup: np.ndarray
+    threshold: np.ndarray
+    target: np.ndarray
+    base_rate: np.ndarray
+    rate_per_unit: np.ndarray
+    # NaN where the dose is uncapped
+    max_rate: np.ndarray
+    products: tuple[str, ...]
+    notes: tuple[str, ...]
+    rule_ids: tuple[int, ...]
+
+    @classmethod
+    def build(cls, rules: list[NutrientRule], version: int) -> "RuleTable":
+        crop_ids = np.unique(np.array([rule.crop_id for rule in rules if rule.crop_id], dtype=np.int64))
+        variety_ids = np.unique(np.array([rule.crop_variety_id for rule in rules if rule.crop_variety_id], dtype=np.int64))
+        soil_ids = np.unique(np.array([rule.soil_texture_id for rule in rules if rule.soil_texture_id], dtype=np.int64))
+        lookup = np.full((len(crop_ids) + 1, len(variety_ids) + 1, len(soil_ids) + 1, len(SLOTS)), -1, dtype=np.int32)
+
+        def axis(known: np.ndarray, rule_id: Optional[int]):
+            return slice(None) if rule_id is None else int(_positions(known, np.array([rule_id]))[0])
+
+        # Least specific first, so more specific rules overwrite them; ties go to the newest rule
+        ranked = sorted(
+            range(len(rules)),
+            key=lambda i: (4 * bool(rules[i].crop_variety_id) + 2 * bool(rules[i].crop_id) + bool(rules[i].soil_texture_id), rules[i].pk),
+        )
+        for index in ranked:
+            rule = rules[index]
+            slot = _SLOT_INDEX.get((rule.nutrient, rule.direction))
+            if slot is None:
+                continue
+            lookup[axis(crop_ids, rule.crop_id), axis(variety_ids, rule.crop_variety_id), axis(soil_ids, rule.soil_texture_id), slot] = index
+
+        def column(name: str) -> np.ndarray:
+            return np.array([np.nan if getattr(rule, name) is None else getattr(rule, name) for rule in rules], dtype=float)
+
+        return cls(
+            version=version,
+            crop_ids=crop_ids,
+            variety_ids=variety_ids,
+            soil_ids=soil_ids,
+            lookup=lookup,
+            threshold=column("threshold"),
+            target=column("target"),
+            base_rate=column("base_rate"),
+            rate_per_unit=column("rate_per_unit"),
+            max_rate=column("max_rate"),
+            products=tuple(rule.product for rule in rules),
+            notes=tuple(rule.note for rule in rules),
+            rule_ids=tuple(rule.pk for rule in rules),
+        )
+
+    def evaluate(self, crop_ids: np.ndarray, variety_ids: np.ndarray, soil_ids: np.ndarray, values: np.ndarray):
+        """Match every report against the table at once.
+
+        Takes per-report id arrays (-1 for none) and the (reports x
+        nutrients) value matrix. Returns the (reports x slots) applicable
+        mask, rule indices, levels and doses in kg/ha.
+        """
+        rule_index = self.lookup[_positions(self.crop_ids, crop_ids), _positions(self.variety_ids, variety_ids), _positions(self.soil_ids, soil_ids)]
+        levels = values[:, _SLOT_COLUMNS]
+        if not len(self.rule_ids):
+            return np.zeros(levels.shape, dtype=bool), rule_index, levels, np.zeros(levels.shape)
+        # Rows without a rule gather rule 0 and are masked out below
+        index = np.maximum(rule_index, 0)
+        with np.errstate(invalid="ignore"):
+            threshold = self.threshold[index]
+            applies = (rule_index >= 0) & ~np.isnan(levels) & np.where(_SLOT_RAISES, levels < threshold, levels > threshold)
+            gap = np.clip(np.where(_SLOT_RAISES, self.target[index] - levels, levels - self.target[index]), 0, None)
+        # fmin ignores the NaN of uncapped rules
+        dose = np.fmin(self.base_rate[index] + self.rate_per_unit[index] * gap, self.max_rate[index])
+        return applies, rule_index, levels, dose
+
+
+_table: Optional[RuleTable] = None
+_table_lock = threading.Lock()
+
+
+def get_rule_table() -> RuleTable:
+    """The process's compiled rule table, rebuilt after any rule changes."""
+    global _table
+    version = catalog_cache.versions([NUTRIENT_RULES_CATALOG])[0]
+    table = _table
+    if table is not None and table.version == version:
+        return table
+    with _table_lock:
+        if _table is None or _table.version != version:
+            _table = RuleTable.build(list(NutrientRule.objects.all()), version)
+        return _table
+
+
+def report_rows(queryset):
+    """``values_list`` of the report columns ``recommend`` needs, for slicing or paginating."""
+    return queryset.order_by("pk").values_list(*REPORT_COLUMNS)
+
+
+def recommend(rows) -> list[dict]:
+    """Recommendations for every report row of ``report_rows``, evaluated in one vectorized pass."""
+    rows = list(rows)
+    if not rows:
+        return []
+    data = np.array(rows, dtype=float)
+    # None -> NaN on the float conversion; a missing crop or variety becomes -1
+    ids, values = np.nan_to_num(data[:, :5], nan=-1).astype(np.int64), data[:, 5:]
+    table = get_rule_table()
+    applies, rule_index, levels, dose = table.evaluate(ids[:, 2], ids[:, 3], ids[:, 4], values)
+    results = [
+        {
+            "report": int(report_id),
+            "field": int(field_id),
+            "crop": None if crop_id < 0 else int(crop_id),
+            "crop_variety": None if variety_id < 0 else int(variety_id),
+            "soil_type": int(soil_id),
+            "recommendations": [],
+        }
+        for report_id, field_id, crop_id, variety_id, soil_id in ids
+    ]
+    hits, slots = np.nonzero(applies)
+    for row, slot, level, amount in zip(hits, slots, _round(levels[hits, slots]), _round(dose[hits, slots])):
+        index = int(rule_index[row, slot])
+        nutrient, direction = SLOTS[slot]
+        results[row]["recommendations"].append({
+            "nutrient": nutrient,
+            "direction": direction,
+            "level": level,
+            "threshold": float(table.threshold[index]),
+            "target": float(table.target[index]),
+            "product": table.products[index],
+            "dose_kg_per_ha": amount,
+            "note": table.notes[index],
+            "rule": table.rule_ids[index],
+        })
+    return results
+
+
+def recommend_report(report_id: int) -> Optional[dict]:
+    results = recommend(report_rows(SoilReport.objects.filter(pk=report_id)))
+    return results[0] if results else None
+
+
+@receiver(post_save, sender=NutrientRule, dispatch_uid="recommendations_rule_save")
+@receiver(post_delete, sender=NutrientRule, dispatch_uid="recommendations_rule_delete")
+def bump_nutrient_rules_version(sender, **kwargs):
+    catalog_cache.bump(NUTRIENT_RULES_CATALOG)
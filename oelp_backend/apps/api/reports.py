@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+from datetime import datetime
+from typing import Any, Mapping
+
+from django.db.models import Count, Max
+
+from apps.models_app.field import Field
+
+
+def report_filters(params: Mapping[str, Any]) -> dict:
+    """Normalize report query params; ``field`` is accepted as an alias of ``field_id``."""
+    filters = {
+        "start_date": params.get("start_date"),
+        "end_date": params.get("end_date"),
+        "field_id": params.get("field_id") or params.get("field"),
+    }
+    return {key: str(value) for key, value in filters.items() if value}
+
+
+def report_queryset(user, params: Mapping[str, Any]):
+    """Fields for a report export, narrowed by start_date/end_date (YYYY-MM-DD) and field_id."""
+    filters = report_filters(params)
+    start_date = None
+    end_date = None
+    try:
+        if filters.get("start_date"):
+            start_date = datetime.strptime(filters["start_date"], "%Y-%m-%d").date()
+        if filters.get("end_date"):
+            end_date = datetime.strptime(filters["end_date"], "%Y-%m-%d").date()
+    except Exception:
+        pass
+    queryset = Field.objects.filter(user=user)
+    if filters.get("field_id"):
+        queryset = queryset.filter(pk=filters["field_id"])
+    if start_date:
+        queryset = queryset.filter(updated_at__date__gte=start_date)
+    if end_date:
+        queryset = queryset.filter(updated_at__date__lte=end_date)
+    return queryset
+
+
+def fields_data_version(queryset) -> str:
+    # Any create/update moves max(updated_at); a delete changes the count
+    stats = queryset.aggregate(latest=Max("updated_at"), total=Count("id"))
+    latest = stats["latest"].isoformat() if stats["latest"] else "-"
+    return f"{stats['total']}:{latest}"
+
+
+def report_cache_key(user_id: int, kind: str, filters: dict, data_version: str) -> str:
+    payload = json.dumps([user_id, kind, filters, data_version], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def render_fields_pdf(queryset, title: str = "OELP Report") -> bytes:
+    """Render every field in ``queryset``, continuing onto new pages as needed."""
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    p = canvas.Canvas(buffer)
+    p.setTitle(title)
+    p.drawString(100, 800, title)
+    y = 760
+    for name in queryset.order_by("pk").values_list("name", flat=True).iterator(chunk_size=2000):
+        if y < 60:
+            p.showPage()
+            y = 800
+        p.drawString(100, y, f"Field: {name}")
+        y -= 20
+    p.showPage()
+    p.save()
+    return buffer.getvalue()
+
+
+def render_invoice_pdf(txn) -> bytes:
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    p = canvas.Canvas(buffer)
+    p.setTitle("Invoice")
+    y = 800
+    p.drawString(100, y, "Invoice")
+    y -= 20
+    p.drawString(100, y, f"Transaction ID: {txn.id}")
+    y -= 20
+    p.drawString(100, y, f"User: {txn.user.username}")
+    y -= 20
+    p.drawString(100, y, f"Plan: {getattr(txn.plan, 'name', '-')}")
+    y -= 20
+    p.drawString(100, y, f"Amount: {txn.amount} {txn.currency}")
+    y -= 20
+    p.drawString(100, y, f"Status: {txn.status}")
+    y -= 40
+    p.drawString(100, y, "Thank you for your purchase.")
+    p.showPage()
+    p.save()
+    return buffer.getvalue()
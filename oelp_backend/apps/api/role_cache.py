@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.models_app.user import Role, UserRole
+
+from .catalog_cache import catalog_cache, shared_timeout
+
+# Catalog version bumped on Role writes, so renamed or deleted roles retire
+# every cached membership set
+ROLES_CATALOG = "roles"
+
+# Role given to every self-service account
+END_USER_ROLE = "End-App-User"
+
+
+class RoleCache:
+    """Process-wide Role rows by name; created on first use, refreshed after ``ttl`` seconds."""
+
+    def __init__(self, ttl: float = 300.0) -> None:
+        self.ttl = ttl
+        self._roles: dict[str, tuple[Role, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Role:
+        with self._lock:
+            entry = self._roles.get(name)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+        role, _ = Role.objects.get_or_create(name=name)
+        with self._lock:
+            self._roles[name] = (role, time.monotonic() + self.ttl)
+        return role
+
+    def clear(self) -> None:
+        with self._lock:
+            self._roles.clear()
+
+
+role_cache = RoleCache(ttl=getattr(settings, "ROLE_CACHE_TTL", 300))
+
+
+def _membership_key(user_id: int, version: int) -> str:
+    return f"roles:user:{user_id}:{version}"
+
+
+def user_role_names(user_id: int) -> frozenset[str]:
+    """Names of the user's roles, from the Django cache when possible.
+
+    Entries are dropped when the user's UserRole rows change. With the
+    local-memory cache other processes only see that after their entry
+    expires, so the timeout is kept short there.
+    """
+    key = _membership_key(user_id, catalog_cache.versions([ROLES_CATALOG])[0])
+    names = cache.get(key)
+    if names is None:
+        names = frozenset(UserRole.objects.filter(user_id=user_id).values_list("role__name", flat=True))
+        cache.set(key, names, timeout=shared_timeout(settings.ROLE_CACHE_TTL))
+    return names
+
+
+def request_role_names(request) -> frozenset[str]:
+    """``user_role_names`` resolved at most once per request, however many permissions ask."""
+    names = getattr(request, "_role_names", None)
+    if names is None:
+        names = request._role_names = user_role_names(request.user.pk)
+    return names
+
+
+def ensure_role(user, name: str = END_USER_ROLE) -> None:
+    """Give ``user`` the role unless they already have it; no writes in the common case."""
+    if name in user_role_names(user.pk):
+        return
+    UserRole.objects.get_or_create(user=user, role=role_cache.get(name), defaults={"userrole_id": user.email or user.username})
+
+
+def invalidate_user_roles(user_id: int) -> None:
+    cache.delete(_membership_key(user_id, catalog_cache.versions([ROLES_CATALOG])[0]))
+
+
+@receiver(post_save, sender=UserRole, dispatch_uid="role_cache_user_role_save")
+@receiver(post_delete, sender=UserRole, dispatch_uid="role_cache_user_role_delete")
+def invalidate_cached_user_roles(sender, instance, **kwargs):
+    # After commit, so a concurrent miss cannot re-cache the old membership
+    transaction.on_commit(lambda: invalidate_user_roles(instance.user_id))
+
+
+@receiver(post_save, sender=Role, dispatch_uid="role_cache_role_save")
+@receiver(post_delete, sender=Role, dispatch_uid="role_cache_role_delete")
+def invalidate_cached_roles(sender, **kwargs):
+    role_cache.clear()
+    catalog_cache.bump(ROLES_CATALOG)
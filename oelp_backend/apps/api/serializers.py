@@ -7,11 +7,13 @@ from apps.models_app.assets import Asset
 from apps.models_app.crop_variety import Crop, CropVariety
 from apps.models_app.farm import Farm
 from apps.models_app.field import Field, Device, CropLifecycleDates, FieldIrrigationMethod, FieldIrrigationPractice
+from apps.models_app.geometry import boundary_error
 from apps.models_app.feature import Feature, FeatureType
 from apps.models_app.feature_plan import PlanFeature
 from apps.models_app.irrigation import IrrigationMethods
 from apps.models_app.notifications import Notification, SupportRequest
 from apps.models_app.plan import Plan
+from apps.models_app.report_job import ReportJob
 from apps.models_app.soil_report import SoilTexture, SoilReport
 from apps.models_app.token import UserAuthToken
 from apps.models_app.user import CustomUser
@@ -23,6 +25,9 @@ from apps.models_app.user_plan import (
     Transaction,
 )
 
+from .crop_seasons import STAGES, days
+from .password_hashing import hash_password
+
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -46,11 +51,8 @@ class SignUpSerializer(serializers.ModelSerializer):
         return value
 
     def create(self, validated_data):
-        password = validated_data.pop("password")
-        user = CustomUser.objects.create_user(**validated_data)
-        user.set_password(password)
-        user.save()
-        return user
+        # One hash, in the hashing pool, and a single INSERT
+        return CustomUser.objects.create_user(password_hash=hash_password(validated_data.pop("password")), **validated_data)
 
 
 class LoginSerializer(serializers.Serializer):
@@ -111,16 +113,68 @@ class FieldSerializer(serializers.ModelSerializer):
             "image",
             "is_active",
             "is_locked",
+            "latest_soil_report",
             "created_at",
             "updated_at",
         )
         read_only_fields = ("user", "created_at", "updated_at", "area")
 
+    def validate_boundary(self, value):
+        # Area and bbox are derived from it on save; reject what cannot be measured
+        if value is not None:
+            error = boundary_error(value)
+            if error:
+                raise serializers.ValidationError(error)
+        return value
+
 
 class CropLifecycleDatesSerializer(serializers.ModelSerializer):
     class Meta:
         model = CropLifecycleDates
-        fields = ("id", "field", "sowing_date", "growth_start_date", "flowering_date", "harvesting_date", "yield_amount")
+        fields = (
+            "id",
+            "field",
+            "crop",
+            "crop_variety",
+            "area_hectares",
+            "season",
+            "sowing_date",
+            "growth_start_date",
+            "flowering_date",
+            "harvesting_date",
+            "yield_amount",
+            "created_at",
+            "updated_at",
+        )
+        read_only_fields = ("created_at", "updated_at")
+
+
+class CropSeasonTimelineSerializer(CropLifecycleDatesSerializer):
+    """A season with the comparisons annotated by ``crop_seasons.timeline_queryset``."""
+
+    field_name = serializers.CharField(source="field.name", read_only=True)
+    crop_name = serializers.CharField(source="crop.name", read_only=True, default=None)
+    yield_per_ha = serializers.FloatField(read_only=True)
+    season_number = serializers.IntegerField(read_only=True)
+    previous_yield_per_ha = serializers.FloatField(read_only=True)
+    crop_avg_yield_per_ha = serializers.FloatField(read_only=True)
+    crop_yield_rank = serializers.IntegerField(read_only=True)
+    stage_days = serializers.SerializerMethodField()
+
+    class Meta(CropLifecycleDatesSerializer.Meta):
+        fields = CropLifecycleDatesSerializer.Meta.fields + (
+            "field_name",
+            "crop_name",
+            "yield_per_ha",
+            "season_number",
+            "previous_yield_per_ha",
+            "crop_avg_yield_per_ha",
+            "crop_yield_rank",
+            "stage_days",
+        )
+
+    def get_stage_days(self, obj) -> dict:
+        return {stage: days(getattr(obj, f"{stage}_duration", None)) for stage, _, _ in STAGES}
 
 
 class FieldIrrigationMethodSerializer(serializers.ModelSerializer):
@@ -135,7 +189,17 @@ class FieldIrrigationPracticeSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = FieldIrrigationPractice
-        fields = ("id", "field", "field_name", "irrigation_method", "method_name", "notes", "performed_at")
+        fields = (
+            "id",
+            "field",
+            "field_name",
+            "irrigation_method",
+            "method_name",
+            "notes",
+            "performed_at",
+            "duration_minutes",
+            "water_volume",
+        )
 
 
 class SoilTextureSerializer(serializers.ModelSerializer):
@@ -164,6 +228,12 @@ class SoilReportSerializer(serializers.ModelSerializer):
             "report_link",
         )
 
+    def validate_field(self, field):
+        request = self.context.get("request")
+        if request is not None and field.user_id != request.user.pk:
+            raise serializers.ValidationError("Field not found.")
+        return field
+
 
 class IrrigationMethodSerializer(serializers.ModelSerializer):
     class Meta:
@@ -203,6 +273,22 @@ class NotificationSerializer(serializers.ModelSerializer):
         fields = ("id", "sender", "receiver", "message", "is_read", "created_at")
 
 
+class NotificationFanOutSerializer(serializers.Serializer):
+    message = serializers.CharField()
+    roles = serializers.ListField(child=serializers.CharField(), required=False, default=list)
+    plans = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+    crops = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+
+    def validate(self, attrs):
+        if not (attrs["roles"] or attrs["plans"] or attrs["crops"]):
+            raise serializers.ValidationError("Target at least one of roles, plans or crops.")
+        return attrs
+
+
+class NotificationMarkReadSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=1000)
+
+
 class SupportRequestSerializer(serializers.ModelSerializer):
     class Meta:
         model = SupportRequest
@@ -236,3 +322,17 @@ class TransactionSerializer(serializers.ModelSerializer):
         model = Transaction
         fields = ("id", "plan", "plan_name", "amount", "currency", "status", "invoice_pdf", "created_at")
 
+
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportJob
+        fields = ("id", "kind", "params", "status", "error", "download_url", "created_at", "started_at", "finished_at")
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        if obj.status != ReportJob.Status.DONE:
+            return None
+        return f"/api/reports/jobs/{obj.pk}/download/"
@@ -0,0 +1,164 @@
+"""Soil report statistics for one account, computed column-wise with NumPy.
+
+Reports are pulled once with ``values_list`` into a float matrix (one
+column per measurement, missing values as NaN) and every statistic is a
+vectorized pass over it; per-field trends use ``bincount`` sums instead of
+a loop over fields.
+"""
+
+from __future__ import annotations
+
+import warnings
+from typing import Optional
+
+import numpy as np
+
+from apps.models_app.soil_report import NUTRIENT_FIELDS, SoilReport
+
+NUTRIENTS = NUTRIENT_FIELDS
+
+# (low, high) bounds of the adequate range, after the Soil Health Card ratings:
+# pH and EC (dS/m), available N/P/K in kg/ha, DTPA/hot-water micronutrients in ppm.
+# None leaves that side unflagged.
+NUTRIENT_RANGES: dict[str, tuple[Optional[float], Optional[float]]] = {
+    "ph": (6.5, 7.5),
+    "ec": (None, 1.0),
+    "nitrogen": (280.0, 560.0),
+    "phosphorous": (10.0, 25.0),
+    "potassium": (110.0, 280.0),
+    "boron": (0.5, None),
+    "copper": (0.2, None),
+    "iron": (4.5, None),
+    "zinc": (0.6, None),
+    "manganese": (2.0, None),
+}
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+_LOW = np.array([np.nan if NUTRIENT_RANGES[name][0] is None else NUTRIENT_RANGES[name][0] for name in NUTRIENTS])
+_HIGH = np.array([np.nan if NUTRIENT_RANGES[name][1] is None else NUTRIENT_RANGES[name][1] for name in NUTRIENTS])
+
+
+def _clean(values) -> list:
+    """Plain floats for JSON, with NaN as None."""
+    return [None if np.isnan(value) else round(float(value), 4) for value in values]
+
+
+def load_matrix(queryset) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Field, farm and crop ids plus the (reports x nutrients) value matrix, ordered by field then report."""
+    rows = list(queryset.order_by("field_id", "id").values_list("field_id", "field__farm_id", "field__crop_id", *NUTRIENTS))
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty((0, len(NUTRIENTS)))
+    # None -> NaN on the float conversion; a missing crop becomes -1
+    data = np.array(rows, dtype=float)
+    ids = np.nan_to_num(data[:, :3], nan=-1).astype(np.int64)
+    return ids[:, 0], ids[:, 1], ids[:, 2], data[:, 3:]
+
+
+def summarize(values: np.ndarray) -> dict:
+    """Count, mean, spread and deficiency counts per nutrient of a value matrix."""
+    present = ~np.isnan(values)
+    counts = present.sum(axis=0)
+    if not len(values):
+        nan_row = np.full(len(NUTRIENTS), np.nan)
+        means = minimums = maximums = nan_row
+        percentiles = np.full((len(PERCENTILES), len(NUTRIENTS)), np.nan)
+    else:
+        with warnings.catch_warnings():
+            # All-NaN columns (a nutrient nobody measured) simply come out as NaN
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            means = np.nanmean(values, axis=0)
+            minimums = np.nanmin(values, axis=0)
+            maximums = np.nanmax(values, axis=0)
+            percentiles = np.nanpercentile(values, PERCENTILES, axis=0)
+    with np.errstate(invalid="ignore"):
+        low = (values < _LOW).sum(axis=0)
+        high = (values > _HIGH).sum(axis=0)
+    summary = {}
+    for column, name in enumerate(NUTRIENTS):
+        mean, minimum, maximum = _clean((means[column], minimums[column], maximums[column]))
+        stats = {"count": int(counts[column]), "mean": mean, "min": minimum, "max": maximum}
+        stats.update({f"p{p}": value for p, value in zip(PERCENTILES, _clean(percentiles[:, column]))})
+        stats["low"], stats["high"] = int(low[column]), int(high[column])
+        summary[name] = stats
+    return summary
+
+
+def group_summaries(keys: np.ndarray, values: np.ndarray) -> dict[str, dict]:
+    """``summarize`` per distinct key (farm or crop id); -1 is reported as "none"."""
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    unique, starts = np.unique(sorted_keys, return_index=True)
+    bounds = list(starts) + [len(sorted_keys)]
+    return {
+        ("none" if key == -1 else str(int(key))): summarize(values[order[bounds[i]:bounds[i + 1]]])
+        for i, key in enumerate(unique)
+    }
+
+
+def field_trends(field_ids: np.ndarray, values: np.ndarray) -> list[dict]:
+    """Per field: report count, latest reading, least-squares slope per report and flags on the latest reading.
+
+    Rows must be grouped by field in report order (as ``load_matrix``
+    returns them). Slopes come from per-field sums built with ``bincount``.
+    """
+    if not len(field_ids):
+        return []
+    unique, starts, inverse = np.unique(field_ids, return_index=True, return_inverse=True)
+    report_counts = np.bincount(inverse)
+    position = np.arange(len(field_ids)) - starts[inverse]  # report index within its field
+
+    slopes = np.full((len(unique), len(NUTRIENTS)), np.nan)
+    latest = np.full((len(unique), len(NUTRIENTS)), np.nan)
+    for column in range(len(NUTRIENTS)):
+        y = values[:, column]
+        present = ~np.isnan(y)
+        weight = present.astype(float)
+        y0 = np.where(present, y, 0.0)
+        n = np.bincount(inverse, weight, minlength=len(unique))
+        sx = np.bincount(inverse, position * weight, minlength=len(unique))
+        sy = np.bincount(inverse, y0, minlength=len(unique))
+        sxx = np.bincount(inverse, position * position * weight, minlength=len(unique))
+        sxy = np.bincount(inverse, position * y0, minlength=len(unique))
+        denominator = n * sxx - sx * sx
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slopes[:, column] = np.where(denominator > 0, (n * sxy - sx * sy) / denominator, np.nan)
+        # Latest non-missing reading: the highest row index per field among present values
+        last_row = np.full(len(unique), -1)
+        np.maximum.at(last_row, inverse[present], np.flatnonzero(present))
+        has_value = last_row >= 0
+        latest[has_value, column] = y[last_row[has_value]]
+
+    with np.errstate(invalid="ignore"):
+        flags = np.where(latest < _LOW, "low", np.where(latest > _HIGH, "high", ""))
+    trends = []
+    for row, field_id in enumerate(unique):
+        trends.append({
+            "field": int(field_id),
+            "reports": int(report_counts[row]),
+            "latest": dict(zip(NUTRIENTS, _clean(latest[row]))),
+            "trend": dict(zip(NUTRIENTS, _clean(slopes[row]))),
+            "flags": {name: flag for name, flag in zip(NUTRIENTS, flags[row]) if flag},
+        })
+    return trends
+
+
+def soil_analytics(user, field: Optional[int] = None, farm: Optional[int] = None, crop: Optional[int] = None) -> dict:
+    """Account-wide soil statistics, optionally narrowed to one field, farm or crop."""
+    queryset = SoilReport.objects.filter(field__user=user)
+    if field is not None:
+        queryset = queryset.filter(field_id=field)
+    if farm is not None:
+        queryset = queryset.filter(field__farm_id=farm)
+    if crop is not None:
+        queryset = queryset.filter(field__crop_id=crop)
+    field_ids, farm_ids, crop_ids, values = load_matrix(queryset)
+    return {
+        "count": int(len(values)),
+        "ranges": {name: {"low": low, "high": high} for name, (low, high) in NUTRIENT_RANGES.items()},
+        "nutrients": summarize(values),
+        "by_farm": group_summaries(farm_ids, values),
+        "by_crop": group_summaries(crop_ids, values),
+        "fields": field_trends(field_ids, values),
+    }
+
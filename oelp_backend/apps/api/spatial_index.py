@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from apps.models_app.field import Field
+from apps.models_app.geometry import haversine_m, measure_boundaries
+
+from .reports import fields_data_version
+
+
+class FieldSpatialIndex:
+    """Column arrays of one user's field ids and centroids.
+
+    A user's fields fit comfortably in memory, so nearest-field queries are
+    vectorized scans over these arrays rather than a tree walk.
+    """
+
+    def __init__(self, ids, centroids) -> None:
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.centroids = np.asarray(centroids, dtype=np.float64).reshape(-1, 2)
+
+    @classmethod
+    def build(cls, queryset) -> "FieldSpatialIndex":
+        rows = list(queryset.exclude(boundary__isnull=True).values_list("pk", "boundary"))
+        boundaries = [boundary for _, boundary in rows]
+        ids, centroids = [], []
+        for (pk, _), measured in zip(rows, measure_boundaries(boundaries)):
+            if measured is None or measured["centroid"] is None:
+                continue
+            ids.append(pk)
+            centroids.append(measured["centroid"])
+        return cls(ids, centroids)
+
+    def nearest(self, lon: float, lat: float, k: int) -> list[tuple[int, float]]:
+        if not len(self.ids):
+            return []
+        distances = haversine_m(lon, lat, self.centroids[:, 0], self.centroids[:, 1])
+        k = min(k, len(distances))
+        top = np.argpartition(distances, k - 1)[:k]
+        top = top[np.argsort(distances[top])]
+        return [(int(self.ids[i]), float(distances[i])) for i in top]
+
+
+class SpatialIndexCache:
+    """Per-process LRU of user id -> index, rebuilt when the user's field data version moves."""
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[int, tuple[str, FieldSpatialIndex]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def for_user(self, user) -> FieldSpatialIndex:
+        queryset = Field.objects.filter(user=user)
+        version = fields_data_version(queryset)
+        with self._lock:
+            entry = self._entries.get(user.pk)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(user.pk)
+                return entry[1]
+        index = FieldSpatialIndex.build(queryset)
+        with self._lock:
+            self._entries[user.pk] = (version, index)
+            self._entries.move_to_end(user.pk)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return index
+
+
+spatial_index_cache = SpatialIndexCache()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from celery import shared_task
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from apps.models_app.report_job import ReportJob
+from apps.models_app.user_plan import Transaction
+
+from .irrigation_series import compact_irrigation_history as compact_history
+from .notification_fanout import create_notifications, fan_out_recipients
+from .payment_events import process_pending_events
+from .reports import render_fields_pdf, render_invoice_pdf, report_queryset
+
+
+@shared_task
+def render_report_job(job_id: int) -> str:
+    job = ReportJob.objects.select_related("user").get(pk=job_id)
+    # A failed job was timed out and resubmitted under a new id
+    if job.status in (ReportJob.Status.DONE, ReportJob.Status.FAILED):
+        return job.status
+    job.status = ReportJob.Status.RUNNING
+    job.started_at = timezone.now()
+    job.save(update_fields=["status", "started_at"])
+    try:
+        if job.kind == ReportJob.Kind.INVOICE_PDF:
+            txn = Transaction.objects.select_related("user", "plan").get(pk=job.params["transaction_id"], user=job.user)
+            content = render_invoice_pdf(txn)
+        else:
+            content = render_fields_pdf(report_queryset(job.user, job.params))
+        job.file.save(f"{job.kind}.pdf", ContentFile(content), save=False)
+        job.status = ReportJob.Status.DONE
+        job.error = None
+    except Exception as exc:
+        job.status = ReportJob.Status.FAILED
+        job.error = str(exc)
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "file", "error", "finished_at"])
+    return job.status
+
+
+@shared_task
+def fan_out_notifications(sender_id, message: str, roles=(), plans=(), crops=()) -> int:
+    receiver_ids = list(fan_out_recipients(roles, plans, crops))
+    return create_notifications(sender_id, message, receiver_ids, batch_size=settings.NOTIFICATION_FANOUT_BATCH_SIZE)
+
+
+@shared_task
+def process_payment_events() -> int:
+    return process_pending_events(settings.PAYMENT_EVENTS_BATCH_SIZE)
+
+
+@shared_task
+def compact_irrigation_history() -> dict:
+    return compact_history()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import secrets
+
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from apps.api.token_cache import token_cache
+from apps.models_app.farm import Farm
+from apps.models_app.field import Field
+from apps.models_app.soil_report import SoilReport, SoilTexture
+from apps.models_app.token import UserAuthToken
+from apps.models_app.user import CustomUser
+from oelp_backend.celery import app as celery_app
+
+
+class OELPTestCase(APITestCase):
+    """API tests against the in-memory backends: Celery tasks run eagerly and caches start empty.
+
+    ``self.user`` is authenticated on ``self.client`` with a bearer token.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Tasks run inline, so no broker has to be reachable
+        previous = {key: celery_app.conf[key] for key in ("task_always_eager", "task_eager_propagates")}
+        celery_app.conf.update(task_always_eager=True, task_eager_propagates=True)
+        cls.addClassCleanup(celery_app.conf.update, previous)
+
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        self.user, self.token = self.create_user("farmer")
+        self.authenticate(self.token)
+
+    @staticmethod
+    def create_user(username: str, **extra) -> tuple[CustomUser, str]:
+        user = CustomUser.objects.create(username=username, phone_number=secrets.token_hex(5), **extra)
+        token = secrets.token_urlsafe(48)
+        UserAuthToken.objects.create(user=user, access_token=token)
+        return user, token
+
+    def authenticate(self, token: str) -> None:
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+    def create_field(self, name: str = "North", user=None, **extra) -> Field:
+        user = user or self.user
+        farm = Farm.objects.filter(user=user).first() or Farm.objects.create(user=user, name="Home")
+        return Field.objects.create(user=user, farm=farm, name=name, **extra)
+
+    @staticmethod
+    def create_soil_report(field: Field, ph: float = 7.0, ec: float = 0.5, **values) -> SoilReport:
+        texture = SoilTexture.objects.first() or SoilTexture.objects.create(name="Loam", icon="https://example.com/loam.png")
+        return SoilReport.objects.create(field=field, soil_type=values.pop("soil_type", texture), ph=ph, ec=ec, **values)
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient
+
+from apps.models_app.notifications import Notification
+
+from .base import OELPTestCase
+
+
+class AsyncViewTests(OELPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.create_field(area={"hectares": 3})
+        self.notifications = [Notification.objects.create(receiver=self.user, message=f"Note {index}") for index in range(3)]
+        Notification.objects.filter(pk=self.notifications[0].pk).update(is_read=True)
+        self.async_client = AsyncClient()
+
+    async def aget(self, path: str, token: str = "", **headers):
+        headers["Authorization"] = f"Token {token or self.token}"
+        return await self.async_client.get(path, headers=headers)
+
+    async def test_dashboard_matches_sync_view(self):
+        expected = (await sync_to_async(self.client.get)("/api/dashboard/")).json()
+        response = await self.aget("/api/async/dashboard/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), expected)
+
+    async def test_notifications_are_newest_first(self):
+        response = await self.aget("/api/async/notifications/")
+        ids = [row["id"] for row in response.json()["results"]]
+        self.assertEqual(ids, [notification.pk for notification in reversed(self.notifications)])
+
+    async def test_unread_count_revalidates(self):
+        first = await self.aget("/api/async/notifications/unread_count/")
+        self.assertEqual(first.json(), {"count": 2})
+        second = await self.aget("/api/async/notifications/unread_count/", **{"If-None-Match": first["ETag"]})
+        self.assertEqual(second.status_code, 304)
+
+    async def test_bad_token_is_unauthorized(self):
+        self.assertEqual((await self.async_client.get("/api/async/dashboard/")).status_code, 401)
+        self.assertEqual((await self.aget("/api/async/dashboard/", token="nope")).status_code, 401)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import threading
+from unittest import mock
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.test import override_settings
+
+from apps.api.token_cache import token_cache
+from apps.models_app.token import digest_token
+from apps.models_app.user import CustomUser
+
+from .base import OELPTestCase
+
+
+class TokenCacheInvalidationTests(OELPTestCase):
+    def test_authenticated_user_is_cached(self):
+        self.assertEqual(self.client.get("/api/auth/me/").status_code, 200)
+        self.assertIsNotNone(token_cache.get(digest_token(self.token)))
+
+    def test_logout_revokes_cached_token(self):
+        self.client.get("/api/auth/me/")
+        self.assertEqual(self.client.post("/api/auth/logout/").status_code, 200)
+        self.assertIsNone(token_cache.get(digest_token(self.token)))
+        self.assertEqual(self.client.get("/api/auth/me/").status_code, 403)
+
+    def test_token_rotation_revokes_previous_token(self):
+        self.client.get("/api/auth/me/")
+        self.user.auth_token.access_token = "rotated-token"
+        self.user.auth_token.save()
+        self.assertEqual(self.client.get("/api/auth/me/").status_code, 403)
+        self.authenticate("rotated-token")
+        self.assertEqual(self.client.get("/api/auth/me/").status_code, 200)
+
+    def test_deactivated_user_is_rejected_at_once(self):
+        self.client.get("/api/auth/me/")
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get("/api/auth/me/").status_code, 403)
+
+    def test_cached_user_is_a_copy(self):
+        self.client.get("/api/auth/me/")
+        cached = token_cache.get(digest_token(self.token))
+        cached.username = "changed"
+        self.assertEqual(token_cache.get(digest_token(self.token)).username, "farmer")
+
+
+class PasswordHashingTests(OELPTestCase):
+    password = "Wheat-harvest-2026"
+
+    def setUp(self):
+        super().setUp()
+        self.client.credentials()
+
+    def signup(self, username: str = "grower"):
+        body = {"username": username, "full_name": "Test Grower", "phone_number": "5550100", "password": self.password}
+        return self.client.post("/api/auth/signup/", body, format="json")
+
+    def login(self, username: str = "grower", password: str = ""):
+        return self.client.post("/api/auth/login/", {"username": username, "password": password or self.password}, format="json")
+
+    def test_signup_hashes_once_with_argon2(self):
+        response = self.signup()
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('desc="password hash x1"', response["Server-Timing"])
+        self.assertTrue(CustomUser.objects.get(username="grower").password.startswith("argon2$"))
+
+    def test_login_checks_the_password(self):
+        self.signup()
+        response = self.login()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('desc="password hash x1"', response["Server-Timing"])
+        self.authenticate(response.json()["token"])
+        self.assertEqual(self.client.get("/api/auth/me/").json()["username"], "grower")
+        self.assertEqual(self.login(password="wrong-password").status_code, 400)
+
+    def test_unknown_user_still_costs_a_hash(self):
+        response = self.login(username="nobody")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('desc="password hash x1"', response["Server-Timing"])
+
+    def test_legacy_hash_is_upgraded_on_login(self):
+        user, _ = self.create_user("legacy")
+        user.password = PBKDF2PasswordHasher().encode(self.password, "legacysalt", iterations=1000)
+        user.save(update_fields=["password"])
+        self.assertEqual(self.login(username="legacy").status_code, 200)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("argon2$"))
+
+    @override_settings(PASSWORD_HASHING_WAIT_TIMEOUT=0.01)
+    def test_saturated_pool_answers_503(self):
+        slots = threading.BoundedSemaphore(1)
+        slots.acquire()
+        with mock.patch("apps.api.password_hashing._get_pool", return_value=(None, slots)):
+            response = self.signup()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertFalse(CustomUser.objects.filter(username="grower").exists())
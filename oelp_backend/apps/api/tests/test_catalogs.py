@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from apps.api.catalog_cache import CATALOG_MODELS
+from apps.models_app.crop_variety import Crop, CropVariety
+
+from .base import OELPTestCase
+
+
+class CatalogCacheTests(OELPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.crop = Crop.objects.create(name="Test Wheat")
+        CropVariety.objects.create(crop=self.crop, name="Early")
+
+    def names(self, response) -> list:
+        body = response.json()
+        return [row["name"] for row in (body["results"] if isinstance(body, dict) else body)]
+
+    def test_repeat_read_is_served_without_queries(self):
+        first = self.client.get("/api/crops/")
+        self.assertEqual(first.status_code, 200)
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/crops/")
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_matching_etag_is_not_modified(self):
+        etag = self.client.get("/api/crops/")["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/crops/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_write_retires_cached_list(self):
+        first = self.client.get("/api/crops/")
+        Crop.objects.create(name="Test Rice")
+        second = self.client.get("/api/crops/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second["ETag"], first["ETag"])
+        self.assertIn("Test Rice", self.names(second))
+
+    def test_dependent_catalog_follows_its_dependency(self):
+        etag = self.client.get("/api/crop-varieties/")["ETag"]
+        self.crop.name = "Test Barley"
+        self.crop.save()
+        self.assertEqual(self.client.get("/api/crop-varieties/", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_bootstrap_returns_every_catalog(self):
+        response = self.client.get("/api/catalogs/bootstrap/")
+        self.assertEqual(set(response.json()), set(CATALOG_MODELS))
+        self.assertEqual(self.client.get("/api/catalogs/bootstrap/", HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+        CropVariety.objects.create(crop=self.crop, name="Late")
+        refreshed = self.client.get("/api/catalogs/bootstrap/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(refreshed.status_code, 200)
+        self.assertEqual(sorted(row["name"] for row in refreshed.json()["crop_varieties"]), ["Early", "Late"])
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from .base import OELPTestCase
+
+
+class ConditionalListTests(OELPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.field = self.create_field()
+
+    def revalidate(self, url: str, etag: str):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_unchanged_list_is_not_modified(self):
+        first = self.client.get("/api/fields/")
+        self.assertEqual(first.status_code, 200)
+        etag = first["ETag"]
+        # The token is cached, so only the data versions are read before answering
+        with self.assertNumQueries(1):
+            response = self.revalidate("/api/fields/", etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_field_write_changes_etag(self):
+        etag = self.client.get("/api/fields/")["ETag"]
+        self.client.patch(f"/api/fields/{self.field.pk}/", {"name": "South"}, format="json")
+        response = self.revalidate("/api/fields/", etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["name"], "South")
+
+    def test_etag_is_per_user(self):
+        etag = self.client.get("/api/fields/")["ETag"]
+        _, token = self.create_user("neighbour")
+        self.authenticate(token)
+        self.assertEqual(self.revalidate("/api/fields/", etag).status_code, 200)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from django.db import IntegrityError, transaction
+
+from apps.models_app.crop_variety import Crop
+from apps.models_app.field import CropLifecycleDates
+
+from .base import OELPTestCase
+
+
+class CropSeasonTests(OELPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.wheat = Crop.objects.create(name="Test Wheat")
+        self.field = self.create_field(crop=self.wheat, area={"hectares": 2})
+
+    def update_lifecycle(self, **body):
+        return self.client.post(f"/api/fields/{self.field.pk}/update_lifecycle/", body, format="json")
+
+    def harvest(self, sown: str, harvested: str, yield_amount: float):
+        # Every update carries the season's full set of dates
+        self.update_lifecycle(sowing_date=sown)
+        return self.update_lifecycle(sowing_date=sown, harvesting_date=harvested, yield_amount=yield_amount)
+
+    def test_harvest_closes_the_season_and_the_next_update_opens_one(self):
+        self.harvest("2025-06-01", "2025-10-01", 8)
+        response = self.update_lifecycle(sowing_date="2026-06-01")
+        self.assertEqual(response.status_code, 200)
+        seasons = CropLifecycleDates.objects.filter(field=self.field).order_by("sowing_date")
+        self.assertEqual([season.harvesting_date is None for season in seasons], [False, True])
+        self.assertEqual((seasons[0].crop_id, seasons[0].area_hectares), (self.wheat.pk, 2))
+
+    def test_only_one_season_may_be_open(self):
+        CropLifecycleDates.objects.create(field=self.field)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            CropLifecycleDates.objects.create(field=self.field)
+
+    def test_reopening_a_past_season_conflicts(self):
+        past = self.harvest("2025-06-01", "2025-10-01", 8).json()["id"]
+        self.update_lifecycle(sowing_date="2026-06-01")
+        response = self.update_lifecycle(season_id=past, harvesting_date=None)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(CropLifecycleDates.objects.filter(field=self.field, harvesting_date__isnull=True).count(), 1)
+
+    def test_timeline_compares_seasons(self):
+        self.harvest("2024-06-01", "2024-10-01", 6)
+        self.harvest("2025-06-01", "2025-09-29", 8)
+        rows = self.client.get("/api/crop-seasons/").json()["results"]
+        self.assertEqual([row["season_number"] for row in rows], [1, 2])
+        self.assertEqual([row["yield_per_ha"] for row in rows], [3, 4])
+        self.assertEqual((rows[1]["previous_yield_per_ha"], rows[1]["crop_yield_rank"], rows[1]["crop_avg_yield_per_ha"]), (3, 1, 3.5))
+        self.assertEqual(rows[1]["stage_days"]["season"], 120)
+
+    def test_stats_per_crop_and_field(self):
+        self.harvest("2024-06-01", "2024-10-01", 6)
+        self.harvest("2025-06-01", "2025-09-29", 8)
+        stats = self.client.get("/api/crop-seasons/stats/").json()
+        crop = stats["crops"][0]
+        self.assertEqual((crop["crop_name"], crop["seasons"], crop["harvested"]), ("Test Wheat", 2, 2))
+        self.assertEqual((crop["yield"]["per_ha"], crop["stage_days"]["season"]["min"]), (3.5, 120))
+        self.assertEqual(stats["fields"][0]["change_pct"], 33.3)
+        self.update_lifecycle(sowing_date="2026-06-01")
+        self.assertEqual(self.client.get("/api/crop-seasons/stats/").json()["crops"][0]["seasons"], 3)
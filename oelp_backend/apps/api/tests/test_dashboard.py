@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from apps.models_app.crop_variety import Crop
+from apps.models_app.dashboard import DashboardSummary
+from apps.models_app.field import CropLifecycleDates
+from apps.models_app.notifications import Notification
+
+from .base import OELPTestCase
+
+SQUARE = {"type": "Polygon", "coordinates": [[[0, 0], [0.01, 0], [0.01, 0.01], [0, 0.01], [0, 0]]]}
+COUNTERS = ("active_fields", "active_crops", "total_hectares", "unread_notifications")
+
+
+class DashboardSummaryTests(OELPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.crop = Crop.objects.create(name="Test Wheat")
+
+    def counters(self) -> dict:
+        body = self.client.get("/api/dashboard/").json()
+        return {name: body[name] for name in COUNTERS}
+
+    def rebuilt(self) -> dict:
+        summary = DashboardSummary.rebuild(self.user.pk)
+        return {name: round(getattr(summary, name), 4) for name in COUNTERS}
+
+    def test_first_read_builds_summary(self):
+        self.create_field(area={"hectares": 2})
+        Notification.objects.create(receiver=self.user, message="Hello")
+        self.assertEqual(self.counters(), {"active_fields": 1, "active_crops": 0, "total_hectares": 2, "unread_notifications": 1})
+
+    def test_writes_keep_counters_current(self):
+        self.counters()
+        north = self.create_field(boundary=SQUARE, crop=self.crop)
+        south = self.create_field("South", area={"hectares": 3})
+        season = CropLifecycleDates.objects.create(field=north, crop=self.crop, season="Kharif")
+        notification = Notification.objects.create(receiver=self.user, message="Hello")
+        Notification.objects.create(receiver=self.user, message="Again")
+        counters = self.counters()
+        self.assertEqual((counters["active_fields"], counters["active_crops"], counters["unread_notifications"]), (2, 1, 2))
+        self.assertAlmostEqual(counters["total_hectares"], 126.64, delta=0.05)
+
+        south.is_active = False
+        south.save()
+        notification.is_read = True
+        notification.save()
+        season.delete()
+        self.assertEqual(self.counters(), self.rebuilt())
+        self.assertEqual(self.counters()["active_fields"], 1)
+
+        north.delete()
+        self.assertEqual(self.counters(), {"active_fields": 0, "active_crops": 0, "total_hectares": 0, "unread_notifications": 1})
+
+    def test_moving_a_field_updates_both_owners(self):
+        other, _ = self.create_user("neighbour")
+        field = self.create_field(area={"hectares": 4})
+        self.counters()
+        DashboardSummary.rebuild(other.pk)
+        field.user = other
+        field.save()
+        self.assertEqual(self.counters()["active_fields"], 0)
+        self.assertEqual(DashboardSummary.objects.get(pk=other.pk).total_hectares, 4)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from apps.models_app.field import Field
+
+from .base import OELPTestCase
+
+RING = [[0, 0], [0.01, 0], [0.01, 0.01], [0, 0.01], [0, 0]]
+
+
+def feature(name: str, geometry: dict) -> dict:
+    return {"type": "Feature", "properties": {"name": name}, "geometry": geometry}
+
+
+class FieldImportTests(OELPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.farm = self.create_field("Seed").farm
+
+    def import_geojson(self, features: list):
+        body = {"type": "FeatureCollection", "features": features, "farm": self.farm.pk}
+        return self.client.post("/api/fields/bulk_import/", body, format="json")
+
+    def test_geojson_rows_are_created_with_area(self):
+        response = self.import_geojson([feature("A", {"type": "Polygon", "coordinates": [RING]}), feature("B", {"type": "MultiPolygon", "coordinates": [[RING]]})])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {"created": 2, "failed": 0, "errors": []})
+        areas = Field.objects.filter(user=self.user, name__in=["A", "B"]).values_list("area", flat=True)
+        self.assertTrue(all(area["hectares"] > 123 for area in areas))
+
+    def test_malformed_geometry_fails_only_its_row(self):
+        malformed = [
+            {"type": "Polygon", "coordinates": 5},
+            {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1]]]},
+            {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1]]]},
+            {"type": "Polygon", "coordinates": [[["x", 0], [1, 0], [1, 1], ["x", 0]]]},
+            {"type": "MultiPolygon", "coordinates": [1]},
+        ]
+        features = [feature("Good", {"type": "Polygon", "coordinates": [RING]})]
+        features += [feature(f"Bad {index}", geometry) for index, geometry in enumerate(malformed)]
+        response = self.import_geojson(features)
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        self.assertEqual((body["created"], body["failed"]), (1, len(malformed)))
+        self.assertEqual([error["row"] for error in body["errors"]], list(range(2, len(malformed) + 2)))
+        self.assertTrue(all("boundary" in error["errors"] for error in body["errors"]))
+        self.assertTrue(Field.objects.filter(user=self.user, name="Good").exists())
+
+    def test_csv_reports_invalid_references_per_row(self):
+        csv = f"name,farm,crop\nA,{self.farm.pk},\nB,999999,\n,{self.farm.pk},\nC,{self.farm.pk},999999\n"
+        response = self.client.post("/api/fields/bulk_import/", {"file": SimpleUploadedFile("fields.csv", csv.encode())}, format="multipart")
+        body = response.json()
+        self.assertEqual(body["created"], 1)
+        self.assertEqual(
+            [(error["row"], sorted(error["errors"])) for error in body["errors"]],
+            [(2, ["farm"]), (3, ["name"]), (4, ["crop"])],
+        )
+
+    def test_other_users_farm_is_rejected(self):
+        other, _ = self.create_user("neighbour")
+        other_farm = self.create_field(user=other).farm
+        body = {"type": "FeatureCollection", "features": [feature("A", {"type": "Polygon", "coordinates": [RING]})], "farm": other_farm.pk}
+        response = self.client.post("/api/fields/bulk_import/", body, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Field.objects.filter(farm=other_farm).count(), 1)
+
+    def test_unparseable_upload_is_rejected(self):
+        response = self.client.post("/api/fields/bulk_import/", {"rows": []}, format="json")
+        self.assertEqual(response.status_code, 400)
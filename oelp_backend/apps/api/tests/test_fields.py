@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from apps.models_app.field import Field
+
+from .base import OELPTestCase
+
+SQUARE = {"type": "Polygon", "coordinates": [[[0, 0], [0.01, 0], [0.01, 0.01], [0, 0.01], [0, 0]]]}
+
+
+class FieldBoundaryTests(OELPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.farm = self.create_field("Seed").farm
+
+    def create(self, boundary):
+        return self.client.post("/api/fields/", {"name": "North", "farm": self.farm.pk, "boundary": boundary}, format="json")
+
+    def test_area_is_computed_from_boundary(self):
+        response = self.create(SQUARE)
+        self.assertEqual(response.status_code, 201)
+        self.assertAlmostEqual(response.json()["area"]["hectares"], 123.64, delta=0.05)
+
+    def test_malformed_boundary_is_rejected(self):
+        for boundary in ({"type": "MultiPolygon", "coordinates": [1]}, {"type": "Polygon", "coordinates": 5}, {"type": "Point"}):
+            with self.subTest(boundary=boundary):
+                response = self.create(boundary)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("boundary", response.json())
+        self.assertEqual(Field.objects.filter(user=self.user).count(), 1)
+
+    def test_boundary_can_be_cleared(self):
+        field_id = self.create(SQUARE).json()["id"]
+        response = self.client.patch(f"/api/fields/{field_id}/", {"boundary": None}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.json()["area"])
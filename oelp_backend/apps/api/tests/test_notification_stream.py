@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import override_settings
+
+from apps.api.notification_stream import InProcessBroker, issue_stream_ticket, read_stream_ticket
+from apps.models_app.notifications import Notification
+from apps.models_app.token import digest_token
+
+from .base import OELPTestCase
+
+
+@override_settings(NOTIFICATION_BROKER="memory")
+class InProcessBrokerTests(OELPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.broker = InProcessBroker()
+        patcher = mock.patch("apps.api.notification_stream._broker", self.broker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def notify(self, receiver) -> Notification:
+        with self.captureOnCommitCallbacks(execute=True):
+            return Notification.objects.create(receiver=receiver, message="Rain expected")
+
+    def receive(self, user_id: int, action) -> list:
+        """Events published to ``user_id`` while ``action`` runs."""
+
+        async def listen():
+            subscription = self.broker.subscribe(user_id)
+            try:
+                await sync_to_async(action)()
+                events = []
+                while (event := await subscription.get(timeout=0.2)) is not None:
+                    events.append(event)
+                return events
+            finally:
+                await subscription.close()
+
+        return async_to_sync(listen)()
+
+    def test_new_notification_reaches_its_receiver(self):
+        events = self.receive(self.user.pk, lambda: self.notify(self.user))
+        self.assertEqual([event["type"] for event in events], ["notification"])
+        self.assertEqual(events[0]["notification"]["message"], "Rain expected")
+
+    def test_other_users_receive_nothing(self):
+        other, _ = self.create_user("neighbour")
+        self.assertEqual(self.receive(other.pk, lambda: self.notify(self.user)), [])
+
+    def test_marking_read_publishes_unread_change(self):
+        notification = self.notify(self.user)
+
+        def mark_read():
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(f"/api/notifications/{notification.pk}/mark_read/")
+
+        self.assertEqual(self.receive(self.user.pk, mark_read), [{"type": "unread_changed"}])
+
+    def test_closed_subscription_is_dropped(self):
+        self.receive(self.user.pk, lambda: None)
+        self.assertEqual(self.broker._subscribers, {})
+
+
+class StreamTicketTests(OELPTestCase):
+    def test_ticket_round_trips_to_token_digest(self):
+        response = self.client.post("/api/notifications/stream_ticket/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(read_stream_ticket(response.json()["ticket"]), digest_token(self.token))
+
+    def test_tampered_ticket_is_refused(self):
+        self.assertIsNone(read_stream_ticket(issue_stream_ticket(digest_token(self.token)) + "x"))
+
+    @override_settings(NOTIFICATION_STREAM_TICKET_TTL=-1)
+    def test_expired_ticket_is_refused(self):
+        self.assertIsNone(read_stream_ticket(issue_stream_ticket(digest_token(self.token))))
+
+    def test_stream_refuses_bad_ticket(self):
+        self.client.credentials()
+        self.assertEqual(self.client.get("/api/notifications/stream/?ticket=forged").status_code, 401)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from django.test import override_settings
+
+from apps.models_app.crop_variety import Crop
+from apps.models_app.dashboard import DashboardSummary
+from apps.models_app.notifications import Notification
+from apps.models_app.user import Role, UserRole
+
+from .base import OELPTestCase
+
+
+@override_settings(NOTIFICATION_BROKER="memory", NOTIFICATION_FANOUT_BATCH_SIZE=2)
+class NotificationFanOutTests(OELPTestCase):
+    def setUp(self):
+        super().setUp()
+        UserRole.objects.create(user=self.user, role=Role.objects.get_or_create(name="Agronomist")[0])
+        self.crop = Crop.objects.create(name="Test Wheat")
+        self.growers, self.grower_tokens = [], []
+        for index in range(5):
+            grower, token = self.create_user(f"grower{index}")
+            self.create_field(user=grower, crop=self.crop)
+            self.create_field("South", user=grower, crop=self.crop)
+            DashboardSummary.rebuild(grower.pk)
+            self.growers.append(grower)
+            self.grower_tokens.append(token)
+        self.bystander, self.bystander_token = self.create_user("bystander")
+
+    def fan_out(self, body: dict):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post("/api/notifications/fan_out/", body, format="json")
+
+    def test_matching_users_are_notified_once(self):
+        response = self.fan_out({"message": "Rust alert", "crops": [self.crop.pk]})
+        self.assertEqual(response.status_code, 202)
+        receivers = Notification.objects.filter(message="Rust alert").values_list("receiver_id", flat=True)
+        self.assertEqual(sorted(receivers), [grower.pk for grower in self.growers])
+        self.assertEqual(
+            list(DashboardSummary.objects.filter(pk__in=receivers).values_list("unread_notifications", flat=True)), [1] * 5
+        )
+
+    def test_receivers_see_new_unread_count(self):
+        self.authenticate(self.grower_tokens[0])
+        etag = self.client.get("/api/notifications/unread_count/")["ETag"]
+        self.authenticate(self.token)
+        self.fan_out({"message": "Rust alert", "crops": [self.crop.pk]})
+        self.authenticate(self.grower_tokens[0])
+        response = self.client.get("/api/notifications/unread_count/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"count": 1})
+        self.assertEqual(self.client.get("/api/dashboard/").json()["unread_notifications"], 1)
+
+    def test_targets_are_required(self):
+        self.assertEqual(self.fan_out({"message": "Hello"}).status_code, 400)
+
+    def test_fan_out_needs_a_broadcasting_role(self):
+        self.authenticate(self.bystander_token)
+        self.assertEqual(self.fan_out({"message": "Hello", "crops": [self.crop.pk]}).status_code, 403)
+        self.assertFalse(Notification.objects.exists())
+
+
+@override_settings(NOTIFICATION_BROKER="memory")
+class BulkMarkReadTests(OELPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.notifications = [Notification.objects.create(receiver=self.user, message=f"Note {index}") for index in range(4)]
+        other, _ = self.create_user("neighbour")
+        self.foreign = Notification.objects.create(receiver=other, message="Not yours")
+
+    def test_only_own_listed_notifications_are_marked(self):
+        ids = [self.notifications[0].pk, self.notifications[1].pk, self.foreign.pk]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/notifications/mark_read/", {"ids": ids}, format="json")
+        self.assertEqual(response.json(), {"updated": 2, "unread_count": 2})
+        self.assertFalse(Notification.objects.get(pk=self.foreign.pk).is_read)
+        self.assertEqual(self.client.get("/api/notifications/unread_count/").json(), {"count": 2})
+
+    def test_mark_all_read_zeroes_the_count(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/notifications/mark_all_read/")
+        self.assertEqual(response.json(), {"updated": 4, "unread_count": 0})
+        self.assertEqual(self.client.get("/api/dashboard/").json()["unread_notifications"], 0)
+
+    def test_ids_are_required(self):
+        self.assertEqual(self.client.post("/api/notifications/mark_read/", {"ids": []}, format="json").status_code, 400)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.utils import timezone
+
+from apps.models_app.notifications import Notification
+
+from .base import OELPTestCase
+
+
+class KeysetPaginationTests(OELPTestCase):
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        created = [Notification.objects.create(receiver=self.user, message=f"n{i}") for i in range(7)]
+        # Two rows share a timestamp, so pages must break ties on id
+        for index, notification in enumerate(created):
+            Notification.objects.filter(pk=notification.pk).update(created_at=now - timedelta(minutes=index // 2))
+        self.expected = list(Notification.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+
+    def test_pages_cover_every_row_once_in_order(self):
+        seen = []
+        url = "/api/notifications/?pagination=cursor&page_size=3"
+        while url:
+            body = self.client.get(url).json()
+            self.assertNotIn("count", body)
+            seen.extend(row["id"] for row in body["results"])
+            url = body["next"]
+        self.assertEqual(seen, self.expected)
+
+    def test_invalid_cursor_is_not_found(self):
+        self.assertEqual(self.client.get("/api/notifications/?cursor=garbage").status_code, 404)
+
+    def test_numbered_pages_are_the_default(self):
+        body = self.client.get("/api/notifications/?page_size=3").json()
+        self.assertEqual(body["count"], 7)
+        self.assertEqual([row["id"] for row in body["results"]], self.expected[:3])
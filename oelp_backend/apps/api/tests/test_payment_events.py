@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+from decimal import Decimal
+from unittest import mock
+
+from django.test import override_settings
+
+from apps.models_app.payment_event import PaymentWebhookEvent
+from apps.models_app.plan import Plan
+from apps.models_app.user_plan import Transaction, UserPlan
+
+from .base import OELPTestCase
+
+WEBHOOK_SECRET = "test-webhook-secret"
+
+
+@override_settings(PAYMENT_GATEWAY="fake", FAKE_GATEWAY_WEBHOOK_SECRET=WEBHOOK_SECRET, FAKE_GATEWAY_LATENCY_MS=0)
+class WebhookInboxTests(OELPTestCase):
+    def setUp(self):
+        super().setUp()
+        # A gateway built from these settings, dropped again after the test
+        patcher = mock.patch("apps.api.payments._gateway", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.plan = Plan.objects.create(name="Test Pro", price=Decimal("10.00"), duration=30)
+        self.txn = Transaction.objects.create(
+            user=self.user, plan=self.plan, amount=Decimal("10.00"), status="created", gateway_order_id="order_test1"
+        )
+
+    def deliver(self, event_type: str, event_id: str, order_id: str = "order_test1", signature=None):
+        body = json.dumps({"event": event_type, "payload": {"payment": {"entity": {"order_id": order_id}}}}).encode()
+        if signature is None:
+            signature = hmac.new(WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                "/api/subscriptions/razorpay/webhook/",
+                body,
+                content_type="application/json",
+                HTTP_X_RAZORPAY_SIGNATURE=signature,
+                HTTP_X_RAZORPAY_EVENT_ID=event_id,
+            )
+
+    def test_captured_payment_marks_paid_and_activates_plan(self):
+        self.assertEqual(self.deliver("payment.captured", "evt_1").status_code, 200)
+        self.txn.refresh_from_db()
+        self.assertEqual(self.txn.status, "paid")
+        self.assertTrue(UserPlan.objects.filter(user=self.user, plan=self.plan, is_active=True).exists())
+        self.assertEqual(PaymentWebhookEvent.objects.get().status, PaymentWebhookEvent.Status.PROCESSED)
+
+    def test_redelivery_is_stored_once(self):
+        self.deliver("payment.captured", "evt_1")
+        self.deliver("payment.captured", "evt_1")
+        self.assertEqual(PaymentWebhookEvent.objects.count(), 1)
+        self.assertEqual(UserPlan.objects.filter(user=self.user).count(), 1)
+
+    def test_invalid_signature_is_rejected_unstored(self):
+        self.assertEqual(self.deliver("payment.captured", "evt_1", signature="0" * 64).status_code, 400)
+        self.assertFalse(PaymentWebhookEvent.objects.exists())
+
+    def test_late_failure_does_not_undo_payment(self):
+        self.deliver("payment.captured", "evt_1")
+        self.deliver("payment.failed", "evt_2")
+        self.txn.refresh_from_db()
+        self.assertEqual(self.txn.status, "paid")
+
+    def test_unknown_order_is_ignored(self):
+        self.deliver("payment.captured", "evt_1", order_id="order_other")
+        event = PaymentWebhookEvent.objects.get()
+        self.assertEqual((event.status, event.note), (PaymentWebhookEvent.Status.IGNORED, "Unknown order"))
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from unittest import mock
+
+from django.test import AsyncClient, override_settings
+
+from apps.api.payments import FakeGateway, PaymentGatewayError
+from apps.models_app.plan import Plan
+from apps.models_app.user_plan import Transaction
+
+from .base import OELPTestCase
+
+
+@override_settings(PAYMENT_GATEWAY="fake", FAKE_GATEWAY_LATENCY_MS=0)
+class CreateOrderTests(OELPTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch("apps.api.payments._gateway", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.plan = Plan.objects.create(name="Test Pro", price=Decimal("10.00"), duration=30)
+
+    def order(self, key: str = "order-key-1", amount: str = "10.00"):
+        body = {"amount": amount, "plan": self.plan.pk}
+        return self.client.post("/api/subscriptions/razorpay/order/", body, format="json", HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_order_is_backed_by_a_transaction(self):
+        response = self.order()
+        self.assertEqual(response.status_code, 200)
+        order = response.json()
+        self.assertTrue(order["id"].startswith("order_fake"))
+        self.assertEqual(order["amount"], 1000)
+        txn = Transaction.objects.get(pk=order["transaction"])
+        self.assertEqual((txn.status, txn.gateway_order_id, txn.amount), ("created", order["id"], Decimal("10.00")))
+
+    def test_same_key_replays_the_order(self):
+        first = self.order().json()
+        with mock.patch.object(FakeGateway, "create_order") as create_order:
+            second = self.order().json()
+        create_order.assert_not_called()
+        self.assertEqual((second["id"], second["transaction"]), (first["id"], first["transaction"]))
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 1)
+
+    def test_key_reused_for_another_amount_conflicts(self):
+        self.order()
+        self.assertEqual(self.order(amount="20.00").status_code, 409)
+
+    def test_gateway_error_fails_the_transaction_until_retried(self):
+        with mock.patch.object(FakeGateway, "create_order", side_effect=PaymentGatewayError("timeout")):
+            self.assertEqual(self.order().status_code, 502)
+        self.assertEqual(Transaction.objects.get(user=self.user).status, "failed")
+        retry = self.order()
+        self.assertEqual(retry.status_code, 200)
+        txn = Transaction.objects.get(user=self.user)
+        self.assertEqual((txn.status, txn.gateway_order_id), ("created", retry.json()["id"]))
+
+    def test_invalid_amount_is_rejected(self):
+        self.assertEqual(self.order(amount="0").status_code, 400)
+        self.assertFalse(Transaction.objects.exists())
+
+    async def test_async_order_is_idempotent(self):
+        first = await AsyncClient().post(
+            "/api/async/subscriptions/razorpay/order/",
+            {"amount": "10.00", "plan": self.plan.pk},
+            content_type="application/json",
+            headers={"Authorization": f"Token {self.token}", "Idempotency-Key": "order-key-2"},
+        )
+        self.assertEqual(first.status_code, 200)
+        second = await AsyncClient().post(
+            "/api/async/subscriptions/razorpay/order/",
+            {"amount": "10.00", "plan": self.plan.pk},
+            content_type="application/json",
+            headers={"Authorization": f"Token {self.token}", "Idempotency-Key": "order-key-2"},
+        )
+        self.assertEqual(second.json()["id"], first.json()["id"])
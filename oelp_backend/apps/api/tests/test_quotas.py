@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.utils import timezone
+
+from apps.models_app.feature import Feature, FeatureType
+from apps.models_app.feature_plan import PlanFeature
+from apps.models_app.field import Field
+from apps.models_app.plan import Plan
+from apps.models_app.report_job import ReportJob
+from apps.models_app.user_plan import PlanFeatureUsage, UserPlan
+
+from .base import OELPTestCase
+
+
+def subscribe(user, feature_name: str, max_count: int) -> None:
+    """Put ``user`` on a plan allowing ``max_count`` uses of ``feature_name``."""
+    plan = Plan.objects.create(name="Test Starter", price=Decimal("0"), duration=30)
+    feature = Feature.objects.create(name=feature_name, feature_type=FeatureType.objects.create(name="Limits"))
+    PlanFeature.objects.create(plan=plan, feature=feature, max_count=max_count, duration_days=30)
+    now = timezone.now()
+    UserPlan.objects.create(
+        user=user, plan=plan, start_date=now.date(), end_date=(now + timedelta(days=30)).date(), expire_at=now + timedelta(days=30)
+    )
+
+
+class QuotaTestCase(OELPTestCase):
+    def used(self) -> int:
+        return PlanFeatureUsage.objects.get(user_plan__user=self.user).used_count
+
+
+class FieldQuotaTests(QuotaTestCase):
+    def setUp(self):
+        super().setUp()
+        subscribe(self.user, "fields", 3)
+        self.farm = self.create_field("Seed").farm
+
+    def create(self, name: str):
+        return self.client.post("/api/fields/", {"name": name, "farm": self.farm.pk}, format="json")
+
+    def upload(self, names: list[str]):
+        csv = "name,farm\n" + "".join(f"{name},{self.farm.pk}\n" for name in names)
+        return self.client.post("/api/fields/bulk_import/", {"file": SimpleUploadedFile("fields.csv", csv.encode())}, format="multipart")
+
+    def test_create_is_denied_once_quota_is_spent(self):
+        for name in ("A", "B", "C"):
+            self.assertEqual(self.create(name).status_code, 201)
+        self.assertEqual(self.create("D").status_code, 403)
+        self.assertEqual(self.used(), 3)
+
+    def test_invalid_create_is_refunded(self):
+        self.assertEqual(self.client.post("/api/fields/", {"farm": self.farm.pk}, format="json").status_code, 400)
+        self.assertEqual(self.used(), 0)
+
+    def test_server_error_is_refunded(self):
+        self.client.raise_request_exception = False
+        with mock.patch("apps.api.views.FieldViewSet.perform_create", side_effect=RuntimeError("boom")):
+            self.assertEqual(self.create("A").status_code, 500)
+        self.assertEqual(self.used(), 0)
+
+    def test_bulk_import_charges_each_created_row(self):
+        response = self.upload(["A", "B", ""])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["created"], 2)
+        self.assertEqual(self.used(), 2)
+
+    def test_bulk_import_refunds_malformed_geometry_rows(self):
+        ring = [[0, 0], [0.01, 0], [0.01, 0.01], [0, 0.01], [0, 0]]
+        features = [
+            {"type": "Feature", "properties": {"name": "Good"}, "geometry": {"type": "Polygon", "coordinates": [ring]}},
+            {"type": "Feature", "properties": {"name": "Open"}, "geometry": {"type": "Polygon", "coordinates": [ring[:-1]]}},
+        ]
+        body = {"type": "FeatureCollection", "features": features, "farm": self.farm.pk}
+        response = self.client.post("/api/fields/bulk_import/", body, format="json")
+        self.assertEqual(response.json()["created"], 1)
+        self.assertEqual(self.used(), 1)
+
+    def test_bulk_import_beyond_quota_is_denied(self):
+        self.assertEqual(self.upload(["A", "B", "C", "D"]).status_code, 403)
+        self.assertEqual(self.used(), 0)
+        self.assertEqual(Field.objects.filter(user=self.user).count(), 1)
+
+
+class ReportQuotaTests(QuotaTestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        subscribe(self.user, "reports", 2)
+        self.create_field()
+
+    def submit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post("/api/reports/jobs/", {"kind": ReportJob.Kind.FIELDS_PDF}, format="json")
+
+    def test_reused_job_is_not_charged(self):
+        self.assertEqual(self.submit().status_code, 202)
+        self.assertEqual(self.submit().status_code, 200)
+        self.assertEqual(self.used(), 1)
+
+    def test_new_job_after_data_change_is_charged(self):
+        self.submit()
+        self.create_field("South")
+        self.assertEqual(self.submit().status_code, 202)
+        self.assertEqual(self.used(), 2)
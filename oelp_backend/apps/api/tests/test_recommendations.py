@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from apps.models_app.crop_variety import Crop, CropVariety
+from apps.models_app.nutrient_rule import NutrientRule
+from apps.models_app.user import Role, UserRole
+
+from .base import OELPTestCase
+
+
+class RecommendationTests(OELPTestCase):
+    def setUp(self):
+        super().setUp()
+        NutrientRule.objects.all().delete()
+        self.crop = Crop.objects.create(name="Test Wheat")
+        self.variety = CropVariety.objects.create(crop=self.crop, name="Early")
+        self.generic = NutrientRule.objects.create(
+            nutrient="nitrogen", threshold=280, target=400, product="Urea", base_rate=10, rate_per_unit=0.5, max_rate=100
+        )
+        self.field = self.create_field(crop=self.crop, crop_variety=self.variety)
+
+    def recommendations(self, report) -> list:
+        response = self.client.get(f"/api/soil-reports/{report.pk}/recommendations/")
+        self.assertEqual(response.status_code, 200)
+        return response.json()["recommendations"]
+
+    def test_dose_scales_with_the_gap_and_is_capped(self):
+        mild = self.recommendations(self.create_soil_report(self.field, nitrogen=260))
+        self.assertEqual([(r["product"], r["dose_kg_per_ha"]) for r in mild], [("Urea", 80.0)])
+        severe = self.recommendations(self.create_soil_report(self.field, nitrogen=100))
+        self.assertEqual(severe[0]["dose_kg_per_ha"], 100.0)
+
+    def test_adequate_or_missing_levels_get_nothing(self):
+        self.assertEqual(self.recommendations(self.create_soil_report(self.field, nitrogen=300)), [])
+        self.assertEqual(self.recommendations(self.create_soil_report(self.field)), [])
+
+    def test_most_specific_rule_wins(self):
+        NutrientRule.objects.create(nutrient="nitrogen", crop=self.crop, threshold=280, target=400, product="Crop mix")
+        variety_rule = NutrientRule.objects.create(
+            nutrient="nitrogen", crop_variety=self.variety, threshold=280, target=400, product="Variety mix"
+        )
+        recommendations = self.recommendations(self.create_soil_report(self.field, nitrogen=200))
+        self.assertEqual([(r["product"], r["rule"]) for r in recommendations], [("Variety mix", variety_rule.pk)])
+        other = self.create_field("South")
+        self.assertEqual(self.recommendations(self.create_soil_report(other, nitrogen=200))[0]["product"], "Urea")
+
+    def test_lower_direction(self):
+        NutrientRule.objects.create(nutrient="ph", direction=NutrientRule.Direction.LOWER, threshold=7.5, target=7.0, product="Gypsum")
+        recommendations = self.recommendations(self.create_soil_report(self.field, ph=8.2, nitrogen=300))
+        self.assertEqual([(r["nutrient"], r["direction"], r["product"]) for r in recommendations], [("ph", "lower", "Gypsum")])
+
+    def test_batch_is_for_reviewers_across_accounts(self):
+        neighbour, _ = self.create_user("neighbour")
+        self.create_soil_report(self.create_field(user=neighbour, crop=self.crop), nitrogen=200)
+        self.create_soil_report(self.field, nitrogen=300)
+        self.assertEqual(self.client.get("/api/soil-reports/recommendations/").status_code, 403)
+        with self.captureOnCommitCallbacks(execute=True):
+            UserRole.objects.create(user=self.user, role=Role.objects.get_or_create(name="Agronomist")[0])
+        response = self.client.get("/api/soil-reports/recommendations/", {"crop": self.crop.pk})
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual([len(result["recommendations"]) for result in results], [1, 0])
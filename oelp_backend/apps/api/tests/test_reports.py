@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import csv
+import io
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.test import AsyncClient, override_settings
+from django.utils import timezone
+
+from apps.api.views import ExportCSVView
+from apps.models_app.crop_variety import Crop
+from apps.models_app.report_job import ReportJob
+
+from .base import OELPTestCase
+
+
+class ReportJobTests(OELPTestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.create_field()
+
+    def submit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post("/api/reports/jobs/", {"kind": ReportJob.Kind.FIELDS_PDF}, format="json")
+
+    def test_job_renders_on_eager_broker(self):
+        response = self.submit()
+        self.assertEqual(response.status_code, 202)
+        job = ReportJob.objects.get(pk=response.json()["id"])
+        self.assertEqual(job.status, ReportJob.Status.DONE)
+        download = self.client.get(f"/api/reports/jobs/{job.pk}/download/")
+        self.assertEqual(download.status_code, 200)
+        self.assertTrue(b"".join(download.streaming_content).startswith(b"%PDF"))
+
+    def test_repeat_request_reuses_finished_job(self):
+        first = self.submit().json()["id"]
+        second = self.submit()
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json()["id"], first)
+
+    def test_stale_running_job_counts_as_failed(self):
+        first = self.submit().json()["id"]
+        ReportJob.objects.filter(pk=first).update(status=ReportJob.Status.RUNNING, started_at=timezone.now() - timedelta(hours=1))
+        second = self.submit()
+        self.assertEqual(second.status_code, 202)
+        self.assertNotEqual(second.json()["id"], first)
+        self.assertEqual(ReportJob.objects.get(pk=first).status, ReportJob.Status.FAILED)
+
+    @override_settings(REPORT_SYNC_MAX_ROWS=0)
+    def test_large_sync_export_is_queued(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.get("/api/reports/export/pdf/")
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response["Location"], f"/api/reports/jobs/{response.json()['id']}/")
+
+
+class CSVExportTests(OELPTestCase):
+    def setUp(self):
+        super().setUp()
+        crop = Crop.objects.create(name="Test Wheat")
+        for index in range(5):
+            self.create_field(f"Field {index}", area={"hectares": index}, crop=crop if index % 2 else None)
+        self.create_field(user=self.create_user("neighbour")[0])
+
+    def rows(self, content: bytes) -> list:
+        return list(csv.reader(io.StringIO(content.decode())))
+
+    def test_export_streams_every_owned_field(self):
+        with mock.patch.object(ExportCSVView, "chunk_size", 2):
+            response = self.client.get("/api/reports/export/csv/")
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = self.rows(b"".join(response.streaming_content))
+        self.assertEqual(rows[0], ["Field", "Crop", "Hectares"])
+        self.assertEqual(rows[1:], [[f"Field {index}", "Test Wheat" if index % 2 else "-", str(index)] for index in range(5)])
+
+    def test_export_honours_field_filter(self):
+        field = self.create_field("Only")
+        response = self.client.get("/api/reports/export/csv/", {"field": field.pk})
+        self.assertEqual(self.rows(b"".join(response.streaming_content))[1:], [["Only", "-", ""]])
+
+    async def test_asgi_export_streams_chunks(self):
+        with mock.patch.object(ExportCSVView, "chunk_size", 2):
+            response = await AsyncClient().get("/api/reports/export/csv/", headers={"Authorization": f"Token {self.token}"})
+            chunks = [chunk async for chunk in response.streaming_content]
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(len(self.rows(b"".join(chunks))), 6)
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from apps.api.role_cache import END_USER_ROLE, ensure_role, role_cache, user_role_names
+from apps.models_app.user import Role, UserRole
+
+from .base import OELPTestCase
+
+
+class RoleCacheTests(OELPTestCase):
+    def setUp(self):
+        super().setUp()
+        role_cache.clear()
+        self.agronomist = Role.objects.get_or_create(name="Agronomist")[0]
+
+    def test_membership_is_cached(self):
+        UserRole.objects.create(user=self.user, role=self.agronomist)
+        self.assertEqual(user_role_names(self.user.pk), {"Agronomist"})
+        with self.assertNumQueries(0):
+            self.assertEqual(user_role_names(self.user.pk), {"Agronomist"})
+
+    def test_granting_a_role_is_seen_after_commit(self):
+        self.assertEqual(user_role_names(self.user.pk), frozenset())
+        with self.captureOnCommitCallbacks(execute=True):
+            UserRole.objects.create(user=self.user, role=self.agronomist)
+        self.assertEqual(user_role_names(self.user.pk), {"Agronomist"})
+
+    def test_revoking_a_role_closes_permission(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            membership = UserRole.objects.create(user=self.user, role=self.agronomist)
+        body = {"message": "Hello", "roles": ["Agronomist"]}
+        self.assertEqual(self.client.post("/api/notifications/fan_out/", body, format="json").status_code, 202)
+        with self.captureOnCommitCallbacks(execute=True):
+            membership.delete()
+        self.assertEqual(self.client.post("/api/notifications/fan_out/", body, format="json").status_code, 403)
+
+    def test_renamed_role_retires_cached_names(self):
+        UserRole.objects.create(user=self.user, role=self.agronomist)
+        user_role_names(self.user.pk)
+        self.agronomist.name = "Field Officer"
+        self.agronomist.save()
+        self.assertEqual(user_role_names(self.user.pk), {"Field Officer"})
+
+    def test_ensure_role_writes_only_when_missing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ensure_role(self.user)
+        self.assertTrue(UserRole.objects.filter(user=self.user, role__name=END_USER_ROLE).exists())
+        user_role_names(self.user.pk)
+        with self.assertNumQueries(0):
+            ensure_role(self.user)
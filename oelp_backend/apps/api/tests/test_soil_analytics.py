@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import numpy as np
+
+from apps.api.soil_analytics import field_trends, summarize
+
+from .base import OELPTestCase
+
+
+class SoilAnalyticsTests(OELPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.north = self.create_field("North")
+        self.south = self.create_field("South")
+        for nitrogen in (200, 250, 300):
+            self.create_soil_report(self.north, nitrogen=nitrogen)
+        self.create_soil_report(self.south, ph=8.0, nitrogen=600)
+        neighbour, _ = self.create_user("neighbour")
+        self.create_soil_report(self.create_field(user=neighbour), nitrogen=1)
+
+    def analytics(self, **params) -> dict:
+        response = self.client.get("/api/soil-reports/analytics/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_statistics_cover_only_own_reports(self):
+        body = self.analytics()
+        self.assertEqual(body["count"], 4)
+        nitrogen = body["nutrients"]["nitrogen"]
+        self.assertEqual((nitrogen["count"], nitrogen["mean"], nitrogen["min"], nitrogen["max"]), (4, 337.5, 200, 600))
+        self.assertEqual((nitrogen["low"], nitrogen["high"]), (2, 1))
+        self.assertEqual(body["nutrients"]["zinc"]["count"], 0)
+        self.assertIsNone(body["nutrients"]["zinc"]["mean"])
+
+    def test_field_trends(self):
+        trends = {trend["field"]: trend for trend in self.analytics()["fields"]}
+        north = trends[self.north.pk]
+        self.assertEqual((north["reports"], north["latest"]["nitrogen"], north["trend"]["nitrogen"]), (3, 300, 50))
+        self.assertEqual(north["flags"], {})
+        self.assertEqual(trends[self.south.pk]["flags"], {"ph": "high", "nitrogen": "high"})
+        self.assertIsNone(trends[self.south.pk]["trend"]["nitrogen"])
+
+    def test_field_filter(self):
+        body = self.analytics(field=self.south.pk)
+        self.assertEqual(body["count"], 1)
+        self.assertEqual(list(body["by_crop"]), ["none"])
+        self.assertEqual(self.client.get("/api/soil-reports/analytics/", {"field": "x"}).status_code, 400)
+
+    def test_new_report_refreshes_cached_analytics(self):
+        self.assertEqual(self.analytics()["count"], 4)
+        self.create_soil_report(self.south)
+        self.assertEqual(self.analytics()["count"], 5)
+
+    def test_matches_plain_python(self):
+        rng = np.random.default_rng(7)
+        values = rng.uniform(0, 500, size=(40, 10))
+        values[rng.random(values.shape) < 0.2] = np.nan
+        field_ids = np.repeat(np.arange(8), 5)
+        summary = summarize(values)
+        trends = field_trends(field_ids, values)
+        for column, name in enumerate(("ph", "ec", "nitrogen")):
+            present = [v for v in values[:, column] if not np.isnan(v)]
+            self.assertAlmostEqual(summary[name]["mean"], sum(present) / len(present), places=3)
+            for field in range(8):
+                points = [(x, values[field * 5 + x, column]) for x in range(5) if not np.isnan(values[field * 5 + x, column])]
+                if len(points) < 2:
+                    continue
+                xs, ys = zip(*points)
+                mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+                slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / sum((x - mean_x) ** 2 for x in xs)
+                self.assertAlmostEqual(trends[field]["trend"][name], slope, places=3)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from apps.models_app.field import Field
+from apps.models_app.soil_report import SoilReport, SoilTexture
+
+from .base import OELPTestCase
+
+
+class SoilReportScopingTests(OELPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.field = self.create_field()
+        self.report = self.create_soil_report(self.field)
+        neighbour, _ = self.create_user("neighbour")
+        self.foreign_field = self.create_field(user=neighbour)
+        self.foreign_report = self.create_soil_report(self.foreign_field)
+
+    def test_list_and_detail_are_owner_only(self):
+        ids = [row["id"] for row in self.client.get("/api/soil-reports/").json()["results"]]
+        self.assertEqual(ids, [self.report.pk])
+        self.assertEqual(self.client.get(f"/api/soil-reports/{self.foreign_report.pk}/").status_code, 404)
+        self.assertEqual(self.client.delete(f"/api/soil-reports/{self.foreign_report.pk}/").status_code, 404)
+
+    def test_report_on_another_users_field_is_rejected(self):
+        body = {"field": self.foreign_field.pk, "ph": 7, "ec": 0.5, "soil_type": self.report.soil_type_id}
+        response = self.client.post("/api/soil-reports/", body, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("field", response.json())
+
+
+class LatestSoilReportTests(OELPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.north = self.create_field("North")
+        self.south = self.create_field("South")
+
+    def latest(self, field: Field):
+        return Field.objects.values_list("latest_soil_report_id", flat=True).get(pk=field.pk)
+
+    def test_pointer_follows_creates_and_deletes(self):
+        first = self.create_soil_report(self.north)
+        second = self.create_soil_report(self.north)
+        self.assertEqual(self.latest(self.north), second.pk)
+        second.delete()
+        self.assertEqual(self.latest(self.north), first.pk)
+        first.delete()
+        self.assertIsNone(self.latest(self.north))
+
+    def test_moving_a_report_recomputes_both_fields(self):
+        first = self.create_soil_report(self.north)
+        second = self.create_soil_report(self.north)
+        second.field = self.south
+        second.save()
+        self.assertEqual((self.latest(self.north), self.latest(self.south)), (first.pk, second.pk))
+
+    def test_latest_endpoint_lists_one_report_per_field(self):
+        self.create_soil_report(self.north)
+        newest = [self.create_soil_report(self.north), self.create_soil_report(self.south)]
+        body = self.client.get("/api/soil-reports/latest/").json()
+        rows = body["results"] if isinstance(body, dict) else body
+        self.assertEqual([row["id"] for row in rows], [report.pk for report in newest])
+        field_row = next(row for row in self.client.get("/api/fields/").json()["results"] if row["id"] == self.north.pk)
+        self.assertEqual(field_row["latest_soil_report"], newest[0].pk)
+
+    def test_soil_report_write_changes_field_list_etag(self):
+        # Created up front: a new texture would bump the catalog version on its own
+        SoilTexture.objects.create(name="Loam", icon="https://example.com/loam.png")
+        etag = self.client.get("/api/fields/")["ETag"]
+        self.assertEqual(self.client.get("/api/fields/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.create_soil_report(self.north)
+        self.assertEqual(self.client.get("/api/fields/", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.assertTrue(SoilReport.objects.filter(field=self.north).exists())
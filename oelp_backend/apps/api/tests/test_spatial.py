@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from .base import OELPTestCase
+
+
+def square(lon: float, lat: float, size: float = 0.01) -> dict:
+    ring = [[lon, lat], [lon + size, lat], [lon + size, lat + size], [lon, lat + size], [lon, lat]]
+    return {"type": "Polygon", "coordinates": [ring]}
+
+
+class SpatialQueryTests(OELPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.west = self.create_field("West", boundary=square(0, 0))
+        self.east = self.create_field("East", boundary=square(1, 0))
+        self.far = self.create_field("Far", boundary=square(10, 10))
+        self.unmapped = self.create_field("Unmapped")
+
+    def names(self, response) -> list:
+        body = response.json()
+        rows = body["results"] if isinstance(body, dict) else body
+        return [row["name"] for row in rows]
+
+    def test_bbox_keeps_overlapping_fields(self):
+        response = self.client.get("/api/fields/", {"bbox": "-0.5,-0.5,1.005,0.5"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(self.names(response)), ["East", "West"])
+
+    def test_bbox_must_have_four_numbers(self):
+        self.assertEqual(self.client.get("/api/fields/", {"bbox": "1,2,3"}).status_code, 400)
+
+    def test_contains_matches_boundary(self):
+        response = self.client.get("/api/fields/contains/", {"lon": 1.005, "lat": 0.005})
+        self.assertEqual(self.names(response), ["East"])
+        self.assertEqual(self.client.get("/api/fields/contains/", {"lon": 0.5, "lat": 0.005}).json(), [])
+        self.assertEqual(self.client.get("/api/fields/contains/").status_code, 400)
+
+    def test_nearest_orders_by_distance(self):
+        response = self.client.get("/api/fields/nearest/", {"lon": 0.9, "lat": 0, "k": 2})
+        self.assertEqual(self.names(response), ["East", "West"])
+        distances = [row["distance_m"] for row in response.json()]
+        self.assertLess(distances[0], distances[1])
+
+    def test_nearest_sees_moved_boundary(self):
+        self.client.get("/api/fields/nearest/", {"lon": 10, "lat": 10, "k": 1})
+        self.client.patch(f"/api/fields/{self.west.pk}/", {"boundary": square(10, 10.001)}, format="json")
+        response = self.client.get("/api/fields/nearest/", {"lon": 10.005, "lat": 10.016, "k": 1})
+        self.assertEqual(self.names(response), ["West"])
+
+    def test_other_users_fields_are_not_returned(self):
+        _, token = self.create_user("neighbour")
+        self.authenticate(token)
+        self.assertEqual(self.client.get("/api/fields/contains/", {"lon": 1.005, "lat": 0.005}).json(), [])
+        self.assertEqual(self.client.get("/api/fields/nearest/", {"lon": 1, "lat": 0}).json(), [])
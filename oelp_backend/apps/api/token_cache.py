@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.models_app.token import UserAuthToken
+from apps.models_app.user import CustomUser
+
+
+class TokenCache:
+    """Bounded per-process LRU of token digest -> user, with a TTL per entry.
+
+    Entries are dropped when the user's token row or user row changes, so
+    logout/login rotation takes effect immediately in this process; other
+    worker processes converge within ``ttl`` seconds.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 60.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[CustomUser, float]] = OrderedDict()
+        self._digests_by_user: dict[int, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, digest: str) -> Optional[CustomUser]:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at < time.monotonic():
+                self._discard(digest)
+                return None
+            self._entries.move_to_end(digest)
+        # Hand out a copy so per-request mutation never leaks into the cache
+        return copy.copy(user)
+
+    def set(self, digest: str, user: CustomUser) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._discard(digest)
+            self._entries[digest] = (copy.copy(user), time.monotonic() + self.ttl)
+            self._digests_by_user.setdefault(user.pk, set()).add(digest)
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for digest in list(self._digests_by_user.get(user_id, ())):
+                self._discard(digest)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._digests_by_user.clear()
+
+    def _discard(self, digest: str) -> None:
+        entry = self._entries.pop(digest, None)
+        if entry is None:
+            return
+        user_id = entry[0].pk
+        digests = self._digests_by_user.get(user_id)
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._digests_by_user[user_id]
+
+
+token_cache = TokenCache(
+    maxsize=getattr(settings, "AUTH_TOKEN_CACHE_SIZE", 10000),
+    ttl=getattr(settings, "AUTH_TOKEN_CACHE_TTL", 60),
+)
+
+
+@receiver(post_save, sender=UserAuthToken)
+@receiver(post_delete, sender=UserAuthToken)
+def invalidate_cached_token(sender, instance, **kwargs):
+    token_cache.invalidate_user(instance.user_id)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_cached_user(sender, instance, **kwargs):
+    token_cache.invalidate_user(instance.pk)
@@ -1,7 +1,7 @@
 from django.urls import path, include
 from django.http import JsonResponse
 from rest_framework.routers import DefaultRouter
-from . import views
+from . import async_views, views
 
 router = DefaultRouter()
 
@@ -10,12 +10,14 @@ router.register(r"crops", views.CropViewSet, basename="crop")
 router.register(r"crop-varieties", views.CropVarietyViewSet, basename="crop-variety")
 router.register(r"farms", views.FarmViewSet, basename="farm")
 router.register(r"fields", views.FieldViewSet, basename="field")
+router.register(r"crop-seasons", views.CropSeasonViewSet, basename="crop-season")
 router.register(r"soil-reports", views.SoilReportViewSet, basename="soil-report")
 router.register(r"soil-textures", views.SoilTextureViewSet, basename="soil-texture")
 router.register(r"irrigation-methods", views.IrrigationMethodViewSet, basename="irrigation-method")
 router.register(r"irrigation-practices", views.FieldIrrigationPracticeViewSet, basename="irrigation-practice")
 router.register(r"assets", views.AssetViewSet, basename="asset")
 router.register(r"notifications", views.NotificationViewSet, basename="notification")
+router.register(r"activity", views.ActivityViewSet, basename="activity")
 router.register(r"support", views.SupportRequestViewSet, basename="support")
 router.register(r"practices", views.PracticeViewSet, basename="practice")
 router.register(r"subscriptions/user", views.UserPlanViewSet, basename="user-plan")
@@ -24,6 +26,7 @@ router.register(r"feature-types", views.FeatureTypeViewSet, basename="feature-ty
 router.register(r"plans", views.PlanViewSet, basename="plan")
 router.register(r"payment-methods", views.PaymentMethodViewSet, basename="payment-method")
 router.register(r"transactions", views.TransactionViewSet, basename="transaction")
+router.register(r"reports/jobs", views.ReportJobViewSet, basename="report-job")
 
 urlpatterns = [
     path("", lambda r: JsonResponse({"status": "ok"})),
@@ -35,10 +38,17 @@ urlpatterns = [
     path("auth/change-password/", views.ChangePasswordView.as_view(), name="change-password"),
     path("dashboard/", views.DashboardView.as_view(), name="dashboard"),
     path("menu/", views.MenuView.as_view(), name="menu"),
+    path("catalogs/bootstrap/", views.CatalogBootstrapView.as_view(), name="catalog-bootstrap"),
+    path("notifications/stream/", views.NotificationStreamView.as_view(), name="notification-stream"),
     path("subscriptions/razorpay/order/", views.RazorpayCreateOrderView.as_view(), name="razorpay-create-order"),
     path("subscriptions/razorpay/webhook/", views.RazorpayWebhookView.as_view(), name="razorpay-webhook"),
     path("reports/export/csv/", views.ExportCSVView.as_view(), name="export-csv"),
     path("reports/export/pdf/", views.ExportPDFView.as_view(), name="export-pdf"),
+    # Async variants, for deployments serving oelp_backend.asgi
+    path("async/dashboard/", async_views.AsyncDashboardView.as_view(), name="async-dashboard"),
+    path("async/notifications/", async_views.AsyncNotificationListView.as_view(), name="async-notifications"),
+    path("async/notifications/unread_count/", async_views.AsyncUnreadCountView.as_view(), name="async-unread-count"),
+    path("async/subscriptions/razorpay/order/", async_views.AsyncRazorpayCreateOrderView.as_view(), name="async-razorpay-create-order"),
     path("", include(router.urls)),
 ]
 
@@ -1,26 +1,54 @@
 from __future__ import annotations
 
 import csv
-import io
 import secrets
 from datetime import date, datetime, timedelta
+from functools import wraps
+from itertools import islice
+from typing import Optional
 
-razorpay = None  # type: ignore
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.auth import authenticate
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Count
-from django.http import HttpResponse
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count, F
+from django.db import IntegrityError, transaction
+from django.http import FileResponse, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.views import View
 from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.renderers import JSONRenderer
+from rest_framework.exceptions import AuthenticationFailed, PermissionDenied, ValidationError
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.models_app.token import UserAuthToken
-from apps.models_app.user import CustomUser, Role, UserRole
+from apps.models_app.user import CustomUser, UserRole
 
 from .auth import TokenAuthentication
-from .permissions import IsOwnerOrReadOnly
+from .catalog_cache import CATALOG_MODELS, catalog_cache
+from .entitlements import consume, get_entitlements, release
+from .conditional import conditional_response, user_conditional, with_etag
+from .notification_stream import issue_stream_ticket, notification_events, read_stream_ticket
+from .notification_fanout import mark_notifications_read
+from .field_import import FieldImporter, FieldImportError, parse_import_rows
+from .spatial_index import spatial_index_cache
+from .pagination import BatchPageNumberPagination, KeysetOrPageNumberPagination
+from .password_hashing import HashingPoolBusy, measure_hashing, set_password, verify_password
+from .role_cache import END_USER_ROLE, ensure_role, role_cache
+from .payment_events import enqueue_processing, record_webhook_event
+from .payments import IdempotencyConflict, PaymentGatewayError, create_order, get_gateway
+from .permissions import CanBroadcastNotifications, CanReviewSoilReports, HasFeatureQuota, IsOwnerOrReadOnly
+from .recommendations import recommend, recommend_report, report_rows
+from .reports import fields_data_version, render_fields_pdf, render_invoice_pdf, report_cache_key, report_filters, report_queryset
+from .tasks import fan_out_notifications, render_report_job
+from .soil_analytics import soil_analytics
+from .crop_seasons import season_statistics, timeline_queryset
+from .irrigation_series import GROUP_BY as IRRIGATION_GROUP_BY, irrigation_series
 from .serializers import (
     AssetSerializer,
     ActivitySerializer,
@@ -34,7 +62,10 @@ from .serializers import (
     FieldIrrigationPracticeSerializer,
     FieldSerializer,
     CropLifecycleDatesSerializer,
+    CropSeasonTimelineSerializer,
     LoginSerializer,
+    NotificationFanOutSerializer,
+    NotificationMarkReadSerializer,
     NotificationSerializer,
     SignUpSerializer,
     SoilReportSerializer,
@@ -42,6 +73,7 @@ from .serializers import (
     SupportRequestSerializer,
     TokenSerializer,
     PlanSerializer,
+    ReportJobSerializer,
     UserPlanSerializer,
     IrrigationMethodSerializer,
     PaymentMethodSerializer,
@@ -50,29 +82,50 @@ from .serializers import (
 
 from apps.models_app.assets import Asset
 from apps.models_app.crop_variety import Crop, CropVariety
+from apps.models_app.dashboard import DashboardSummary
 from apps.models_app.farm import Farm
 from apps.models_app.field import Field, Device, CropLifecycleDates, FieldIrrigationMethod, FieldIrrigationPractice
 from apps.models_app.feature import Feature, FeatureType
+from apps.models_app.geometry import boundary_contains
+from apps.models_app.irrigation_rollup import IrrigationRollup
 from apps.models_app.plan import Plan
+from apps.models_app.report_job import ReportJob
 from apps.models_app.user_plan import UserPlan, PaymentMethod, Transaction
 from apps.models_app.notifications import Notification, SupportRequest
 from apps.models_app.irrigation import IrrigationMethods
 from apps.models_app.models import UserActivity
-from apps.models_app.soil_report import SoilReport, SoilTexture
+from apps.models_app.soil_report import SoilReport, SoilTexture, latest_per_field
+
+
+def timed_hashing(handler):
+    """Answer 503 when the hashing pool is saturated and report hashing time in ``Server-Timing``."""
+
+    @wraps(handler)
+    def wrapper(self, request, *args, **kwargs):
+        with measure_hashing() as timings:
+            try:
+                response = handler(self, request, *args, **kwargs)
+            except HashingPoolBusy as exc:
+                response = Response({"detail": str(exc)}, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={"Retry-After": "1"})
+        if timings.count:
+            response["Server-Timing"] = timings.server_timing()
+        return response
+
+    return wrapper
 
 
 class SignUpView(APIView):
     authentication_classes: list = []
     permission_classes: list = []
 
+    @timed_hashing
     def post(self, request):
         serializer = SignUpSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
-        # Ensure default role assignment for end users
+        # Ensure default role assignment for end users; a new account has no roles yet
         try:
-            end_role, _ = Role.objects.get_or_create(name="End-App-User")
-            UserRole.objects.get_or_create(user=user, role=end_role, defaults={"userrole_id": user.email or user.username})
+            UserRole.objects.create(user=user, role=role_cache.get(END_USER_ROLE), userrole_id=user.email or user.username)
         except Exception:
             pass
         token_value = secrets.token_urlsafe(48)
@@ -84,16 +137,16 @@ class LoginView(APIView):
     authentication_classes: list = []
     permission_classes: list = []
 
+    @timed_hashing
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = authenticate(request, username=serializer.validated_data["username"], password=serializer.validated_data["password"])
         if not user:
             return Response({"detail": "Invalid credentials"}, status=status.HTTP_400_BAD_REQUEST)
-        # Ensure role exists on first login if missing
+        # Ensure role exists on first login if missing (a cached lookup once assigned)
         try:
-            end_role, _ = Role.objects.get_or_create(name="End-App-User")
-            UserRole.objects.get_or_create(user=user, role=end_role, defaults={"userrole_id": user.email or user.username})
+            ensure_role(user)
         except Exception:
             pass
         token_value = secrets.token_urlsafe(48)
@@ -131,18 +184,19 @@ class MeView(APIView):
 class ChangePasswordView(APIView):
     authentication_classes = [TokenAuthentication]
 
+    @timed_hashing
     def post(self, request):
         current_password = request.data.get("current_password")
         new_password = request.data.get("new_password")
         if not current_password or not new_password:
             return Response({"detail": "current_password and new_password are required"}, status=status.HTTP_400_BAD_REQUEST)
         user = request.user
-        if not user.check_password(current_password):
+        if not verify_password(user, current_password):
             return Response({"detail": "Current password is incorrect"}, status=status.HTTP_400_BAD_REQUEST)
         from django.contrib.auth import password_validation
 
         password_validation.validate_password(new_password, user)
-        user.set_password(new_password)
+        set_password(user, new_password)
         user.save(update_fields=["password"])
         return Response({"detail": "Password changed successfully"})
 
@@ -159,76 +213,160 @@ class SuggestPasswordView(APIView):
 class DashboardView(APIView):
     authentication_classes = [TokenAuthentication]
 
+    @user_conditional(("fields", "notifications", "plans", "practices", "activity"), catalogs=("plans", "irrigation_methods"))
     def get(self, request):
-        from django.utils import timezone
-
         user = request.user
-        user_fields = Field.objects.filter(user=user, is_active=True)
-        active_fields = user_fields.count()
-
-        # Count fields with a crop assigned and not yet harvested (no harvesting_date recorded)
-        active_crops = (
-            CropLifecycleDates.objects
-            .filter(field__in=user_fields, field__crop__isnull=False)
-            .filter(harvesting_date__isnull=True)
-            .values("field_id")
-            .distinct()
-            .count()
-        )
-
-        # Total area in hectares summed from JSON field
-        total_hectares = 0.0
-        for f in user_fields:
-            try:
-                hectares = (f.area or {}).get("hectares")
-                if isinstance(hectares, (int, float)):
-                    total_hectares += float(hectares)
-            except Exception:
-                pass
+        # Counters come from the materialized summary maintained by signals
+        summary = DashboardSummary.for_user(user)
 
         plans = UserPlan.objects.filter(user=user, is_active=True).select_related("plan")
         current_plan = plans.first()
-        notifications_count = Notification.objects.filter(receiver=user, is_read=False).count()
         recent_practices_qs = (
             FieldIrrigationPractice.objects
             .filter(field__user=user)
             .select_related("field", "irrigation_method")
             .order_by("-performed_at")[:3]
         )
-        recent_practices = FieldIrrigationPracticeSerializer(recent_practices_qs, many=True).data
         recent_activity = UserActivity.objects.filter(user=user).order_by("-created_at")[:5]
-        return Response(
-            {
-                "active_fields": active_fields,
-                "active_crops": active_crops,
-                "current_plan": UserPlanSerializer(current_plan).data if current_plan else None,
-                "total_hectares": round(total_hectares, 4),
-                "unread_notifications": notifications_count,
-                "current_practices": recent_practices,
-                "recent_activity": ActivitySerializer(recent_activity, many=True).data,
-            }
-        )
+        return Response(dashboard_payload(summary, current_plan, recent_practices_qs, recent_activity))
+
+
+def dashboard_payload(summary, current_plan, recent_practices, recent_activity) -> dict:
+    """Dashboard body from already-loaded rows; shared by the sync and async views."""
+    return {
+        "active_fields": summary.active_fields,
+        "active_crops": summary.active_crops,
+        "current_plan": UserPlanSerializer(current_plan).data if current_plan else None,
+        "total_hectares": round(summary.total_hectares, 4),
+        "unread_notifications": summary.unread_notifications,
+        "current_practices": FieldIrrigationPracticeSerializer(recent_practices, many=True).data,
+        "recent_activity": ActivitySerializer(recent_activity, many=True).data,
+    }
 
 
 class MenuView(APIView):
     authentication_classes = [TokenAuthentication]
 
+    # (key, label); an item whose key names a Feature limited by some plan is
+    # only shown to users whose active plans include it
+    items = [
+        ("dashboard", "Dashboard"),
+        ("crops", "Crops"),
+        ("fields", "Fields"),
+        ("subscriptions", "Subscriptions"),
+        ("practices", "Practices"),
+        ("reports", "Reports"),
+        ("settings", "Settings"),
+    ]
+
+    def get(self, request):
+        entitlements = get_entitlements(request.user.pk)
+        menu = []
+        for key, label in self.items:
+            if not entitlements.allows(key):
+                continue
+            item = {"key": key, "label": label}
+            if key in entitlements.gated:
+                item["limit"] = entitlements.limit(key)
+            menu.append(item)
+        return Response(menu)
+
+
+class FeatureQuotaMixin:
+    """Charge the plan quota for ``quota_feature`` on ``quota_actions``; failed requests are refunded.
+
+    Actions that create several objects call ``charge_quota`` themselves
+    with the number they are about to create.
+    """
+
+    quota_feature: str = ""
+    quota_actions: tuple[str, ...] = ("create",)
+
+    def get_permissions(self):
+        return [*super().get_permissions(), HasFeatureQuota()]
+
+    def charge_quota(self, request, amount: int) -> None:
+        """Spend ``amount`` units, or deny the request when the quota cannot cover them."""
+        usage_id = consume(request.user.pk, self.quota_feature, amount)
+        if usage_id is None:
+            raise PermissionDenied(HasFeatureQuota.message)
+        request.quota_charge = (usage_id, amount)
+
+    def refund_quota(self, request, amount: Optional[int] = None) -> None:
+        """Give back ``amount`` units of the request's charge, or all of it."""
+        charge = getattr(request, "quota_charge", None)
+        if not charge or not charge[0]:
+            return
+        usage_id, charged = charge
+        amount = charged if amount is None else min(amount, charged)
+        if amount > 0:
+            release(usage_id, amount)
+        request.quota_charge = (usage_id, charged - amount) if charged > amount else None
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if response.status_code >= 400:
+            self.refund_quota(request)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    def handle_exception(self, exc):
+        try:
+            return super().handle_exception(exc)
+        except Exception:
+            # Uncaught errors never reach finalize_response
+            self.refund_quota(self.request)
+            raise
+
+
+class CachedCatalogMixin:
+    """Serve ``list`` from the versioned catalog cache, with ETag revalidation.
+
+    The ETag is derived from catalog versions and the request URL alone, so
+    a matching ``If-None-Match`` is answered with 304 before any query runs.
+    ``catalog_dependencies`` names other catalogs the serialized rows embed.
+    """
+
+    catalog_name: str = ""
+    catalog_dependencies: tuple[str, ...] = ()
+
+    def list(self, request, *args, **kwargs):
+        if getattr(request.accepted_renderer, "format", "json") != "json":
+            return super().list(request, *args, **kwargs)
+        etag = catalog_cache.etag((self.catalog_name, *self.catalog_dependencies), request.build_absolute_uri())
+        not_modified = conditional_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        def build() -> bytes:
+            return JSONRenderer().render(super(CachedCatalogMixin, self).list(request, *args, **kwargs).data)
+
+        payload = catalog_cache.get_or_build(etag, build)
+        return with_etag(HttpResponse(payload, content_type="application/json"), etag)
+
+
+class CatalogBootstrapView(APIView):
+    """Every reference catalog in one cached response, for the SPA to load at startup."""
+
+    authentication_classes = [TokenAuthentication]
+
     def get(self, request):
-        # Basic role/plan gate example
-        base_items = [
-            {"key": "dashboard", "label": "Dashboard"},
-            {"key": "crops", "label": "Crops"},
-            {"key": "fields", "label": "Fields"},
-            {"key": "subscriptions", "label": "Subscriptions"},
-            {"key": "practices", "label": "Practices"},
-            {"key": "reports", "label": "Reports"},
-            {"key": "settings", "label": "Settings"},
-        ]
-        return Response(base_items)
-
-
-class CropViewSet(viewsets.ModelViewSet):
+        etag = catalog_cache.etag(CATALOG_MODELS)
+        not_modified = conditional_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        def build() -> bytes:
+            data = {}
+            for name, viewset in CATALOG_VIEWSETS.items():
+                data[name] = viewset.serializer_class(viewset.queryset.all(), many=True, context={"request": request}).data
+            return JSONRenderer().render(data)
+
+        payload = catalog_cache.get_or_build(etag, build)
+        return with_etag(HttpResponse(payload, content_type="application/json"), etag)
+
+
+class CropViewSet(CachedCatalogMixin, viewsets.ModelViewSet):
     authentication_classes = [TokenAuthentication]
+    catalog_name = "crops"
     queryset = Crop.objects.all()
     serializer_class = CropSerializer
     filterset_fields = ["name"]
@@ -236,8 +374,10 @@ class CropViewSet(viewsets.ModelViewSet):
     ordering_fields = ["name"]
 
 
-class CropVarietyViewSet(viewsets.ModelViewSet):
+class CropVarietyViewSet(CachedCatalogMixin, viewsets.ModelViewSet):
     authentication_classes = [TokenAuthentication]
+    catalog_name = "crop_varieties"
+    catalog_dependencies = ("crops",)
     queryset = CropVariety.objects.select_related("crop").all()
     serializer_class = CropVarietySerializer
     filterset_fields = ["crop", "name", "is_primary"]
@@ -259,23 +399,97 @@ class FarmViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class FieldViewSet(viewsets.ModelViewSet):
+class FieldViewSet(FeatureQuotaMixin, viewsets.ModelViewSet):
     authentication_classes = [TokenAuthentication]
+    quota_feature = "fields"
     serializer_class = FieldSerializer
     filterset_fields = ["farm", "crop", "is_active"]
     search_fields = ["name", "location_name"]
     ordering_fields = ["created_at", "updated_at", "name"]
+    bulk_import_max_rows = 20000
 
     def get_queryset(self):
-        return Field.objects.filter(user=self.request.user).select_related("farm", "crop", "crop_variety")
+        queryset = Field.objects.filter(user=self.request.user).select_related("farm", "crop", "crop_variety", "soil_type")
+        bbox = self.request.query_params.get("bbox")
+        if bbox and self.action == "list":
+            # ?bbox=min_lon,min_lat,max_lon,max_lat keeps fields whose bounding box overlaps the viewport
+            try:
+                min_lon, min_lat, max_lon, max_lat = (float(v) for v in bbox.split(","))
+            except ValueError:
+                raise ValidationError({"bbox": "Expected min_lon,min_lat,max_lon,max_lat"})
+            queryset = queryset.filter(max_lon__gte=min_lon, min_lon__lte=max_lon, max_lat__gte=min_lat, min_lat__lte=max_lat)
+        return queryset
+
+    # Rows embed latest_soil_report, which soil report writes move
+    @user_conditional(("fields", "soil_reports"), catalogs=("soil_textures",))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    @staticmethod
+    def _point_params(request) -> tuple[float, float]:
+        try:
+            return float(request.query_params["lon"]), float(request.query_params["lat"])
+        except (KeyError, ValueError):
+            raise ValidationError({"detail": "lon and lat query parameters are required"})
+
+    @action(detail=False, methods=["get"])
+    def contains(self, request):
+        """Fields whose boundary contains the point ?lon=&lat=."""
+        lon, lat = self._point_params(request)
+        candidates = self.get_queryset().filter(min_lon__lte=lon, max_lon__gte=lon, min_lat__lte=lat, max_lat__gte=lat)
+        matches = [fld for fld in candidates if boundary_contains(fld.boundary, lon, lat)]
+        return Response(self.get_serializer(matches, many=True).data)
+
+    @action(detail=False, methods=["get"])
+    def nearest(self, request):
+        """The k (default 5, at most 100) fields whose centroids are closest to ?lon=&lat=."""
+        lon, lat = self._point_params(request)
+        try:
+            k = max(1, min(int(request.query_params.get("k", 5)), 100))
+        except ValueError:
+            raise ValidationError({"k": "A valid integer is required."})
+        ranked = spatial_index_cache.for_user(request.user).nearest(lon, lat, k)
+        fields = self.get_queryset().in_bulk([pk for pk, _ in ranked])
+        results = []
+        for pk, distance in ranked:
+            if pk in fields:
+                results.append({**self.get_serializer(fields[pk]).data, "distance_m": round(distance, 2)})
+        return Response(results)
+
+    @action(detail=False, methods=["post"], url_path="bulk_import")
+    def bulk_import(self, request):
+        """Create many fields from a CSV upload or a GeoJSON FeatureCollection.
+
+        ``farm`` may be given once for the whole import instead of per row.
+        Valid rows are inserted; invalid ones are reported by row number.
+        """
+        try:
+            rows = parse_import_rows(upload=request.FILES.get("file"), data=request.data)
+        except FieldImportError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > self.bulk_import_max_rows:
+            return Response(
+                {"detail": f"At most {self.bulk_import_max_rows} rows can be imported per request"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if rows:
+            self.charge_quota(request, len(rows))
+        result = FieldImporter(request.user, default_farm=request.data.get("farm")).run(rows)
+        # Rows that were not created do not count against the plan
+        if result["created"]:
+            self.refund_quota(request, len(rows) - result["created"])
+        return Response(result, status=status.HTTP_201_CREATED if result["created"] else status.HTTP_400_BAD_REQUEST)
+
     @action(detail=True, methods=["get"])
     def lifecycle(self, request, pk=None):
+        """The field's current season: the open one, or else the most recent."""
         field = self.get_object()
-        data = CropLifecycleDates.objects.filter(field=field).values(
+        data = CropLifecycleDates.objects.filter(field=field).order_by(F("harvesting_date").desc(nulls_first=True), "-id").values(
+            "id",
+            "season",
             "sowing_date",
             "growth_start_date",
             "flowering_date",
@@ -286,6 +500,11 @@ class FieldViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=["post"])
     def update_lifecycle(self, request, pk=None):
+        """Record the dates of the field's open season, starting a new one once the last is harvested.
+
+        Pass ``season_id`` to correct a past season instead; earlier seasons
+        are kept as the field's history.
+        """
         field = self.get_object()
         payload = {
             "sowing_date": request.data.get("sowing_date"),
@@ -294,8 +513,23 @@ class FieldViewSet(viewsets.ModelViewSet):
             "harvesting_date": request.data.get("harvesting_date"),
             "yield_amount": request.data.get("yield_amount"),
         }
-        obj, _ = CropLifecycleDates.objects.update_or_create(field=field, defaults=payload)
-        return Response(CropLifecycleDatesSerializer(obj).data)
+        if "season" in request.data:
+            payload["season"] = request.data.get("season") or ""
+        seasons = CropLifecycleDates.objects.filter(field=field)
+        try:
+            with transaction.atomic():
+                if request.data.get("season_id"):
+                    obj = seasons.select_for_update().filter(pk=request.data["season_id"]).first()
+                    if obj is None:
+                        return Response({"detail": "Season not found"}, status=status.HTTP_404_NOT_FOUND)
+                else:
+                    obj = seasons.select_for_update().filter(harvesting_date__isnull=True).first() or CropLifecycleDates(field=field)
+                serializer = CropLifecycleDatesSerializer(obj, data=payload, partial=True)
+                serializer.is_valid(raise_exception=True)
+                serializer.save()
+        except IntegrityError:
+            return Response({"detail": "The field already has a season that has not been harvested"}, status=status.HTTP_409_CONFLICT)
+        return Response(serializer.data)
 
     @action(detail=True, methods=["post"], url_path="set_irrigation_method")
     def set_irrigation_method(self, request, pk=None):
@@ -311,12 +545,90 @@ class FieldViewSet(viewsets.ModelViewSet):
         return Response({"detail": "Irrigation method set"})
 
 
-class SoilReportViewSet(viewsets.ModelViewSet):
+class SoilReportViewSet(FeatureQuotaMixin, viewsets.ModelViewSet):
     authentication_classes = [TokenAuthentication]
-    queryset = SoilReport.objects.select_related("field", "soil_type").all()
+    quota_feature = "soil_reports"
     serializer_class = SoilReportSerializer
     filterset_fields = ["field", "soil_type"]
 
+    def get_queryset(self):
+        return SoilReport.objects.filter(field__user=self.request.user).select_related("field", "soil_type").order_by("-id")
+
+    @action(detail=False, methods=["get"])
+    @user_conditional(("fields", "soil_reports"))
+    def latest(self, request):
+        """The newest report of each of the user's fields, read through the fields' latest-report pointers."""
+        queryset = self.filter_queryset(
+            SoilReport.objects.filter(latest_of_fields__user=request.user).select_related("field", "soil_type").order_by("field_id")
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(queryset, many=True).data)
+
+    @action(detail=False, methods=["get"])
+    @user_conditional(("fields", "soil_reports"))
+    def analytics(self, request):
+        """Nutrient distributions, percentiles, deficiency flags and per-field trends for the user's reports."""
+        try:
+            filters = {name: int(request.query_params[name]) for name in ("field", "farm", "crop") if request.query_params.get(name)}
+        except ValueError:
+            raise ValidationError({"detail": "field, farm and crop must be ids"})
+        # The ETag covers the user, their data versions and the query string
+        key = f"soil-analytics:{request.data_etag}"
+        payload = cache.get(key)
+        if payload is None:
+            payload = soil_analytics(request.user, **filters)
+            cache.set(key, payload, timeout=settings.SOIL_ANALYTICS_CACHE_TIMEOUT)
+        return Response(payload)
+
+    @action(detail=True, methods=["get"])
+    def recommendations(self, request, pk=None):
+        """Fertilizer and amendment doses for one report, from the nutrient rules."""
+        report = self.get_object()
+        return Response(recommend_report(report.pk))
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="recommendations",
+        permission_classes=[IsAuthenticated, CanReviewSoilReports],
+        pagination_class=BatchPageNumberPagination,
+    )
+    def batch_recommendations(self, request):
+        """Recommendations for every report in a region, across accounts, for agronomists.
+
+        Narrowed by ``farm``, ``crop``, ``crop_variety``, ``soil_type``,
+        ``location`` (field location name) and ``bbox`` (fields overlapping
+        min_lon,min_lat,max_lon,max_lat); ``latest=true`` keeps only each
+        field's newest report. Each page is evaluated in one pass.
+        """
+        params = request.query_params
+        queryset = SoilReport.objects.all()
+        try:
+            filters = {
+                lookup: int(params[name])
+                for name, lookup in (("farm", "field__farm_id"), ("crop", "field__crop_id"), ("crop_variety", "field__crop_variety_id"), ("soil_type", "soil_type_id"))
+                if params.get(name)
+            }
+        except ValueError:
+            raise ValidationError({"detail": "farm, crop, crop_variety and soil_type must be ids"})
+        queryset = queryset.filter(**filters)
+        if params.get("location"):
+            queryset = queryset.filter(field__location_name__icontains=params["location"])
+        if params.get("bbox"):
+            try:
+                min_lon, min_lat, max_lon, max_lat = (float(v) for v in params["bbox"].split(","))
+            except ValueError:
+                raise ValidationError({"bbox": "Expected min_lon,min_lat,max_lon,max_lat"})
+            queryset = queryset.filter(
+                field__max_lon__gte=min_lon, field__min_lon__lte=max_lon, field__max_lat__gte=min_lat, field__min_lat__lte=max_lat
+            )
+        if params.get("latest") in ("1", "true"):
+            queryset = latest_per_field(queryset)
+        page = self.paginate_queryset(report_rows(queryset))
+        return self.get_paginated_response(recommend(page))
+
     def perform_create(self, serializer):
         report = serializer.save()
         # Set a convenient report link to the PDF export filtered by field
@@ -327,14 +639,56 @@ class SoilReportViewSet(viewsets.ModelViewSet):
             pass
 
 
-class SoilTextureViewSet(viewsets.ModelViewSet):
+class CropSeasonViewSet(viewsets.ReadOnlyModelViewSet):
+    """Season history of the user's fields, oldest first within each field.
+
+    Filter with ``field``, ``crop`` and ``start_date``/``end_date`` on the
+    sowing date (YYYY-MM-DD). Window values compare seasons that match the
+    filters. Seasons are written through ``fields/{id}/update_lifecycle``.
+    """
+
     authentication_classes = [TokenAuthentication]
+    serializer_class = CropSeasonTimelineSerializer
+    filterset_fields = ["field", "crop"]
+    ordering_fields = ["sowing_date", "harvesting_date", "yield_amount"]
+
+    def get_queryset(self):
+        queryset = timeline_queryset(self.request.user).order_by("field_id", F("sowing_date").asc(nulls_last=True), "id")
+        for param, lookup in (("start_date", "sowing_date__gte"), ("end_date", "sowing_date__lte")):
+            value = self.request.query_params.get(param)
+            if value:
+                try:
+                    queryset = queryset.filter(**{lookup: datetime.strptime(value, "%Y-%m-%d").date()})
+                except ValueError:
+                    raise ValidationError({param: "Expected YYYY-MM-DD"})
+        return queryset
+
+    @user_conditional(("fields",), catalogs=("crops",))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @action(detail=False, methods=["get"])
+    @user_conditional(("fields",), catalogs=("crops",))
+    def stats(self, request):
+        """Stage durations and yield per hectare per crop, and each field's latest season against its history."""
+        key = f"crop-season-stats:{request.data_etag}"
+        payload = cache.get(key)
+        if payload is None:
+            payload = season_statistics(request.user)
+            cache.set(key, payload, timeout=settings.CROP_SEASON_STATS_CACHE_TIMEOUT)
+        return Response(payload)
+
+
+class SoilTextureViewSet(CachedCatalogMixin, viewsets.ModelViewSet):
+    authentication_classes = [TokenAuthentication]
+    catalog_name = "soil_textures"
     queryset = SoilTexture.objects.all()
     serializer_class = SoilTextureSerializer
 
 
-class IrrigationMethodViewSet(viewsets.ModelViewSet):
+class IrrigationMethodViewSet(CachedCatalogMixin, viewsets.ModelViewSet):
     authentication_classes = [TokenAuthentication]
+    catalog_name = "irrigation_methods"
     queryset = IrrigationMethods.objects.all()
     serializer_class = IrrigationMethodSerializer
     search_fields = ["name"]
@@ -343,10 +697,42 @@ class IrrigationMethodViewSet(viewsets.ModelViewSet):
 class FieldIrrigationPracticeViewSet(viewsets.ModelViewSet):
     authentication_classes = [TokenAuthentication]
     serializer_class = FieldIrrigationPracticeSerializer
+    pagination_class = KeysetOrPageNumberPagination
+    keyset_ordering = ("-performed_at", "-id")
 
     def get_queryset(self):
         return FieldIrrigationPractice.objects.filter(field__user=self.request.user).select_related("field", "irrigation_method")
 
+    @action(detail=False, methods=["get"])
+    @user_conditional(("practices",))
+    def series(self, request):
+        """Irrigation totals per day, week or month, read from the rollups.
+
+        ``granularity`` is day, week or month (default); ``start_date`` and
+        ``end_date`` (YYYY-MM-DD) default to the last year. Narrow with
+        ``field``, ``farm`` or ``irrigation_method`` and split the series
+        with ``group_by=field`` or ``group_by=irrigation_method``. Daily
+        totals are kept for IRRIGATION_DAILY_ROLLUP_RETENTION_DAYS.
+        """
+        params = request.query_params
+        granularity = params.get("granularity", IrrigationRollup.Granularity.MONTH)
+        if granularity not in IrrigationRollup.Granularity.values:
+            raise ValidationError({"granularity": f"Expected one of {', '.join(IrrigationRollup.Granularity.values)}"})
+        group_by = params.get("group_by") or None
+        if group_by is not None and group_by not in IRRIGATION_GROUP_BY:
+            raise ValidationError({"group_by": f"Expected one of {', '.join(IRRIGATION_GROUP_BY)}"})
+        try:
+            end = datetime.strptime(params["end_date"], "%Y-%m-%d").date() if params.get("end_date") else timezone.localdate()
+            start = datetime.strptime(params["start_date"], "%Y-%m-%d").date() if params.get("start_date") else end - timedelta(days=365)
+        except ValueError:
+            raise ValidationError({"detail": "start_date and end_date must be YYYY-MM-DD"})
+        try:
+            filters = {name: int(params[name]) for name in ("field", "farm", "irrigation_method") if params.get(name)}
+        except ValueError:
+            raise ValidationError({"detail": "field, farm and irrigation_method must be ids"})
+        series = irrigation_series(request.user, granularity, start, end, group_by=group_by, **filters)
+        return Response({"granularity": granularity, "start_date": start, "end_date": end, "series": series})
+
 
 class AssetViewSet(viewsets.ModelViewSet):
     authentication_classes = [TokenAuthentication]
@@ -357,11 +743,18 @@ class AssetViewSet(viewsets.ModelViewSet):
 class NotificationViewSet(viewsets.ModelViewSet):
     authentication_classes = [TokenAuthentication]
     serializer_class = NotificationSerializer
+    pagination_class = KeysetOrPageNumberPagination
+    keyset_ordering = ("-created_at", "-id")
 
     def get_queryset(self):
         return Notification.objects.filter(receiver=self.request.user)
 
+    @user_conditional(("notifications",))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     @action(detail=False, methods=["get"])
+    @user_conditional(("notifications",))
     def unread_count(self, request):
         cnt = self.get_queryset().filter(is_read=False).count()
         return Response({"count": cnt})
@@ -373,6 +766,75 @@ class NotificationViewSet(viewsets.ModelViewSet):
         notif.save(update_fields=["is_read"])
         return Response({"detail": "Marked as read"})
 
+    @action(detail=False, methods=["post"], url_path="mark_read", url_name="bulk-mark-read")
+    def bulk_mark_read(self, request):
+        serializer = NotificationMarkReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        updated = mark_notifications_read(request.user, serializer.validated_data["ids"])
+        return Response({"updated": updated, "unread_count": DashboardSummary.for_user(request.user).unread_notifications})
+
+    @action(detail=False, methods=["post"])
+    def mark_all_read(self, request):
+        updated = mark_notifications_read(request.user)
+        return Response({"updated": updated, "unread_count": DashboardSummary.for_user(request.user).unread_notifications})
+
+    @action(detail=False, methods=["post"])
+    def stream_ticket(self, request):
+        """A short-lived ticket for ``notifications/stream/?ticket=``, since EventSource cannot send the token header."""
+        return Response({"ticket": issue_stream_ticket(request.auth), "expires_in": settings.NOTIFICATION_STREAM_TICKET_TTL})
+
+    @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated, CanBroadcastNotifications])
+    def fan_out(self, request):
+        """Notify every user matching all given roles / active plans / crops, in the background."""
+        serializer = NotificationFanOutSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        result = fan_out_notifications.delay(request.user.pk, data["message"], data["roles"], data["plans"], data["crops"])
+        return Response({"detail": "Fan-out queued", "task_id": result.id}, status=status.HTTP_202_ACCEPTED)
+
+
+class NotificationStreamView(View):
+    """Server-sent events of new notifications and unread counts; replaces unread_count polling.
+
+    EventSource cannot set headers, so it passes a ticket from
+    ``notifications/stream_ticket/`` as ``?ticket=`` instead of the token;
+    when the ticket has expired, fetch a new one and reconnect. Serve
+    through ``oelp_backend.asgi`` so an open stream does not hold a worker
+    thread.
+    """
+
+    async def get(self, request):
+        authentication = TokenAuthentication()
+        header = request.headers.get("Authorization", "").split()
+        try:
+            if len(header) == 2 and header[0].lower() == authentication.keyword.lower():
+                user, _ = await authentication.aauthenticate_credentials(header[1])
+            elif request.GET.get("ticket"):
+                digest = read_stream_ticket(request.GET["ticket"])
+                if digest is None:
+                    return JsonResponse({"detail": "Invalid or expired stream ticket."}, status=401)
+                user, _ = await authentication.aauthenticate_digest(digest)
+            else:
+                return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+        except AuthenticationFailed as exc:
+            return JsonResponse({"detail": str(exc.detail)}, status=401)
+        last_event_id = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+        response = StreamingHttpResponse(notification_events(user.pk, last_event_id), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"  # keep nginx-style proxies from buffering events
+        return response
+
+
+class ActivityViewSet(viewsets.ReadOnlyModelViewSet):
+    authentication_classes = [TokenAuthentication]
+    serializer_class = ActivitySerializer
+    pagination_class = KeysetOrPageNumberPagination
+    keyset_ordering = ("-created_at", "-id")
+    filterset_fields = ["action"]
+
+    def get_queryset(self):
+        return UserActivity.objects.filter(user=self.request.user)
+
 
 class SupportRequestViewSet(viewsets.ModelViewSet):
     authentication_classes = [TokenAuthentication]
@@ -393,24 +855,39 @@ class PracticeViewSet(viewsets.GenericViewSet, mixins.ListModelMixin):
         return Response([])
 
 
-class FeatureViewSet(viewsets.ModelViewSet):
+class FeatureViewSet(CachedCatalogMixin, viewsets.ModelViewSet):
     authentication_classes = [TokenAuthentication]
+    catalog_name = "features"
     queryset = Feature.objects.select_related("feature_type").all()
     serializer_class = FeatureSerializer
 
 
-class FeatureTypeViewSet(viewsets.ModelViewSet):
+class FeatureTypeViewSet(CachedCatalogMixin, viewsets.ModelViewSet):
     authentication_classes = [TokenAuthentication]
+    catalog_name = "feature_types"
     queryset = FeatureType.objects.all()
     serializer_class = FeatureTypeSerializer
 
 
-class PlanViewSet(viewsets.ModelViewSet):
+class PlanViewSet(CachedCatalogMixin, viewsets.ModelViewSet):
     authentication_classes = [TokenAuthentication]
+    catalog_name = "plans"
     queryset = Plan.objects.all()
     serializer_class = PlanSerializer
 
 
+# Catalog name -> viewset whose queryset and serializer the bootstrap payload reuses
+CATALOG_VIEWSETS = {
+    "crops": CropViewSet,
+    "crop_varieties": CropVarietyViewSet,
+    "soil_textures": SoilTextureViewSet,
+    "irrigation_methods": IrrigationMethodViewSet,
+    "plans": PlanViewSet,
+    "features": FeatureViewSet,
+    "feature_types": FeatureTypeViewSet,
+}
+
+
 class UserPlanViewSet(viewsets.ModelViewSet):
     authentication_classes = [TokenAuthentication]
     queryset = UserPlan.objects.select_related("user", "plan").all()
@@ -448,40 +925,25 @@ class PaymentMethodViewSet(viewsets.ModelViewSet):
 class TransactionViewSet(viewsets.ReadOnlyModelViewSet):
     authentication_classes = [TokenAuthentication]
     serializer_class = TransactionSerializer
+    pagination_class = KeysetOrPageNumberPagination
+    keyset_ordering = ("-created_at", "-id")
 
     def get_queryset(self):
         return Transaction.objects.filter(user=self.request.user).select_related("plan")
 
+    @user_conditional(("transactions",), catalogs=("plans",))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     @action(detail=True, methods=["get"], url_path="invoice")
     def invoice(self, request, pk=None):
         # Generate a simple invoice PDF on the fly
         try:
-            from reportlab.pdfgen import canvas
+            import reportlab  # noqa: F401
         except Exception:
             return Response({"detail": "reportlab not installed"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         txn = self.get_object()
-        import io
-        buffer = io.BytesIO()
-        p = canvas.Canvas(buffer)
-        p.setTitle("Invoice")
-        y = 800
-        p.drawString(100, y, "Invoice")
-        y -= 20
-        p.drawString(100, y, f"Transaction ID: {txn.id}")
-        y -= 20
-        p.drawString(100, y, f"User: {txn.user.username}")
-        y -= 20
-        p.drawString(100, y, f"Plan: {getattr(txn.plan, 'name', '-')}")
-        y -= 20
-        p.drawString(100, y, f"Amount: {txn.amount} {txn.currency}")
-        y -= 20
-        p.drawString(100, y, f"Status: {txn.status}")
-        y -= 40
-        p.drawString(100, y, "Thank you for your purchase.")
-        p.showPage()
-        p.save()
-        buffer.seek(0)
-        response = HttpResponse(buffer.getvalue(), content_type="application/pdf")
+        response = HttpResponse(render_invoice_pdf(txn), content_type="application/pdf")
         response["Content-Disposition"] = f"attachment; filename=invoice_{txn.id}.pdf"
         return response
 
@@ -490,17 +952,30 @@ class RazorpayCreateOrderView(APIView):
     authentication_classes = [TokenAuthentication]
 
     def post(self, request):
-        amount = int(float(request.data.get("amount", 0)) * 100)
-        currency = request.data.get("currency", "INR")
-        # Lazy import to avoid hard dependency during CI checks
-        global razorpay  # type: ignore
-        if razorpay is None:
-            from importlib import import_module
-
-            razorpay = import_module("razorpay")  # type: ignore
-        client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))  # type: ignore
-        order = client.order.create({"amount": amount, "currency": currency})
-        return Response(order)
+        order_request, error = parse_order_request(request.data, request.headers)
+        if error:
+            return Response({"detail": error}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            return Response(create_order(request.user, **order_request))
+        except IdempotencyConflict as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_409_CONFLICT)
+        except PaymentGatewayError as exc:
+            return Response({"detail": f"Payment gateway error: {exc}"}, status=status.HTTP_502_BAD_GATEWAY)
+
+
+def parse_order_request(data, headers) -> tuple[dict, str]:
+    """Keyword arguments for ``payments.create_order`` from a request body, or an error message."""
+    try:
+        amount = int(round(float(data.get("amount", 0)) * 100))
+        plan_id = int(data["plan"]) if data.get("plan") not in (None, "") else None
+    except (TypeError, ValueError):
+        return {}, "Invalid amount or plan"
+    if amount <= 0:
+        return {}, "Amount must be positive"
+    key = headers.get("Idempotency-Key") or data.get("idempotency_key") or None
+    if key is not None and len(key) > 64:
+        return {}, "Idempotency key is too long"
+    return {"amount": amount, "currency": data.get("currency", "INR"), "plan_id": plan_id, "idempotency_key": key}, ""
 
 
 class RazorpayWebhookView(APIView):
@@ -508,88 +983,128 @@ class RazorpayWebhookView(APIView):
     permission_classes: list = []
 
     def post(self, request):
-        # TODO: verify signature, update transactions, handle refunds/status
+        # Verify and store the raw event, then acknowledge; a worker applies it
+        body = request.body
+        if not get_gateway().verify_webhook_signature(body, request.headers.get("X-Razorpay-Signature", "")):
+            return Response({"detail": "Invalid signature"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            record_webhook_event(body, request.headers.get("X-Razorpay-Event-Id", ""))
+        except ValueError:
+            return Response({"detail": "Invalid payload"}, status=status.HTTP_400_BAD_REQUEST)
+        transaction.on_commit(enqueue_processing)
         return Response({"status": "ok"})
 
 
+class _Echo:
+    """Pseudo-buffer for csv.writer: write() returns the line instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
 class ExportCSVView(APIView):
     authentication_classes = [TokenAuthentication]
+    chunk_size = 2000
 
     def get(self, request):
-        # Optional date filters (YYYY-MM-DD)
-        start_date_str = request.query_params.get("start_date")
-        end_date_str = request.query_params.get("end_date")
-        field_id = request.query_params.get("field_id") or request.query_params.get("field")
-        start_date = None
-        end_date = None
-        try:
-            if start_date_str:
-                start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
-            if end_date_str:
-                end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
-        except Exception:
-            pass
-
-        buffer = io.StringIO()
-        writer = csv.writer(buffer)
-        writer.writerow(["Field", "Crop", "Hectares"])
-        queryset = Field.objects.filter(user=request.user)
-        if field_id:
-            queryset = queryset.filter(pk=field_id)
-        if start_date:
-            queryset = queryset.filter(updated_at__date__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(updated_at__date__lte=end_date)
-        for fld in queryset:
-            hectares = (fld.area or {}).get("hectares")
-            writer.writerow([fld.name, getattr(fld.crop, "name", "-"), hectares])
-        buffer.seek(0)
-        response = HttpResponse(buffer.getvalue(), content_type="text/csv")
+        # Rows are streamed from a server-side cursor, so memory stays flat for large accounts
+        rows = report_queryset(request.user, request.query_params).order_by("pk").values_list("name", "crop__name", "area")
+        writer = csv.writer(_Echo())
+
+        def stream():
+            yield writer.writerow(["Field", "Crop", "Hectares"])
+            for name, crop_name, area in rows.iterator(chunk_size=self.chunk_size):
+                hectares = area.get("hectares") if isinstance(area, dict) else None
+                yield writer.writerow([name, crop_name or "-", hectares])
+
+        async def astream():
+            # One thread hop per chunk of lines; the cursor stays on Django's sync thread
+            lines = stream()
+            take = sync_to_async(lambda: "".join(islice(lines, self.chunk_size)))
+            while chunk := await take():
+                yield chunk
+
+        # Under ASGI Django would buffer a sync iterator whole before sending it
+        content = astream() if isinstance(request._request, ASGIRequest) else stream()
+        response = StreamingHttpResponse(content, content_type="text/csv")
         response["Content-Disposition"] = "attachment; filename=report.csv"
         return response
 
 
+def submit_report_job(user, kind: str, params: dict, data_version: str) -> tuple[ReportJob, bool]:
+    """The job rendering ``kind`` for these inputs and data version, and whether it was just created.
+
+    A finished or in-flight job for the same inputs is reused, unless it has
+    been pending or running for longer than REPORT_JOB_TIMEOUT.
+    """
+    cache_key = report_cache_key(user.pk, kind, params, data_version)
+    jobs = ReportJob.objects.filter(user=user, cache_key=cache_key)
+    ReportJob.fail_stale(jobs, settings.REPORT_JOB_TIMEOUT)
+    job = jobs.exclude(status=ReportJob.Status.FAILED).first()
+    if job is not None:
+        return job, False
+    job = ReportJob.objects.create(user=user, kind=kind, params=params, cache_key=cache_key)
+    transaction.on_commit(lambda: render_report_job.delay(job.pk))
+    return job, True
+
+
 class ExportPDFView(APIView):
     authentication_classes = [TokenAuthentication]
 
     def get(self, request):
-        # Minimal PDF export with optional date filter
-        start_date_str = request.query_params.get("start_date")
-        end_date_str = request.query_params.get("end_date")
-        field_id = request.query_params.get("field_id") or request.query_params.get("field")
-        start_date = None
-        end_date = None
-        try:
-            if start_date_str:
-                start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
-            if end_date_str:
-                end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
-        except Exception:
-            pass
-        from reportlab.pdfgen import canvas
-
-        buffer = io.BytesIO()
-        p = canvas.Canvas(buffer)
-        p.drawString(100, 800, "OELP Report")
-        y = 760
-        queryset = Field.objects.filter(user=request.user)
-        if field_id:
-            queryset = queryset.filter(pk=field_id)
-        if start_date:
-            queryset = queryset.filter(updated_at__date__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(updated_at__date__lte=end_date)
-        for fld in queryset[:30]:
-            p.drawString(100, y, f"Field: {fld.name}")
-            y -= 20
-        p.showPage()
-        p.save()
-        buffer.seek(0)
-        response = HttpResponse(buffer.getvalue(), content_type="application/pdf")
+        queryset = report_queryset(request.user, request.query_params)
+        # Up to REPORT_SYNC_MAX_ROWS fields render inline; larger exports become a report job to poll
+        if queryset[: settings.REPORT_SYNC_MAX_ROWS + 1].count() > settings.REPORT_SYNC_MAX_ROWS:
+            job, _ = submit_report_job(
+                request.user, ReportJob.Kind.FIELDS_PDF, report_filters(request.query_params), fields_data_version(queryset)
+            )
+            data = ReportJobSerializer(job).data
+            return Response(data, status=status.HTTP_202_ACCEPTED, headers={"Location": f"/api/reports/jobs/{job.pk}/"})
+        content = render_fields_pdf(queryset)
+        response = HttpResponse(content, content_type="application/pdf")
         response["Content-Disposition"] = "attachment; filename=report.pdf"
         return response
 
 
+class ReportJobViewSet(FeatureQuotaMixin, mixins.CreateModelMixin, mixins.RetrieveModelMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    """Background PDF rendering: submit a job, poll its status, download the result."""
+
+    authentication_classes = [TokenAuthentication]
+    quota_feature = "reports"
+    serializer_class = ReportJobSerializer
+
+    def get_queryset(self):
+        return ReportJob.objects.filter(user=self.request.user)
+
+    def create(self, request, *args, **kwargs):
+        kind = request.data.get("kind", ReportJob.Kind.FIELDS_PDF)
+        if kind == ReportJob.Kind.FIELDS_PDF:
+            params = report_filters(request.data)
+            data_version = fields_data_version(report_queryset(request.user, params))
+        elif kind == ReportJob.Kind.INVOICE_PDF:
+            txn_id = request.data.get("transaction_id")
+            txn = Transaction.objects.filter(user=request.user, pk=txn_id).values("updated_at").first() if txn_id else None
+            if txn is None:
+                return Response({"detail": "Invalid transaction_id"}, status=status.HTTP_400_BAD_REQUEST)
+            params = {"transaction_id": str(txn_id)}
+            data_version = txn["updated_at"].isoformat()
+        else:
+            return Response({"detail": "Invalid kind"}, status=status.HTTP_400_BAD_REQUEST)
+
+        job, created = submit_report_job(request.user, kind, params, data_version)
+        if not created:
+            # Reusing a cached or in-flight job renders nothing new
+            self.refund_quota(request)
+        return Response(self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED if created else status.HTTP_200_OK)
+
+    @action(detail=True, methods=["get"])
+    def download(self, request, pk=None):
+        job = self.get_object()
+        if job.status != ReportJob.Status.DONE or not job.file:
+            return Response({"detail": f"Report is {job.status}"}, status=status.HTTP_409_CONFLICT)
+        return FileResponse(job.file.open("rb"), as_attachment=True, filename=f"{job.kind}_{job.pk}.pdf", content_type="application/pdf")
+
+
 # Import at end to avoid circular reference
 from .serializers import UserSerializer  # noqa: E402
 
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from weakref import WeakValueDictionary
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+
+# Models whose saves are recorded as UserActivity; only these get the post_save receiver
+ACTIVITY_TRACKED_MODELS = ("Field", "SoilReport", "Crop", "CropVariety")
+
+# A context variable rather than a thread-local: under ASGI the batch is opened on the
+# event loop and the view's sync code runs in a worker thread that inherits the context
+_request_events_var: ContextVar[Optional[list]] = ContextVar("activity_request_events", default=None)
+
+
+def _request_events() -> Optional[list]:
+    return _request_events_var.get()
+
+
+class _CommitBatch:
+    """Events recorded in one atomic block, handed on by a single on_commit hook.
+
+    Django drops the hooks of rolled-back transactions and savepoints, so
+    only events whose rows were committed get past ``__call__``.
+    """
+
+    __slots__ = ("events", "__weakref__")
+
+    def __init__(self) -> None:
+        self.events: Optional[list] = []
+
+    def __call__(self) -> None:
+        committed, self.events = self.events, None
+        events = _request_events()
+        if events is not None:
+            events.extend(committed)
+        else:
+            flush_activity(committed)
+
+
+def _commit_batch() -> _CommitBatch:
+    """The batch of the current atomic block, registering its on_commit hook on first use.
+
+    Batches are keyed on the connection's savepoint stack and held weakly:
+    the hook list owns them, so a batch is gone once its hook has run or
+    been discarded by a rollback.
+    """
+    batches = getattr(connection, "activity_commit_batches", None)
+    if batches is None:
+        batches = connection.activity_commit_batches = WeakValueDictionary()
+    key = tuple(connection.savepoint_ids)
+    batch = batches.get(key)
+    if batch is None or batch.events is None:
+        batch = batches[key] = _CommitBatch()
+        transaction.on_commit(batch)
+    return batch
+
+
+def record_activity(user_id: int, action: str, model, object_id: int, description: str = "") -> None:
+    """Queue a UserActivity row; rows are written in bulk on commit or at the end of the batch."""
+    event = (user_id, action, ContentType.objects.get_for_model(model).pk, object_id, description)
+    if connection.in_atomic_block:
+        _commit_batch().events.append(event)
+        return
+    events = _request_events()
+    if events is not None:
+        events.append(event)
+    else:
+        flush_activity([event])
+
+
+@contextmanager
+def activity_batch():
+    """Collect autocommit activity events for the enclosed block and write them with one insert."""
+    if _request_events() is not None:
+        yield
+        return
+    events: list = []
+    token = _request_events_var.set(events)
+    try:
+        yield
+    finally:
+        _request_events_var.reset(token)
+        flush_activity(events)
+
+
+@asynccontextmanager
+async def async_activity_batch():
+    """``activity_batch`` for async code; the insert runs in a worker thread."""
+    if _request_events() is not None:
+        yield
+        return
+    events: list = []
+    token = _request_events_var.set(events)
+    try:
+        yield
+    finally:
+        _request_events_var.reset(token)
+        if events:
+            await sync_to_async(flush_activity)(events)
+
+
+def flush_activity(events: list) -> None:
+    if not events:
+        return
+    try:
+        if getattr(settings, "ACTIVITY_LOG_ASYNC", False):
+            from .tasks import write_activity_events
+
+            write_activity_events.delay([list(event) for event in events])
+        else:
+            write_activity_events_now(events)
+    except Exception:
+        # Activity logging is best effort and must never fail the writer
+        pass
+    events.clear()
+
+
+def write_activity_events_now(events) -> None:
+    from .data_version import UserDataVersion
+    from .models import UserActivity
+
+    UserActivity.objects.bulk_create(
+        [
+            UserActivity(user_id=user_id, action=action, content_type_id=ct_id, object_id=object_id, description=description)
+            for user_id, action, ct_id, object_id, description in events
+        ]
+    )
+    UserDataVersion.bump({event[0] for event in events}, "activity")
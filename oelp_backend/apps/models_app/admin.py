@@ -4,13 +4,19 @@ from django.contrib import admin
 
 from .assets import Asset
 from .crop_variety import Crop, CropVariety
+from .dashboard import DashboardSummary
+from .data_version import UserDataVersion
 from .farm import Farm
 from .field import Field, Device, CropLifecycleDates, FieldIrrigationMethod, FieldIrrigationPractice
 from .feature import FeatureType, Feature
 from .feature_plan import PlanFeature
 from .irrigation import IrrigationMethods
+from .irrigation_rollup import IrrigationRollup
 from .notifications import Notification, SupportRequest
+from .nutrient_rule import NutrientRule
+from .payment_event import PaymentWebhookEvent
 from .plan import Plan
+from .report_job import ReportJob
 from .soil_report import SoilTexture, SoilReport
 from .token import UserAuthToken
 from .user import CustomUser, Role, UserRole
@@ -84,6 +90,18 @@ class FieldAdmin(admin.ModelAdmin):
     search_fields = ("name", "farm__name", "crop__name")
 
 
+@admin.register(DashboardSummary)
+class DashboardSummaryAdmin(admin.ModelAdmin):
+    list_display = ("user", "active_fields", "active_crops", "total_hectares", "unread_notifications", "updated_at")
+    search_fields = ("user__email", "user__username")
+
+
+@admin.register(UserDataVersion)
+class UserDataVersionAdmin(admin.ModelAdmin):
+    list_display = ("user", "fields_version", "notifications_version", "plans_version", "transactions_version", "activity_version")
+    search_fields = ("user__email", "user__username")
+
+
 admin.site.register(CropLifecycleDates)
 admin.site.register(FieldIrrigationMethod)
 admin.site.register(FieldIrrigationPractice)
@@ -131,6 +149,34 @@ admin.site.register(PaymentMethod)
 admin.site.register(Transaction)
 
 
+@admin.register(PaymentWebhookEvent)
+class PaymentWebhookEventAdmin(admin.ModelAdmin):
+    list_display = ("id", "event_id", "event_type", "status", "received_at", "processed_at")
+    list_filter = ("status", "event_type")
+    search_fields = ("event_id",)
+
+
+@admin.register(IrrigationRollup)
+class IrrigationRollupAdmin(admin.ModelAdmin):
+    list_display = ("id", "field", "irrigation_method", "granularity", "period_start", "events", "duration_minutes", "water_volume")
+    list_filter = ("granularity",)
+    search_fields = ("field__name",)
+
+
+@admin.register(NutrientRule)
+class NutrientRuleAdmin(admin.ModelAdmin):
+    list_display = ("id", "nutrient", "direction", "threshold", "target", "product", "crop", "crop_variety", "soil_texture")
+    list_filter = ("nutrient", "direction", "crop", "soil_texture")
+    search_fields = ("product", "note")
+
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "kind", "status", "created_at", "finished_at")
+    list_filter = ("kind", "status")
+    search_fields = ("user__email", "cache_key")
+
+
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
     list_display = ("id", "receiver", "is_read", "created_at")
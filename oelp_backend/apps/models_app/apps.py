@@ -20,6 +20,12 @@ class ModelsAppConfig(AppConfig):
         from . import user_plan  # noqa: F401
         from . import notifications  # noqa: F401
         from . import token  # noqa: F401
+        from . import dashboard  # noqa: F401
+        from . import data_version  # noqa: F401
+        from . import report_job  # noqa: F401
+        from . import payment_event  # noqa: F401
+        from . import nutrient_rule  # noqa: F401
+        from . import irrigation_rollup  # noqa: F401
         # Import signals
         from . import signals  # noqa: F401
 
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.db import models
+from django.db.models import F
+
+from .user import CustomUser
+
+
+def field_hectares(area: Any) -> float:
+    """Hectares recorded in a Field.area JSON blob, or 0 when missing/invalid."""
+    hectares = (area or {}).get("hectares") if isinstance(area, dict) else None
+    return float(hectares) if isinstance(hectares, (int, float)) else 0.0
+
+
+class DashboardSummary(models.Model):
+    """Materialized per-user dashboard counters, maintained from signals."""
+
+    user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, primary_key=True, related_name="dashboard_summary")
+    active_fields = models.IntegerField(default=0)
+    active_crops = models.IntegerField(default=0)
+    total_hectares = models.FloatField(default=0)
+    unread_notifications = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"DashboardSummary({self.user_id})"
+
+    @classmethod
+    def for_user(cls, user) -> "DashboardSummary":
+        summary = cls.objects.filter(pk=user.pk).first()
+        return summary if summary is not None else cls.rebuild(user.pk)
+
+    @classmethod
+    def rebuild(cls, user_id: int) -> "DashboardSummary":
+        """Recompute every counter for one user from the source tables."""
+        from .field import Field
+        from .notifications import Notification
+
+        user_fields = Field.objects.filter(user_id=user_id, is_active=True)
+        values = {
+            "active_fields": user_fields.count(),
+            "active_crops": count_active_crops(user_id),
+            "total_hectares": sum(field_hectares(area) for area in user_fields.values_list("area", flat=True)),
+            "unread_notifications": Notification.objects.filter(receiver_id=user_id, is_read=False).count(),
+        }
+        summary, _ = cls.objects.update_or_create(user_id=user_id, defaults=values)
+        return summary
+
+    @classmethod
+    def apply_delta(cls, user_id: int, **deltas: float) -> None:
+        """Atomically add deltas to an existing row; missing rows are rebuilt lazily on read."""
+        changes = {name: F(name) + value for name, value in deltas.items() if value}
+        if changes:
+            cls.objects.filter(pk=user_id).update(**changes)
+
+    @classmethod
+    def refresh_active_crops(cls, user_id: int) -> None:
+        if cls.objects.filter(pk=user_id).exists():
+            cls.objects.filter(pk=user_id).update(active_crops=count_active_crops(user_id))
+
+
+def count_active_crops(user_id: int) -> int:
+    # Active fields with a crop assigned and a season that has not been harvested.
+    # A field has at most one open season (lifecycle_one_open_season), so a
+    # plain count over the open seasons needs no DISTINCT.
+    from .field import CropLifecycleDates
+
+    return CropLifecycleDates.objects.filter(
+        field__user_id=user_id, field__is_active=True, field__crop__isnull=False, harvesting_date__isnull=True
+    ).count()
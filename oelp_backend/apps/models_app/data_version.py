@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, Optional, Union
+
+from django.db import models
+from django.db.models import F
+from django.utils import timezone
+
+from .user import CustomUser
+
+# Scopes of per-user data that conditional GETs depend on
+DATA_VERSION_SCOPES = ("fields", "notifications", "plans", "transactions", "practices", "activity", "soil_reports")
+
+
+class UserDataVersion(models.Model):
+    """Per-user change counters, bumped from signals whenever a scope's rows change.
+
+    Conditional GETs read this one row to build ETag/Last-Modified and can
+    answer 304 without touching the tables behind the response.
+    """
+
+    user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, primary_key=True, related_name="data_version")
+    fields_version = models.PositiveBigIntegerField(default=0)
+    fields_changed_at = models.DateTimeField(null=True, blank=True)
+    notifications_version = models.PositiveBigIntegerField(default=0)
+    notifications_changed_at = models.DateTimeField(null=True, blank=True)
+    plans_version = models.PositiveBigIntegerField(default=0)
+    plans_changed_at = models.DateTimeField(null=True, blank=True)
+    transactions_version = models.PositiveBigIntegerField(default=0)
+    transactions_changed_at = models.DateTimeField(null=True, blank=True)
+    practices_version = models.PositiveBigIntegerField(default=0)
+    practices_changed_at = models.DateTimeField(null=True, blank=True)
+    activity_version = models.PositiveBigIntegerField(default=0)
+    activity_changed_at = models.DateTimeField(null=True, blank=True)
+    soil_reports_version = models.PositiveBigIntegerField(default=0)
+    soil_reports_changed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"UserDataVersion({self.user_id})"
+
+    @classmethod
+    def bump(cls, user_ids: Union[int, None, Iterable[Optional[int]]], *scopes: str) -> None:
+        """Advance the given scopes for one or many users in a single UPDATE.
+
+        Rows are only updated here, never created: a user without a row has
+        never been served a conditional response, and creating rows from
+        delete signals would race the user's own cascade delete.
+        """
+        ids = {user_ids} if isinstance(user_ids, int) or user_ids is None else set(user_ids)
+        ids.discard(None)
+        if not ids or not scopes:
+            return
+        now = timezone.now()
+        changes: dict = {}
+        for scope in scopes:
+            changes[f"{scope}_version"] = F(f"{scope}_version") + 1
+            changes[f"{scope}_changed_at"] = now
+        cls.objects.filter(pk__in=ids).update(**changes)
+
+    @classmethod
+    def state(cls, user_id: int, scopes: Iterable[str]) -> tuple[list[int], Optional[datetime]]:
+        """Versions of the given scopes and the latest time any of them changed."""
+        scopes = list(scopes)
+        row = cls.objects.filter(pk=user_id).values_list(*cls._state_columns(scopes)).first()
+        if row is None:
+            cls.objects.get_or_create(user_id=user_id)
+        return cls._split_state(scopes, row)
+
+    @classmethod
+    async def astate(cls, user_id: int, scopes: Iterable[str]) -> tuple[list[int], Optional[datetime]]:
+        scopes = list(scopes)
+        row = await cls.objects.filter(pk=user_id).values_list(*cls._state_columns(scopes)).afirst()
+        if row is None:
+            await cls.objects.aget_or_create(user_id=user_id)
+        return cls._split_state(scopes, row)
+
+    @staticmethod
+    def _state_columns(scopes: list[str]) -> list[str]:
+        return [f"{scope}_version" for scope in scopes] + [f"{scope}_changed_at" for scope in scopes]
+
+    @staticmethod
+    def _split_state(scopes: list[str], row: Optional[tuple]) -> tuple[list[int], Optional[datetime]]:
+        if row is None:
+            row = (0,) * len(scopes) + (None,) * len(scopes)
+        versions = list(row[: len(scopes)])
+        changed = [value for value in row[len(scopes):] if value is not None]
+        return versions, max(changed) if changed else None
@@ -17,11 +17,16 @@ except Exception:  # pragma: no cover - fallback to default
 from .assets_util import asset_upload_to
 from .crop_variety import Crop, CropVariety
 from .farm import Farm
+from .dashboard import field_hectares
+from .geometry import boundary_bounds, measure_boundary
 from .irrigation import IrrigationMethods
-from .soil_report import SoilTexture
+from .soil_report import SoilReport, SoilTexture
 from .user import CustomUser
 
 
+BBOX_FIELDS = ("min_lon", "min_lat", "max_lon", "max_lat")
+
+
 class Device(models.Model):
     name = models.CharField(max_length=100)
     serial_number = models.CharField(max_length=100, unique=True)
@@ -45,24 +50,105 @@ class Field(models.Model):
     image = models.ImageField(upload_to=asset_upload_to, blank=True, null=True, storage=ImageStorage())
     is_active = models.BooleanField(default=True)
     is_locked = models.BooleanField(default=False)
+    # Bounding box of boundary, maintained on save for viewport/point queries
+    min_lon = models.FloatField(null=True, blank=True, editable=False)
+    min_lat = models.FloatField(null=True, blank=True, editable=False)
+    max_lon = models.FloatField(null=True, blank=True, editable=False)
+    max_lat = models.FloatField(null=True, blank=True, editable=False)
+    # Newest soil report, maintained by SoilReport writes (see signals)
+    latest_soil_report = models.ForeignKey(
+        SoilReport, on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name="latest_of_fields"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "min_lon", "max_lon", "min_lat", "max_lat"], name="field_user_bbox_idx"),
+            # Active fields per owner (dashboard, CSV/PDF exports)
+            models.Index(fields=["user", "is_active"], name="field_user_active_idx"),
+            # Per-owner data version: max(updated_at)
+            models.Index(fields=["user", "updated_at"], name="field_user_updated_idx"),
+        ]
+
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.name} ({self.farm.name})"
 
     def save(self, *args, **kwargs):
-        # Skip heavy GIS computations to keep deployment simple on Render
+        # Area/centroid/bbox come from the GeoJSON boundary (NumPy, no PostGIS needed)
+        measured = measure_boundary(self.boundary)
+        if self.area_is_derived(measured, self.boundary, self.min_lon):
+            self.area = measured
+        self.set_bounds(boundary_bounds([self.boundary])[0])
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "boundary" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "area", *BBOX_FIELDS}
+        if update_fields is None and not self._state.adding and not kwargs.get("force_insert"):
+            # Never write back a stale copy of the pointer reports maintain
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields if not f.primary_key and f.name != "latest_soil_report"
+            ]
         super().save(*args, **kwargs)
 
+    @classmethod
+    def refresh_latest_soil_reports(cls, field_ids) -> None:
+        """Point each field at its newest report, one correlated UPDATE for all of them."""
+        newest = SoilReport.objects.filter(field=models.OuterRef("pk")).order_by("-id").values("id")[:1]
+        cls.objects.filter(pk__in=field_ids).update(latest_soil_report=models.Subquery(newest))
+
+    @staticmethod
+    def area_is_derived(measured, boundary, min_lon) -> bool:
+        """Whether ``area`` follows the boundary, rather than being a value entered without one.
+
+        The bbox is only set from a measurable boundary, so it tells whether
+        the stored area was derived.
+        """
+        return measured is not None or bool(boundary) or min_lon is not None
+
+    def set_bounds(self, bounds) -> None:
+        self.min_lon, self.min_lat, self.max_lon, self.max_lat = bounds or (None, None, None, None)
+
 
 class CropLifecycleDates(models.Model):
-    field = models.ForeignKey(Field, on_delete=models.CASCADE)
+    """One growing season of a field. Harvested seasons are kept as the field's history."""
+
+    field = models.ForeignKey(Field, on_delete=models.CASCADE, related_name="seasons")
+    # What was grown and on how much land, as of the season, so history survives field edits
+    crop = models.ForeignKey(Crop, on_delete=models.SET_NULL, null=True, blank=True, related_name="seasons")
+    crop_variety = models.ForeignKey(CropVariety, on_delete=models.SET_NULL, null=True, blank=True, related_name="seasons")
+    area_hectares = models.FloatField(null=True, blank=True)
+    season = models.CharField(max_length=50, blank=True, default="", help_text="Label such as 'Kharif 2025'")
     sowing_date = models.DateField(null=True, blank=True)
     growth_start_date = models.DateField(null=True, blank=True)
     flowering_date = models.DateField(null=True, blank=True)
     harvesting_date = models.DateField(null=True, blank=True)
     yield_amount = models.FloatField(null=True, blank=True, help_text="Total yield for the cycle (tons or units)")
+    created_at = models.DateTimeField(auto_now_add=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True, null=True)
+
+    class Meta:
+        ordering = ("-sowing_date", "-id")
+        indexes = [
+            # A field's timeline, newest season first
+            models.Index(fields=["field", "-sowing_date", "-id"], name="lifecycle_field_timeline_idx"),
+        ]
+        constraints = [
+            # The season still in the ground; harvesting closes it
+            models.UniqueConstraint(fields=["field"], condition=models.Q(harvesting_date__isnull=True), name="lifecycle_one_open_season"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"CropLifecycleDates({self.field_id}, {self.season or self.sowing_date})"
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.field_id:
+            # New seasons start from the field's current crop and area
+            field = self.field
+            self.crop_id = self.crop_id or field.crop_id
+            self.crop_variety_id = self.crop_variety_id or field.crop_variety_id
+            if self.area_hectares is None:
+                self.area_hectares = field_hectares(field.area) or None
+        super().save(*args, **kwargs)
 
 
 class FieldIrrigationMethod(models.Model):
@@ -75,4 +161,12 @@ class FieldIrrigationPractice(models.Model):
     irrigation_method = models.ForeignKey(IrrigationMethods, on_delete=models.CASCADE)
     notes = models.TextField(blank=True, null=True)
     performed_at = models.DateTimeField(default=timezone.now)
+    duration_minutes = models.FloatField(null=True, blank=True)
+    water_volume = models.FloatField(null=True, blank=True, help_text="Water applied, in litres")
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of practices on (performed_at, id)
+            models.Index(fields=["field", "-performed_at", "-id"], name="practice_field_keyset_idx"),
+        ]
 
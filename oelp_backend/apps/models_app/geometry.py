@@ -0,0 +1,215 @@
+"""Geodesic area and centroid of GeoJSON field boundaries, without PostGIS.
+
+Every ring of every boundary in a batch is flattened into one coordinate
+array, so the maths for a whole account runs as a handful of NumPy passes.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+# Mean radius of the WGS84 authalic sphere, in metres
+EARTH_RADIUS_M = 6371007.181
+SQ_METERS_PER_HECTARE = 10_000.0
+SQ_METERS_PER_ACRE = 4046.8564224
+
+
+def _is_sequence(value: Any) -> bool:
+    return isinstance(value, (list, tuple))
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def boundary_polygons(boundary: Any) -> list[list[list[list[float]]]]:
+    """Polygons (lists of [lon, lat] rings, outer ring first) of a GeoJSON geometry or Feature.
+
+    Polygons that are not lists are dropped, so malformed boundaries are
+    simply unmeasurable.
+    """
+    if not isinstance(boundary, dict):
+        return []
+    if boundary.get("type") == "Feature":
+        return boundary_polygons(boundary.get("geometry"))
+    coordinates = boundary.get("coordinates")
+    if not _is_sequence(coordinates):
+        return []
+    if boundary.get("type") == "Polygon":
+        return [coordinates]
+    if boundary.get("type") == "MultiPolygon":
+        return [polygon for polygon in coordinates if _is_sequence(polygon)]
+    return []
+
+
+def boundary_error(boundary: Any) -> Optional[str]:
+    """Why a boundary is not a well-formed Polygon or MultiPolygon (geometry or Feature); None if it is.
+
+    Every ring must be a closed list of at least four positions made of
+    numbers, longitude and latitude first.
+    """
+    if isinstance(boundary, dict) and boundary.get("type") == "Feature":
+        return boundary_error(boundary.get("geometry"))
+    if not isinstance(boundary, dict) or boundary.get("type") not in ("Polygon", "MultiPolygon"):
+        return "Expected a Polygon or MultiPolygon geometry."
+    coordinates = boundary.get("coordinates")
+    if not _is_sequence(coordinates) or not coordinates:
+        return "Expected a non-empty coordinates list."
+    for polygon in [coordinates] if boundary["type"] == "Polygon" else coordinates:
+        if not _is_sequence(polygon) or not polygon:
+            return "Each polygon must be a non-empty list of rings."
+        for ring in polygon:
+            if not _is_sequence(ring) or len(ring) < 4:
+                return "Each ring must be a list of at least four positions."
+            for position in ring:
+                if not _is_sequence(position) or len(position) < 2 or not all(_is_number(value) for value in position):
+                    return "Each position must be a [longitude, latitude] pair of numbers."
+            if list(ring[0]) != list(ring[-1]):
+                return "Each ring must be closed: its first and last positions must be equal."
+    return None
+
+
+def _flatten(boundaries: Iterable[Any]):
+    """Flatten boundaries into coordinate, ring and owner arrays.
+
+    Closing vertices are dropped; rings with fewer than three distinct
+    vertices, rings that are not lists and malformed coordinates are
+    skipped.
+    """
+    coords: list = []
+    ring_lengths: list[int] = []
+    ring_owner: list[int] = []
+    ring_sign: list[float] = []
+    for owner, boundary in enumerate(boundaries):
+        for polygon in boundary_polygons(boundary):
+            for ring_index, ring in enumerate(polygon):
+                if not _is_sequence(ring):
+                    continue
+                try:
+                    points = [(float(pt[0]), float(pt[1])) for pt in ring]
+                except (TypeError, ValueError, IndexError):
+                    continue
+                if len(points) > 1 and points[0] == points[-1]:
+                    points.pop()
+                if len(points) < 3:
+                    continue
+                coords.extend(points)
+                ring_lengths.append(len(points))
+                ring_owner.append(owner)
+                # Holes subtract from the polygon they belong to
+                ring_sign.append(1.0 if ring_index == 0 else -1.0)
+    return (
+        np.asarray(coords, dtype=np.float64).reshape(-1, 2),
+        np.asarray(ring_lengths, dtype=np.int64),
+        np.asarray(ring_owner, dtype=np.int64),
+        np.asarray(ring_sign, dtype=np.float64),
+    )
+
+
+def measure_boundaries(boundaries: Iterable[Any]) -> list[Optional[dict]]:
+    """Area (m², ha, ac) and centroid for each boundary; None where there is no usable polygon."""
+    boundaries = list(boundaries)
+    count = len(boundaries)
+    coords, ring_lengths, ring_owner, ring_sign = _flatten(boundaries)
+    if not len(ring_lengths):
+        return [None] * count
+
+    # Index of the next vertex of the same ring for every vertex
+    ring_id = np.repeat(np.arange(len(ring_lengths)), ring_lengths)
+    ring_start = np.repeat(np.cumsum(ring_lengths) - ring_lengths, ring_lengths)
+    lengths = ring_lengths[ring_id]
+    offset = np.arange(len(coords)) - ring_start
+    nxt = ring_start + (offset + 1) % lengths
+    prv = ring_start + (offset - 1) % lengths
+
+    lon, lat = coords[:, 0], coords[:, 1]
+    lam, phi = np.radians(lon), np.radians(lat)
+
+    # Spherical ring area: R²/2 * Σ (λ[i+1] - λ[i-1]) * sin φ[i]
+    terms = (lam[nxt] - lam[prv]) * np.sin(phi)
+    ring_area = np.abs(np.bincount(ring_id, weights=terms, minlength=len(ring_lengths))) * EARTH_RADIUS_M ** 2 / 2.0
+    weights = ring_sign * ring_area
+    area = np.bincount(ring_owner, weights=weights, minlength=count)
+
+    # Planar (lon/lat) ring centroids, combined per boundary by geodesic ring area
+    cross = lon * lat[nxt] - lon[nxt] * lat
+    signed = np.bincount(ring_id, weights=cross, minlength=len(ring_lengths)) / 2.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ring_cx = np.bincount(ring_id, weights=(lon + lon[nxt]) * cross, minlength=len(ring_lengths)) / (6.0 * signed)
+        ring_cy = np.bincount(ring_id, weights=(lat + lat[nxt]) * cross, minlength=len(ring_lengths)) / (6.0 * signed)
+        # Degenerate rings have ~zero weight; keep them from poisoning the sums
+        ring_cx, ring_cy = np.nan_to_num(ring_cx, posinf=0.0, neginf=0.0), np.nan_to_num(ring_cy, posinf=0.0, neginf=0.0)
+        cx = np.bincount(ring_owner, weights=weights * ring_cx, minlength=count) / area
+        cy = np.bincount(ring_owner, weights=weights * ring_cy, minlength=count) / area
+
+    results: list[Optional[dict]] = []
+    for i in range(count):
+        if not area[i] > 0:
+            results.append(None)
+            continue
+        centroid = [round(float(cx[i]), 7), round(float(cy[i]), 7)] if np.isfinite(cx[i]) and np.isfinite(cy[i]) else None
+        results.append(
+            {
+                "square_meters": round(float(area[i]), 2),
+                "hectares": round(float(area[i]) / SQ_METERS_PER_HECTARE, 4),
+                "acres": round(float(area[i]) / SQ_METERS_PER_ACRE, 4),
+                "centroid": centroid,
+            }
+        )
+    return results
+
+
+def measure_boundary(boundary: Any) -> Optional[dict]:
+    return measure_boundaries([boundary])[0]
+
+
+def boundary_bounds(boundaries: Iterable[Any]) -> list[Optional[tuple[float, float, float, float]]]:
+    """(min_lon, min_lat, max_lon, max_lat) for each boundary; None where there is no usable polygon."""
+    boundaries = list(boundaries)
+    results: list[Optional[tuple[float, float, float, float]]] = [None] * len(boundaries)
+    coords, ring_lengths, ring_owner, _ = _flatten(boundaries)
+    if not len(ring_lengths):
+        return results
+    # Vertices are laid out owner by owner, so each owner is one contiguous segment
+    vertex_owner = np.repeat(ring_owner, ring_lengths)
+    owners, starts = np.unique(vertex_owner, return_index=True)
+    mins = np.minimum.reduceat(coords, starts, axis=0)
+    maxs = np.maximum.reduceat(coords, starts, axis=0)
+    for owner, low, high in zip(owners, mins, maxs):
+        results[owner] = (float(low[0]), float(low[1]), float(high[0]), float(high[1]))
+    return results
+
+
+def boundary_contains(boundary: Any, lon: float, lat: float) -> bool:
+    """Even-odd point-in-polygon test over every ring (holes included) of a boundary."""
+    for polygon in boundary_polygons(boundary):
+        crossings = 0
+        for ring in polygon:
+            if not _is_sequence(ring):
+                continue
+            try:
+                pts = np.asarray(ring, dtype=np.float64)[:, :2]
+            except (TypeError, ValueError, IndexError):
+                continue
+            if len(pts) < 3:
+                continue
+            x1, y1 = pts[:, 0], pts[:, 1]
+            x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+            straddles = (y1 > lat) != (y2 > lat)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                x_cross = (x2 - x1) * (lat - y1) / (y2 - y1) + x1
+            crossings += int(np.count_nonzero(straddles & (lon < x_cross)))
+        if crossings % 2:
+            return True
+    return False
+
+
+def haversine_m(lon: float, lat: float, lons: np.ndarray, lats: np.ndarray) -> np.ndarray:
+    """Great-circle distance in metres from one point to arrays of points."""
+    lam1, phi1 = np.radians(lon), np.radians(lat)
+    lam2, phi2 = np.radians(lons), np.radians(lats)
+    a = np.sin((phi2 - phi1) / 2.0) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin((lam2 - lam1) / 2.0) ** 2
+    return 2.0 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Optional, Union
+
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Sum, Value
+from django.db.models.functions import Coalesce, Trunc
+from django.utils import timezone
+
+from .field import Field, FieldIrrigationPractice
+from .irrigation import IrrigationMethods
+from .user import CustomUser
+
+
+class IrrigationRollup(models.Model):
+    """Irrigation events per field and method, summed per day, ISO week and month.
+
+    Maintained incrementally from FieldIrrigationPractice writes (see
+    signals), so range queries read one row per period instead of every
+    event. Weekly and monthly rows outlive the raw events, which are
+    compacted away after ``IRRIGATION_RAW_RETENTION_DAYS``.
+    """
+
+    class Granularity(models.TextChoices):
+        DAY = "day", "Day"
+        WEEK = "week", "Week"
+        MONTH = "month", "Month"
+
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, null=True, related_name="+")
+    field = models.ForeignKey(Field, on_delete=models.CASCADE, related_name="irrigation_rollups")
+    irrigation_method = models.ForeignKey(IrrigationMethods, on_delete=models.CASCADE, related_name="+")
+    granularity = models.CharField(max_length=8, choices=Granularity.choices)
+    # Local date the period starts on; weeks start on Monday
+    period_start = models.DateField()
+    events = models.IntegerField(default=0)
+    duration_minutes = models.FloatField(default=0)
+    water_volume = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["field", "irrigation_method", "granularity", "period_start"], name="irrigation_rollup_bucket_uniq"
+            ),
+        ]
+        indexes = [
+            # Range scans of one owner's series, and of one field's
+            models.Index(fields=["user", "granularity", "period_start"], name="irrigation_rollup_user_idx"),
+            models.Index(fields=["field", "granularity", "period_start"], name="irrigation_rollup_field_idx"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"IrrigationRollup({self.field_id}, {self.granularity} {self.period_start})"
+
+    @classmethod
+    def period_starts(cls, moment: Union[datetime, date]) -> dict[str, date]:
+        """Start of the day, week and month containing ``moment`` (a local date, or a datetime taken in local time)."""
+        day = moment
+        if isinstance(moment, datetime):
+            day = timezone.localdate(moment) if timezone.is_aware(moment) else moment.date()
+        return {
+            cls.Granularity.DAY: day,
+            cls.Granularity.WEEK: day - timedelta(days=day.weekday()),
+            cls.Granularity.MONTH: day.replace(day=1),
+        }
+
+    @classmethod
+    def apply_delta(
+        cls,
+        user_id: Optional[int],
+        field_id: int,
+        irrigation_method_id: int,
+        moment: datetime,
+        events: int,
+        duration_minutes: float = 0,
+        water_volume: float = 0,
+    ) -> None:
+        """Add one event's contribution (or, with negative values, remove it) to its three buckets."""
+        changes = {
+            "events": F("events") + events,
+            "duration_minutes": F("duration_minutes") + duration_minutes,
+            "water_volume": F("water_volume") + water_volume,
+        }
+        for granularity, period_start in cls.period_starts(moment).items():
+            bucket = cls.objects.filter(
+                field_id=field_id, irrigation_method_id=irrigation_method_id, granularity=granularity, period_start=period_start
+            )
+            if bucket.update(**changes):
+                if events < 0:
+                    bucket.filter(events__lte=0).delete()
+                continue
+            if events <= 0:
+                continue
+            try:
+                with transaction.atomic():
+                    cls.objects.create(
+                        user_id=user_id,
+                        field_id=field_id,
+                        irrigation_method_id=irrigation_method_id,
+                        granularity=granularity,
+                        period_start=period_start,
+                        events=events,
+                        duration_minutes=duration_minutes,
+                        water_volume=water_volume,
+                    )
+            except IntegrityError:
+                # A concurrent write created the bucket first
+                bucket.update(**changes)
+
+    @classmethod
+    def raw_horizon(cls, raw_retention_days: Optional[int] = None) -> date:
+        """First local date from which every raw event is still retained.
+
+        Buckets starting earlier may hold the totals of compacted events,
+        which no longer exist to recompute them from.
+        """
+        raw_retention_days = settings.IRRIGATION_RAW_RETENTION_DAYS if raw_retention_days is None else raw_retention_days
+        return timezone.localdate(timezone.now() - timedelta(days=raw_retention_days)) + timedelta(days=1)
+
+    @classmethod
+    def rebuild(cls, field_ids: Optional[Iterable[int]] = None, since: Optional[date] = None, batch_size: int = 1000) -> int:
+        """Recompute the rollups of some fields (or all) from their raw events; returns the rows written.
+
+        Only buckets starting on or after ``since`` (by default the
+        ``raw_horizon``) are replaced, so weekly and monthly totals of
+        compacted history are kept.
+        """
+        since = cls.raw_horizon() if since is None else since
+        practices = FieldIrrigationPractice.objects.filter(
+            performed_at__gte=timezone.make_aware(datetime.combine(since, time.min))
+        )
+        rollups = cls.objects.filter(period_start__gte=since)
+        if field_ids is not None:
+            field_ids = list(field_ids)
+            practices = practices.filter(field_id__in=field_ids)
+            rollups = rollups.filter(field_id__in=field_ids)
+        rows = []
+        for granularity in cls.Granularity.values:
+            buckets = (
+                practices.annotate(period=Trunc("performed_at", granularity, output_field=models.DateField()))
+                # A week or month starting before ``since`` also covers events that may be gone
+                .filter(period__gte=since)
+                .values("field_id", "field__user_id", "irrigation_method_id", "period")
+                .annotate(
+                    count=Count("id"),
+                    minutes=Sum(Coalesce("duration_minutes", Value(0.0))),
+                    volume=Sum(Coalesce("water_volume", Value(0.0))),
+                )
+                .order_by()
+            )
+            rows.extend(
+                cls(
+                    user_id=bucket["field__user_id"],
+                    field_id=bucket["field_id"],
+                    irrigation_method_id=bucket["irrigation_method_id"],
+                    granularity=granularity,
+                    period_start=bucket["period"],
+                    events=bucket["count"],
+                    duration_minutes=bucket["minutes"],
+                    water_volume=bucket["volume"],
+                )
+                for bucket in buckets
+            )
+        with transaction.atomic():
+            rollups.delete()
+            cls.objects.bulk_create(rows, batch_size=batch_size)
+        return len(rows)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.models_app.dashboard import DashboardSummary
+from apps.models_app.data_version import UserDataVersion
+from apps.models_app.field import BBOX_FIELDS, Field
+from apps.models_app.geometry import boundary_bounds, measure_boundaries
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Field.area (hectares, acres, centroid) and bounding box from GeoJSON boundaries in vectorized batches, "
+        "storing what Field.save would: fields with unmeasurable boundaries get no area or bbox."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="Only recompute fields owned by this user id")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        queryset = Field.objects.order_by("pk")
+        if options["user"]:
+            queryset = queryset.filter(user_id=options["user"])
+        batch_size = options["batch_size"]
+
+        updated = 0
+        users: set[int] = set()
+        last_pk = 0
+        while True:
+            rows = list(queryset.filter(pk__gt=last_pk).values_list("pk", "user_id", "boundary", "min_lon")[:batch_size])
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+            boundaries = [row[2] for row in rows]
+            changed = []
+            for (pk, _, boundary, min_lon), measured, bounds in zip(rows, measure_boundaries(boundaries), boundary_bounds(boundaries)):
+                # Same rule as Field.save: unmeasurable boundaries clear a derived area and bbox
+                if not Field.area_is_derived(measured, boundary, min_lon):
+                    continue
+                field = Field(pk=pk, area=measured)
+                field.set_bounds(bounds)
+                changed.append(field)
+            with transaction.atomic():
+                Field.objects.bulk_update(changed, ["area", *BBOX_FIELDS], batch_size=1000)
+            updated += len(changed)
+            users.update(row[1] for row in rows if row[1] is not None)
+
+        # bulk_update skips signals; bring the dashboard summaries back in line
+        for user_id in users:
+            DashboardSummary.rebuild(user_id)
+        UserDataVersion.bump(users, "fields")
+        self.stdout.write(self.style.SUCCESS(f"Updated area for {updated} fields across {len(users)} users"))
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import http.client
+import os
+import secrets
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.models_app.token import UserAuthToken
+from apps.models_app.user import CustomUser
+
+# (label, WSGI path, ASGI path, POST body) compared by default: the sync DRF
+# views under gunicorn sync workers against their async variants under uvicorn
+DEFAULT_SCENARIOS = [
+    ("dashboard", "/api/dashboard/", "/api/async/dashboard/", None),
+    ("notifications", "/api/notifications/", "/api/async/notifications/", None),
+    ("unread_count", "/api/notifications/unread_count/", "/api/async/notifications/unread_count/", None),
+]
+
+# Order creation goes out to the payment gateway, so it only runs against the
+# in-memory fake; FAKE_GATEWAY_LATENCY_MS stands in for the upstream round trip
+ORDER_SCENARIO = ("order", "/api/subscriptions/razorpay/order/", "/api/async/subscriptions/razorpay/order/", b'{"amount": 499, "currency": "INR"}')
+
+
+class Command(BaseCommand):
+    help = (
+        "Start the app under gunicorn (WSGI, sync workers) and uvicorn (ASGI), fire concurrent "
+        "requests at each, and report throughput and latency. Uses the configured database; a "
+        "throwaway benchmark user is created and removed. With PAYMENT_GATEWAY=fake the order "
+        "creation flow is benchmarked too."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=2, help="Worker processes per server")
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument("--requests", type=int, default=1000, help="Requests per scenario")
+        parser.add_argument("--port", type=int, default=8701, help="First of two ports to bind")
+        parser.add_argument("--host-header", default=None, help="Host header to send (default: first ALLOWED_HOSTS entry)")
+        parser.add_argument("--scenario", action="append", help="Only run these scenario labels")
+
+    def handle(self, *args, **options):
+        available = DEFAULT_SCENARIOS + ([ORDER_SCENARIO] if settings.PAYMENT_GATEWAY == "fake" else [])
+        scenarios = [s for s in available if not options["scenario"] or s[0] in options["scenario"]]
+        if not scenarios:
+            raise CommandError("No matching scenarios")
+        host = options["host_header"] or next((h for h in settings.ALLOWED_HOSTS if h not in ("*", "")), "localhost").lstrip(".")
+        user = CustomUser.objects.create_user(username=f"bench-{secrets.token_hex(4)}", password=None)
+        token = secrets.token_urlsafe(48)
+        UserAuthToken.objects.create(user=user, access_token=token)
+        headers = {"Host": host, "Authorization": f"Token {token}", "Content-Type": "application/json"}
+
+        servers = {
+            "wsgi": [sys.executable, "-m", "gunicorn", "oelp_backend.wsgi:application", "--workers", str(options["workers"]),
+                     "--worker-class", "sync", "--bind", f"127.0.0.1:{options['port']}", "--log-level", "warning"],
+            "asgi": [sys.executable, "-m", "uvicorn", "oelp_backend.asgi:application", "--workers", str(options["workers"]),
+                     "--port", str(options["port"] + 1), "--log-level", "warning", "--no-access-log"],
+        }
+        ports = {"wsgi": options["port"], "asgi": options["port"] + 1}
+        results = []
+        try:
+            for kind, command in servers.items():
+                process = subprocess.Popen(command, cwd=Path(settings.BASE_DIR), env=os.environ.copy())
+                try:
+                    self.wait_ready(ports[kind], headers)
+                    for label, sync_path, async_path, body in scenarios:
+                        path = sync_path if kind == "wsgi" else async_path
+                        self.run_load(ports[kind], path, headers, options["concurrency"], min(50, options["requests"]), body)  # warm up
+                        results.append((label, kind, path, *self.run_load(ports[kind], path, headers, options["concurrency"], options["requests"], body)))
+                finally:
+                    process.terminate()
+                    process.wait(timeout=30)
+        finally:
+            user.delete()
+
+        self.stdout.write(f"{'scenario':<15}{'server':<7}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}  path")
+        for label, kind, path, rps, p50, p95, p99, errors in results:
+            self.stdout.write(f"{label:<15}{kind:<7}{rps:>9.1f}{p50:>9.1f}{p95:>9.1f}{p99:>9.1f}{errors:>8}  {path}")
+
+    @staticmethod
+    def wait_ready(port: int, headers: dict, timeout: float = 30.0) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+                connection.request("GET", "/api/", headers=headers)
+                if connection.getresponse().status == 200:
+                    return
+            except OSError:
+                pass
+            time.sleep(0.2)
+        raise CommandError(f"Server on port {port} did not become ready")
+
+    @staticmethod
+    def run_load(port: int, path: str, headers: dict, concurrency: int, total: int, body: Optional[bytes] = None):
+        per_client = [total // concurrency + (1 if i < total % concurrency else 0) for i in range(concurrency)]
+
+        def client(count: int):
+            # One keep-alive connection per simulated client
+            latencies, errors = [], 0
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+            for _ in range(count):
+                started = time.perf_counter()
+                try:
+                    connection.request("POST" if body else "GET", path, body=body, headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                    if response.status != 200:
+                        errors += 1
+                except OSError:
+                    errors += 1
+                    connection.close()
+                    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+                latencies.append((time.perf_counter() - started) * 1000)
+            connection.close()
+            return latencies, errors
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(client, [n for n in per_client if n]))
+        elapsed = time.perf_counter() - started
+        latencies = sorted(latency for batch, _ in outcomes for latency in batch)
+        errors = sum(count for _, count in outcomes)
+        quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        return len(latencies) / elapsed, quantiles[49], quantiles[94], quantiles[98], errors
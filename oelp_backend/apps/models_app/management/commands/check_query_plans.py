@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import re
+import secrets
+from datetime import timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from apps.models_app.crop_variety import Crop
+from apps.models_app.farm import Farm
+from apps.models_app.field import CropLifecycleDates, Field, FieldIrrigationPractice
+from apps.models_app.irrigation import IrrigationMethods
+from apps.models_app.models import UserActivity
+from apps.models_app.notifications import Notification
+from apps.models_app.plan import Plan
+from apps.models_app.soil_report import SoilReport, SoilTexture
+from apps.models_app.token import UserAuthToken
+from apps.models_app.user import CustomUser
+from apps.models_app.user_plan import Transaction, UserPlan
+
+# (path, query budget including the auth lookup, tables that must be read through an index).
+# Conditional endpoints spend one more query reading the user's data versions.
+ENDPOINT_BUDGETS = [
+    ("/api/dashboard/", 6, ["models_app_dashboardsummary", "models_app_userplan", "models_app_useractivity", "models_app_userdataversion"]),
+    ("/api/fields/", 4, ["models_app_field", "models_app_userdataversion"]),
+    ("/api/notifications/?pagination=cursor", 3, ["models_app_notification", "models_app_userdataversion"]),
+    ("/api/notifications/unread_count/", 3, ["models_app_notification", "models_app_userdataversion"]),
+    ("/api/activity/?pagination=cursor", 2, ["models_app_useractivity"]),
+    ("/api/irrigation-practices/?pagination=cursor", 2, ["models_app_field"]),
+    ("/api/irrigation-practices/series/?granularity=week", 3, ["models_app_irrigationrollup", "models_app_userdataversion"]),
+    ("/api/crop-seasons/", 4, ["models_app_croplifecycledates", "models_app_field", "models_app_userdataversion"]),
+    ("/api/crop-seasons/stats/", 4, ["models_app_croplifecycledates", "models_app_field", "models_app_userdataversion"]),
+    ("/api/soil-reports/", 3, ["models_app_soilreport", "models_app_field"]),
+    ("/api/soil-reports/latest/", 4, ["models_app_soilreport", "models_app_field", "models_app_userdataversion"]),
+    ("/api/transactions/?pagination=cursor", 3, ["models_app_transaction", "models_app_userdataversion"]),
+    ("/api/subscriptions/user/", 3, ["models_app_userplan"]),
+]
+
+# Every authenticated request resolves its token through this table
+ALWAYS_INDEXED_TABLES = ["models_app_userauthtoken"]
+
+FIXTURE_ROWS = 5
+
+
+class Command(BaseCommand):
+    help = (
+        "Hit the per-user API endpoints against the configured database and fail if any exceeds "
+        "its query budget (N+1 regressions) or reads an owner-scoped table with a full scan. "
+        "Fixture rows are created inside a transaction that is always rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--explain", action="store_true", help="Print the plan of every checked query")
+
+    def handle(self, *args, **options):
+        from rest_framework.test import APIClient
+
+        from apps.api.token_cache import token_cache
+
+        failures: list[str] = []
+        with transaction.atomic(), override_settings(ALLOWED_HOSTS=["*"]):
+            token = self.create_fixture()
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+            for path, budget, indexed_tables in ENDPOINT_BUDGETS:
+                client.get(path)  # warm lazily built rows (e.g. the dashboard summary)
+                token_cache.clear()
+                with CaptureQueriesContext(connection) as captured:
+                    response = client.get(path)
+                if response.status_code != 200:
+                    failures.append(f"{path}: HTTP {response.status_code}")
+                    continue
+                count = len(captured.captured_queries)
+                status = "ok"
+                if count > budget:
+                    failures.append(f"{path}: {count} queries (budget {budget})")
+                    status = "OVER BUDGET"
+                for sql in (q["sql"] for q in captured.captured_queries):
+                    plan = self.explain(sql)
+                    if plan is None:
+                        continue
+                    if options["explain"]:
+                        self.stdout.write(f"  {sql}\n    " + "\n    ".join(plan))
+                    for table in self.full_scans(plan, indexed_tables + ALWAYS_INDEXED_TABLES):
+                        failures.append(f"{path}: full scan of {table}")
+                        status = "FULL SCAN"
+                self.stdout.write(f"{path}: {count}/{budget} queries, {status}")
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError("Query plan regressions:\n" + "\n".join(failures))
+        self.stdout.write(self.style.SUCCESS("All endpoints within query budget and index-backed"))
+
+    def create_fixture(self) -> str:
+        suffix = secrets.token_hex(4)
+        user = CustomUser.objects.create_user(username=f"qp-{suffix}", password=None)
+        token = secrets.token_urlsafe(48)
+        UserAuthToken.objects.create(user=user, access_token=token)
+        farm = Farm.objects.create(name="qp", user=user)
+        crop = Crop.objects.create(name=f"qp-{suffix}")
+        soil = SoilTexture.objects.create(name="qp", icon="https://example.com/qp.png")
+        method = IrrigationMethods.objects.create(name="qp")
+        plan = Plan.objects.create(name=f"qp-{suffix}", price=1, duration=30)
+        today = timezone.now()
+        UserPlan.objects.create(user=user, plan=plan, start_date=today.date(), end_date=(today + timedelta(days=30)).date(), expire_at=today + timedelta(days=30))
+        # Several rows per table so an N+1 shows up as a budget overrun
+        for i in range(FIXTURE_ROWS):
+            field = Field.objects.create(name=f"qp-{i}", farm=farm, user=user, crop=crop, soil_type=soil, area={"hectares": 1})
+            CropLifecycleDates.objects.create(field=field, sowing_date=today.date() - timedelta(days=120), harvesting_date=today.date(), yield_amount=3)
+            CropLifecycleDates.objects.create(field=field)
+            FieldIrrigationPractice.objects.create(field=field, irrigation_method=method)
+            for _ in range(2):
+                SoilReport.objects.create(field=field, ph=7, ec=0.5, soil_type=soil)
+            Notification.objects.create(receiver=user, sender=user, message="qp")
+            Transaction.objects.create(user=user, plan=plan, amount=1)
+        field_type = ContentType.objects.get_for_model(Field)
+        UserActivity.objects.bulk_create(
+            [UserActivity(user=user, action="create", content_type=field_type, object_id=i, description="qp") for i in range(FIXTURE_ROWS)]
+        )
+        return token
+
+    def explain(self, sql: str):
+        if not sql.lstrip().upper().startswith("SELECT"):
+            return None
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                # Tiny fixture tables would otherwise always be seq-scanned; with
+                # seqscan disabled a Seq Scan in the plan means no index applies
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                cursor.execute(f"EXPLAIN {sql}")
+                plan = [row[0] for row in cursor.fetchall()]
+                cursor.execute("SET LOCAL enable_seqscan = on")
+                return plan
+            if connection.vendor == "sqlite":
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                return [row[-1] for row in cursor.fetchall()]
+        return None
+
+    @staticmethod
+    def full_scans(plan: list[str], tables: list[str]) -> list[str]:
+        scans = []
+        for line in plan:
+            match = re.search(r"Seq Scan on (\w+)", line) or re.search(r"^SCAN (\w+)\b(?! USING)", line.strip())
+            if match and match.group(1) in tables:
+                scans.append(match.group(1))
+        return scans
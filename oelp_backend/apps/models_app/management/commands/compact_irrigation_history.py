@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.api.irrigation_series import compact_irrigation_history
+from apps.models_app.irrigation_rollup import IrrigationRollup
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete irrigation events and daily rollups past their retention (normally done daily by Celery beat). "
+        "--rebuild first recomputes the rollups still covered by raw events, e.g. after a bulk import."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--raw-retention-days", type=int, default=settings.IRRIGATION_RAW_RETENTION_DAYS)
+        parser.add_argument("--daily-retention-days", type=int, default=settings.IRRIGATION_DAILY_ROLLUP_RETENTION_DAYS)
+        parser.add_argument("--batch-size", type=int, default=settings.IRRIGATION_COMPACTION_BATCH_SIZE)
+        parser.add_argument(
+            "--rebuild", action="store_true", help="Recompute rollups from raw events first; periods before the raw retention horizon are kept"
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            # Earlier runs may have compacted with either retention; only rebuild what both kept
+            horizon = IrrigationRollup.raw_horizon(min(options["raw_retention_days"], settings.IRRIGATION_RAW_RETENTION_DAYS))
+            written = IrrigationRollup.rebuild(since=horizon)
+            self.stdout.write(f"Rebuilt {written} irrigation rollups from {horizon}")
+        removed = compact_irrigation_history(options["raw_retention_days"], options["daily_retention_days"], options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {removed['raw_events']} irrigation events and {removed['daily_rollups']} daily rollups"
+        ))
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.api.payment_events import process_pending_events
+
+
+class Command(BaseCommand):
+    help = "Apply pending payment webhook events from the inbox (normally done by the Celery worker)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=settings.PAYMENT_EVENTS_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        handled = process_pending_events(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Handled {handled} payment events"))
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.15 on 2026-10-18 10:34
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def backfill_token_digests(apps, schema_editor):
+    UserAuthToken = apps.get_model("models_app", "UserAuthToken")
+    for token in UserAuthToken.objects.filter(token_digest__isnull=True).only("pk", "access_token").iterator():
+        token.token_digest = hashlib.sha256(token.access_token.encode("utf-8")).hexdigest()
+        token.save(update_fields=["token_digest"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models_app', '0003_useractivity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userauthtoken',
+            name='token_digest',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True),
+        ),
+        migrations.RunPython(backfill_token_digests, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.15 on 2026-10-18 10:36
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models_app', '0004_userauthtoken_token_digest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardSummary',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='dashboard_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('active_fields', models.IntegerField(default=0)),
+                ('active_crops', models.IntegerField(default=0)),
+                ('total_hectares', models.FloatField(default=0)),
+                ('unread_notifications', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
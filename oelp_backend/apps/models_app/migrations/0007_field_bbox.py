@@ -0,0 +1,89 @@
+# Generated by Django 4.2.15 on 2026-10-18 10:41
+
+from django.db import migrations, models
+
+
+def boundary_bounds(boundary):
+    """(min_lon, min_lat, max_lon, max_lat) of a GeoJSON boundary, or None; frozen copy of geometry.boundary_bounds."""
+    if isinstance(boundary, dict) and boundary.get("type") == "Feature":
+        return boundary_bounds(boundary.get("geometry"))
+    if not isinstance(boundary, dict) or not isinstance(boundary.get("coordinates"), (list, tuple)):
+        return None
+    if boundary.get("type") == "Polygon":
+        polygons = [boundary["coordinates"]]
+    elif boundary.get("type") == "MultiPolygon":
+        polygons = boundary["coordinates"]
+    else:
+        return None
+    lons, lats = [], []
+    for polygon in polygons:
+        if not isinstance(polygon, (list, tuple)):
+            continue
+        for ring in polygon:
+            if not isinstance(ring, (list, tuple)):
+                continue
+            try:
+                points = [(float(pt[0]), float(pt[1])) for pt in ring]
+            except (TypeError, ValueError, IndexError):
+                continue
+            if len(points) > 1 and points[0] == points[-1]:
+                points.pop()
+            if len(points) < 3:
+                continue
+            lons.extend(lon for lon, _ in points)
+            lats.extend(lat for _, lat in points)
+    if not lons:
+        return None
+    return min(lons), min(lats), max(lons), max(lats)
+
+
+def backfill_field_bounds(apps, schema_editor):
+    Field = apps.get_model("models_app", "Field")
+    last_pk = 0
+    while True:
+        rows = list(Field.objects.filter(pk__gt=last_pk, boundary__isnull=False).order_by("pk").values_list("pk", "boundary")[:2000])
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+        changed = []
+        for pk, boundary in rows:
+            bounds = boundary_bounds(boundary)
+            if bounds is not None:
+                min_lon, min_lat, max_lon, max_lat = bounds
+                changed.append(Field(pk=pk, min_lon=min_lon, min_lat=min_lat, max_lon=max_lon, max_lat=max_lat))
+        Field.objects.bulk_update(changed, ["min_lon", "min_lat", "max_lon", "max_lat"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models_app', '0006_reportjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='field',
+            name='max_lat',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='field',
+            name='max_lon',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='field',
+            name='min_lat',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='field',
+            name='min_lon',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='field',
+            index=models.Index(fields=['user', 'min_lon', 'max_lon', 'min_lat', 'max_lat'], name='field_user_bbox_idx'),
+        ),
+        migrations.RunPython(backfill_field_bounds, migrations.RunPython.noop),
+    ]
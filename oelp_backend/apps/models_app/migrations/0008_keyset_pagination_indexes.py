@@ -0,0 +1,29 @@
+# Generated by Django 4.2.15 on 2026-10-18 10:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models_app', '0007_field_bbox'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fieldirrigationpractice',
+            index=models.Index(fields=['field', '-performed_at', '-id'], name='practice_field_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['receiver', '-created_at', '-id'], name='notif_receiver_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='txn_user_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useractivity',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='activity_user_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.15 on 2026-10-18 10:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models_app', '0008_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='field',
+            index=models.Index(fields=['user', 'is_active'], name='field_user_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='field',
+            index=models.Index(fields=['user', 'updated_at'], name='field_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['receiver'], name='notif_receiver_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userplan',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user'], name='userplan_user_active_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.15 on 2026-10-18 10:49
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models_app', '0009_owner_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserDataVersion',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='data_version', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('fields_version', models.PositiveBigIntegerField(default=0)),
+                ('fields_changed_at', models.DateTimeField(blank=True, null=True)),
+                ('notifications_version', models.PositiveBigIntegerField(default=0)),
+                ('notifications_changed_at', models.DateTimeField(blank=True, null=True)),
+                ('plans_version', models.PositiveBigIntegerField(default=0)),
+                ('plans_changed_at', models.DateTimeField(blank=True, null=True)),
+                ('transactions_version', models.PositiveBigIntegerField(default=0)),
+                ('transactions_changed_at', models.DateTimeField(blank=True, null=True)),
+                ('practices_version', models.PositiveBigIntegerField(default=0)),
+                ('practices_changed_at', models.DateTimeField(blank=True, null=True)),
+                ('activity_version', models.PositiveBigIntegerField(default=0)),
+                ('activity_changed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
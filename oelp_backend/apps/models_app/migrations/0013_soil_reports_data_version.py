@@ -0,0 +1,23 @@
+# Generated by Django 4.2.15 on 2026-10-18 11:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models_app', '0012_payment_webhook_event'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userdataversion',
+            name='soil_reports_changed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='userdataversion',
+            name='soil_reports_version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.15 on 2026-10-18 11:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models_app', '0013_soil_reports_data_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NutrientRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nutrient', models.CharField(choices=[('ph', 'ph'), ('ec', 'ec'), ('nitrogen', 'nitrogen'), ('phosphorous', 'phosphorous'), ('potassium', 'potassium'), ('boron', 'boron'), ('copper', 'copper'), ('iron', 'iron'), ('zinc', 'zinc'), ('manganese', 'manganese')], max_length=16)),
+                ('direction', models.CharField(choices=[('raise', 'Raise'), ('lower', 'Lower')], default='raise', max_length=8)),
+                ('threshold', models.FloatField()),
+                ('target', models.FloatField()),
+                ('product', models.CharField(max_length=100)),
+                ('base_rate', models.FloatField(default=0)),
+                ('rate_per_unit', models.FloatField(default=0)),
+                ('max_rate', models.FloatField(blank=True, null=True)),
+                ('note', models.CharField(blank=True, default='', max_length=255)),
+                ('crop', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='nutrient_rules', to='models_app.crop')),
+                ('crop_variety', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='nutrient_rules', to='models_app.cropvariety')),
+                ('soil_texture', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='nutrient_rules', to='models_app.soiltexture')),
+            ],
+            options={
+                'ordering': ('nutrient', 'direction', 'id'),
+            },
+        ),
+    ]
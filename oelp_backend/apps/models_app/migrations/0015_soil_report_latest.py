@@ -0,0 +1,31 @@
+# Generated by Django 4.2.15 on 2026-10-18 11:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_latest_soil_reports(apps, schema_editor):
+    Field = apps.get_model("models_app", "Field")
+    SoilReport = apps.get_model("models_app", "SoilReport")
+    newest = SoilReport.objects.filter(field=models.OuterRef("pk")).order_by("-id").values("id")[:1]
+    Field.objects.filter(pk__in=SoilReport.objects.values("field_id")).update(latest_soil_report=models.Subquery(newest))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models_app', '0014_nutrient_rule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='field',
+            name='latest_soil_report',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='latest_of_fields', to='models_app.soilreport'),
+        ),
+        migrations.AddIndex(
+            model_name='soilreport',
+            index=models.Index(fields=['field', '-id'], name='soilreport_field_latest_idx'),
+        ),
+        migrations.RunPython(backfill_latest_soil_reports, migrations.RunPython.noop),
+    ]
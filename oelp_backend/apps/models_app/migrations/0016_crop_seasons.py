@@ -0,0 +1,104 @@
+# Generated by Django 4.2.15 on 2026-10-18 11:16
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils import timezone
+
+
+def backfill_season_snapshots(apps, schema_editor):
+    CropLifecycleDates = apps.get_model("models_app", "CropLifecycleDates")
+    seasons = list(CropLifecycleDates.objects.select_related("field"))
+    for season in seasons:
+        area = season.field.area if isinstance(season.field.area, dict) else {}
+        hectares = area.get("hectares")
+        season.crop_id = season.field.crop_id
+        season.crop_variety_id = season.field.crop_variety_id
+        season.area_hectares = float(hectares) if isinstance(hectares, (int, float)) and hectares else None
+    CropLifecycleDates.objects.bulk_update(seasons, ["crop", "crop_variety", "area_hectares"], batch_size=1000)
+
+
+def close_duplicate_open_seasons(apps, schema_editor):
+    """Leave each field at most one unharvested row, so the one-open-season constraint can be added.
+
+    The row with the latest sowing date stays open. Older open rows are
+    closed on the last date they record; rows recording nothing are deleted.
+    """
+    CropLifecycleDates = apps.get_model("models_app", "CropLifecycleDates")
+    duplicated = (
+        CropLifecycleDates.objects.filter(harvesting_date__isnull=True)
+        .values("field_id")
+        .annotate(open_seasons=models.Count("id"))
+        .filter(open_seasons__gt=1)
+        .values_list("field_id", flat=True)
+    )
+    today = timezone.localdate()
+    for field_id in list(duplicated):
+        seasons = CropLifecycleDates.objects.filter(field_id=field_id, harvesting_date__isnull=True).order_by(
+            models.F("sowing_date").desc(nulls_last=True), "-id"
+        )
+        for season in list(seasons)[1:]:
+            dates = [d for d in (season.sowing_date, season.growth_start_date, season.flowering_date) if d]
+            if not dates and season.yield_amount is None:
+                season.delete()
+                continue
+            season.harvesting_date = max(dates) if dates else today
+            season.save(update_fields=["harvesting_date"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models_app', '0015_soil_report_latest'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='croplifecycledates',
+            options={'ordering': ('-sowing_date', '-id')},
+        ),
+        migrations.AddField(
+            model_name='croplifecycledates',
+            name='area_hectares',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='croplifecycledates',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='croplifecycledates',
+            name='crop',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='seasons', to='models_app.crop'),
+        ),
+        migrations.AddField(
+            model_name='croplifecycledates',
+            name='crop_variety',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='seasons', to='models_app.cropvariety'),
+        ),
+        migrations.AddField(
+            model_name='croplifecycledates',
+            name='season',
+            field=models.CharField(blank=True, default='', help_text="Label such as 'Kharif 2025'", max_length=50),
+        ),
+        migrations.AddField(
+            model_name='croplifecycledates',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='croplifecycledates',
+            name='field',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seasons', to='models_app.field'),
+        ),
+        migrations.AddIndex(
+            model_name='croplifecycledates',
+            index=models.Index(fields=['field', '-sowing_date', '-id'], name='lifecycle_field_timeline_idx'),
+        ),
+        migrations.RunPython(close_duplicate_open_seasons, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='croplifecycledates',
+            constraint=models.UniqueConstraint(condition=models.Q(('harvesting_date__isnull', True)), fields=('field',), name='lifecycle_one_open_season'),
+        ),
+        migrations.RunPython(backfill_season_snapshots, migrations.RunPython.noop),
+    ]
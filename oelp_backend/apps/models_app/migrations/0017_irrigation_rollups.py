@@ -0,0 +1,74 @@
+# Generated by Django 4.2.15 on 2026-10-18 11:19
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models.functions import Trunc
+
+
+def backfill_irrigation_rollups(apps, schema_editor):
+    FieldIrrigationPractice = apps.get_model("models_app", "FieldIrrigationPractice")
+    IrrigationRollup = apps.get_model("models_app", "IrrigationRollup")
+    for granularity in ("day", "week", "month"):
+        buckets = (
+            FieldIrrigationPractice.objects.annotate(period=Trunc("performed_at", granularity, output_field=models.DateField()))
+            .values("field_id", "field__user_id", "irrigation_method_id", "period")
+            .annotate(count=models.Count("id"))
+            .order_by()
+        )
+        IrrigationRollup.objects.bulk_create(
+            [
+                IrrigationRollup(
+                    user_id=bucket["field__user_id"],
+                    field_id=bucket["field_id"],
+                    irrigation_method_id=bucket["irrigation_method_id"],
+                    granularity=granularity,
+                    period_start=bucket["period"],
+                    events=bucket["count"],
+                )
+                for bucket in buckets
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models_app', '0016_crop_seasons'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fieldirrigationpractice',
+            name='duration_minutes',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='fieldirrigationpractice',
+            name='water_volume',
+            field=models.FloatField(blank=True, help_text='Water applied, in litres', null=True),
+        ),
+        migrations.CreateModel(
+            name='IrrigationRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('day', 'Day'), ('week', 'Week'), ('month', 'Month')], max_length=8)),
+                ('period_start', models.DateField()),
+                ('events', models.IntegerField(default=0)),
+                ('duration_minutes', models.FloatField(default=0)),
+                ('water_volume', models.FloatField(default=0)),
+                ('field', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='irrigation_rollups', to='models_app.field')),
+                ('irrigation_method', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='models_app.irrigationmethods')),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'granularity', 'period_start'], name='irrigation_rollup_user_idx'), models.Index(fields=['field', 'granularity', 'period_start'], name='irrigation_rollup_field_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='irrigationrollup',
+            constraint=models.UniqueConstraint(fields=('field', 'irrigation_method', 'granularity', 'period_start'), name='irrigation_rollup_bucket_uniq'),
+        ),
+        migrations.RunPython(backfill_irrigation_rollups, migrations.RunPython.noop),
+    ]
@@ -21,6 +21,12 @@ from .user_plan import (
 )  # noqa: F401
 from .notifications import Notification, SupportRequest  # noqa: F401
 from .token import UserAuthToken  # noqa: F401
+from .dashboard import DashboardSummary  # noqa: F401
+from .data_version import UserDataVersion  # noqa: F401
+from .report_job import ReportJob  # noqa: F401
+from .payment_event import PaymentWebhookEvent  # noqa: F401
+from .nutrient_rule import NutrientRule  # noqa: F401
+from .irrigation_rollup import IrrigationRollup  # noqa: F401
 from django.contrib.contenttypes.fields import GenericForeignKey  # noqa: F401
 from django.contrib.contenttypes.models import ContentType  # noqa: F401
 
@@ -43,3 +49,7 @@ class UserActivity(models.Model):
     class Meta:
         app_label = "models_app"
         ordering = ("-created_at",)
+        indexes = [
+            # Activity feed: keyset pagination of a user's activity on (created_at, id)
+            models.Index(fields=["user", "-created_at", "-id"], name="activity_user_keyset_idx"),
+        ]
@@ -12,6 +12,14 @@ class Notification(models.Model):
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of a receiver's notifications on (created_at, id)
+            models.Index(fields=["receiver", "-created_at", "-id"], name="notif_receiver_keyset_idx"),
+            # Unread counts only ever look at unread rows
+            models.Index(fields=["receiver"], condition=models.Q(is_read=False), name="notif_receiver_unread_idx"),
+        ]
+
     def __str__(self) -> str:  # pragma: no cover
         return f"Notification to {self.receiver}"
 
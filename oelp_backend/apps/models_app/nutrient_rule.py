@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from django.db import models
+
+from .crop_variety import Crop, CropVariety
+from .soil_report import NUTRIENT_FIELDS, SoilTexture
+
+
+class NutrientRule(models.Model):
+    """One fertilizer or amendment recommendation for a soil nutrient level.
+
+    A rule applies when the reported level is below (``raise``) or above
+    (``lower``) its threshold. Crop, variety and soil texture are optional;
+    left empty they match any. Where several rules cover the same report,
+    the most specific wins: a variety outranks a crop, which outranks a
+    soil texture.
+    """
+
+    class Direction(models.TextChoices):
+        RAISE = "raise", "Raise"
+        LOWER = "lower", "Lower"
+
+    nutrient = models.CharField(max_length=16, choices=[(name, name) for name in NUTRIENT_FIELDS])
+    direction = models.CharField(max_length=8, choices=Direction.choices, default=Direction.RAISE)
+    crop = models.ForeignKey(Crop, on_delete=models.CASCADE, related_name="nutrient_rules", blank=True, null=True)
+    crop_variety = models.ForeignKey(CropVariety, on_delete=models.CASCADE, related_name="nutrient_rules", blank=True, null=True)
+    soil_texture = models.ForeignKey(SoilTexture, on_delete=models.CASCADE, related_name="nutrient_rules", blank=True, null=True)
+    threshold = models.FloatField()
+    target = models.FloatField()
+    product = models.CharField(max_length=100)
+    # Dose in kg/ha: base_rate plus rate_per_unit for every unit of the gap
+    # between the reported level and the target, capped at max_rate
+    base_rate = models.FloatField(default=0)
+    rate_per_unit = models.FloatField(default=0)
+    max_rate = models.FloatField(blank=True, null=True)
+    note = models.CharField(max_length=255, blank=True, default="")
+
+    class Meta:
+        ordering = ("nutrient", "direction", "id")
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"NutrientRule({self.nutrient} {self.direction} {self.threshold} -> {self.product})"
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from django.db import models
+
+
+class PaymentWebhookEvent(models.Model):
+    """Inbox of payment gateway webhook events, stored as received and processed in batches.
+
+    The gateway's event id is unique, so redeliveries of an event collapse
+    into the row already stored.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        PROCESSED = "processed", "Processed"
+        IGNORED = "ignored", "Ignored"
+
+    event_id = models.CharField(max_length=64, unique=True)
+    event_type = models.CharField(max_length=64)
+    payload = models.JSONField()
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    # Why an event was ignored (unknown order, unhandled type, ...)
+    note = models.CharField(max_length=255, blank=True, default="")
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ("received_at", "id")
+        indexes = [
+            # The worker's queue: pending events in arrival order
+            models.Index(fields=["received_at", "id"], condition=models.Q(status="pending"), name="paymentevent_pending_idx"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"PaymentWebhookEvent({self.event_type}, {self.status})"
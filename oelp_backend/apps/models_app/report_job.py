@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from .user import CustomUser
+
+
+def report_upload_to(instance: "ReportJob", filename: str) -> str:
+    return f"reports/{instance.user_id}/{instance.cache_key}-{filename}"
+
+
+class ReportJob(models.Model):
+    class Kind(models.TextChoices):
+        FIELDS_PDF = "fields_pdf", "Fields PDF"
+        INVOICE_PDF = "invoice_pdf", "Invoice PDF"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="report_jobs")
+    kind = models.CharField(max_length=32, choices=Kind.choices)
+    params = models.JSONField(default=dict, blank=True)
+    # Digest of (user, kind, params, data version); identical requests reuse the job
+    cache_key = models.CharField(max_length=64, db_index=True)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    file = models.FileField(upload_to=report_upload_to, blank=True, null=True)
+    error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ("-created_at",)
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"ReportJob({self.kind}, {self.status})"
+
+    @classmethod
+    def fail_stale(cls, queryset=None, timeout: int = 0) -> int:
+        """Mark jobs pending or running for more than ``timeout`` seconds as failed; returns how many.
+
+        A worker that crashed mid-render never finishes its job, and the
+        job would otherwise be reused for its ``cache_key`` forever.
+        """
+        cutoff = timezone.now() - timedelta(seconds=timeout)
+        stale = Q(status=cls.Status.RUNNING, started_at__lt=cutoff) | Q(status=cls.Status.PENDING, created_at__lt=cutoff)
+        return (cls.objects.all() if queryset is None else queryset).filter(stale).update(
+            status=cls.Status.FAILED, error="Timed out", finished_at=timezone.now()
+        )
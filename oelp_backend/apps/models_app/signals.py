@@ -1,11 +1,21 @@
 from __future__ import annotations
 
 from django.apps import apps
-from django.db.models.signals import post_migrate, post_save
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_init, post_migrate, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 from django.db import connection
 from django.contrib.contenttypes.models import ContentType
 
+from .activity import ACTIVITY_TRACKED_MODELS, record_activity
+from .dashboard import DashboardSummary, field_hectares
+from .data_version import UserDataVersion
+from .field import CropLifecycleDates, Field, FieldIrrigationPractice
+from .irrigation_rollup import IrrigationRollup
+from .notifications import Notification
+from .soil_report import SoilReport
+from .user_plan import Transaction, UserPlan
+
 
 @receiver(post_migrate)
 def seed_core_data(sender, **kwargs):
@@ -47,6 +57,36 @@ def seed_core_data(sender, **kwargs):
         for name, icon in textures:
             SoilTexture.objects.get_or_create(name=name, defaults={"icon": icon})
 
+    # Seed generic nutrient rules (any crop) once; agronomists refine them in the admin
+    if "models_app_nutrientrule" in existing_tables and "models_app_soiltexture" in existing_tables:
+        NutrientRule = apps.get_model("models_app", "NutrientRule")
+        SoilTexture = apps.get_model("models_app", "SoilTexture")
+        if not NutrientRule.objects.exists():
+            textures = dict(SoilTexture.objects.values_list("name", "pk"))
+            # (nutrient, direction, soil texture, threshold, target, product, base, per unit, max)
+            rules = [
+                ("nitrogen", "raise", None, 280, 420, "Urea", 0, 2.17, 300),
+                ("phosphorous", "raise", None, 10, 17.5, "DAP", 0, 21.7, 250),
+                ("potassium", "raise", None, 110, 195, "MOP", 0, 1.67, 150),
+                ("zinc", "raise", None, 0.6, 0.6, "Zinc sulphate", 25, 0, None),
+                ("boron", "raise", None, 0.5, 0.5, "Borax", 10, 0, None),
+                ("iron", "raise", None, 4.5, 4.5, "Ferrous sulphate", 25, 0, None),
+                ("manganese", "raise", None, 2, 2, "Manganese sulphate", 20, 0, None),
+                ("copper", "raise", None, 0.2, 0.2, "Copper sulphate", 5, 0, None),
+                ("ph", "raise", None, 6.5, 6.5, "Agricultural lime", 0, 2500, 5000),
+                ("ph", "raise", "Sandy", 6.5, 6.5, "Agricultural lime", 0, 1500, 3000),
+                ("ph", "raise", "Clay", 6.5, 6.5, "Agricultural lime", 0, 3500, 7000),
+                ("ph", "lower", None, 8.5, 8.5, "Gypsum", 0, 2500, 5000),
+            ]
+            NutrientRule.objects.bulk_create([
+                NutrientRule(
+                    nutrient=nutrient, direction=direction, soil_texture_id=textures.get(texture) if texture else None,
+                    threshold=threshold, target=target, product=product, base_rate=base, rate_per_unit=per_unit, max_rate=cap,
+                )
+                for nutrient, direction, texture, threshold, target, product, base, per_unit, cap in rules
+                if texture is None or texture in textures
+            ])
+
     # Seed features/types (up to 3 feature types and 5 features)
     if "models_app_featuretype" in existing_tables and "models_app_feature" in existing_tables:
         FeatureType = apps.get_model("models_app", "FeatureType")
@@ -89,40 +129,28 @@ def seed_core_data(sender, **kwargs):
                 PlanFeature.objects.get_or_create(plan=plan, feature=f, defaults={"max_count": 1000, "duration_days": duration})
 
 
-# Basic activity logging for Field and SoilReport changes
-@receiver(post_save)
+# Basic activity logging for Field and SoilReport changes. The receiver is
+# connected per tracked model so other models' saves never reach it.
 def log_user_activity(sender, instance, created, **kwargs):
-    try:
-        models_module = sender.__module__
-    except Exception:
+    user_id = getattr(instance, "user_id", None)
+    if user_id is None and getattr(instance, "farm_id", None) is not None:
+        user_id = instance.farm.user_id
+    if not user_id:
         return
-    if not models_module.startswith("apps.models_app"):
-        return
-    # Only track selected models for now
-    track_models = {"Field", "SoilReport", "Crop", "CropVariety"}
-    model_name = sender.__name__
-    if model_name not in track_models:
-        return
-    user = getattr(instance, "user", None) or getattr(getattr(instance, "farm", None), "user", None)
-    if not user:
-        return
-    try:
-        Activity = apps.get_model("models_app", "UserActivity")
-        ct = ContentType.objects.get_for_model(sender)
-        action = "create" if created else "update"
-        Activity.objects.create(user=user, action=action, content_type=ct, object_id=instance.pk, description=f"{model_name} {action}")
-    except Exception:
-        pass
+    action = "create" if created else "update"
+    record_activity(user_id, action, sender, instance.pk, description=f"{sender.__name__} {action}")
+
 
+for _model_name in ACTIVITY_TRACKED_MODELS:
+    post_save.connect(
+        log_user_activity,
+        sender=apps.get_model("models_app", _model_name),
+        dispatch_uid=f"log_user_activity.{_model_name}",
+    )
 
-@receiver(post_save)
+
+@receiver(post_save, sender=Field)
 def replicate_field_image_to_asset(sender, instance, created, **kwargs):
-    try:
-        from .field import Field  # local import to avoid circulars at import time
-    except Exception:
-        return
-    if sender is not Field:
-        return
     if not getattr(instance, "image", None):
         return
     try:
@@ -134,3 +162,231 @@ def replicate_field_image_to_asset(sender, instance, created, **kwargs):
     except Exception:
         pass
 
+
+# Incremental maintenance of DashboardSummary. Instances remember the values
+# they were loaded with so a save only has to apply the difference.
+_UNKNOWN = object()
+
+
+def _field_dashboard_state(instance):
+    data = instance.__dict__
+    if not {"user_id", "is_active", "crop_id", "area"} <= data.keys():
+        return _UNKNOWN  # deferred fields; fall back to a rebuild
+    return (data["user_id"], data["is_active"], data["crop_id"], field_hectares(data["area"]))
+
+
+def _field_dashboard_deltas(state, sign, deltas):
+    if state is None or state is _UNKNOWN:
+        return
+    user_id, is_active, _, hectares = state
+    if user_id is None or not is_active:
+        return
+    user_deltas = deltas.setdefault(user_id, {"active_fields": 0, "total_hectares": 0.0})
+    user_deltas["active_fields"] += sign
+    user_deltas["total_hectares"] += sign * hectares
+
+
+@receiver(post_init, sender=Field)
+def remember_field_dashboard_state(sender, instance, **kwargs):
+    instance._dashboard_state = _field_dashboard_state(instance) if instance.pk else None
+
+
+@receiver(post_save, sender=Field)
+def update_dashboard_on_field_save(sender, instance, created, **kwargs):
+    old = getattr(instance, "_dashboard_state", None)
+    new = _field_dashboard_state(instance)
+    instance._dashboard_state = new
+    if old is _UNKNOWN or new is _UNKNOWN:
+        for user_id in {getattr(instance, "user_id", None)} - {None}:
+            DashboardSummary.rebuild(user_id)
+        return
+    deltas: dict = {}
+    _field_dashboard_deltas(old, -1, deltas)
+    _field_dashboard_deltas(new, 1, deltas)
+    for user_id, user_deltas in deltas.items():
+        DashboardSummary.apply_delta(user_id, **user_deltas)
+    # Active crops depend on lifecycle rows; recount only when membership can change
+    if old is not None and old[:3] != new[:3]:
+        for user_id in {old[0], new[0]} - {None}:
+            DashboardSummary.refresh_active_crops(user_id)
+
+
+@receiver(post_delete, sender=Field)
+def update_dashboard_on_field_delete(sender, instance, **kwargs):
+    state = _field_dashboard_state(instance)
+    if state is _UNKNOWN or state[0] is None:
+        return
+    deltas: dict = {}
+    _field_dashboard_deltas(state, -1, deltas)
+    for user_id, user_deltas in deltas.items():
+        DashboardSummary.apply_delta(user_id, **user_deltas)
+    DashboardSummary.refresh_active_crops(state[0])
+
+
+@receiver(post_save, sender=CropLifecycleDates)
+@receiver(post_delete, sender=CropLifecycleDates)
+def update_dashboard_on_lifecycle_change(sender, instance, **kwargs):
+    user_id = Field.objects.filter(pk=instance.field_id).values_list("user_id", flat=True).first()
+    if user_id is not None:
+        DashboardSummary.refresh_active_crops(user_id)
+        UserDataVersion.bump(user_id, "fields")
+
+
+@receiver(post_init, sender=Notification)
+def remember_notification_dashboard_state(sender, instance, **kwargs):
+    data = instance.__dict__
+    if not instance.pk:
+        instance._dashboard_state = None
+    elif {"receiver_id", "is_read"} <= data.keys():
+        instance._dashboard_state = (data["receiver_id"], data["is_read"])
+    else:
+        instance._dashboard_state = _UNKNOWN
+
+
+@receiver(post_save, sender=Notification)
+def update_dashboard_on_notification_save(sender, instance, created, **kwargs):
+    old = getattr(instance, "_dashboard_state", None)
+    new = (instance.receiver_id, instance.is_read)
+    instance._dashboard_state = new
+    if old is _UNKNOWN:
+        DashboardSummary.rebuild(instance.receiver_id)
+        return
+    if old == new:
+        return
+    if old is not None and not old[1]:
+        DashboardSummary.apply_delta(old[0], unread_notifications=-1)
+    if not new[1]:
+        DashboardSummary.apply_delta(new[0], unread_notifications=1)
+
+
+@receiver(post_delete, sender=Notification)
+def update_dashboard_on_notification_delete(sender, instance, **kwargs):
+    if not instance.is_read:
+        DashboardSummary.apply_delta(instance.receiver_id, unread_notifications=-1)
+
+
+# Per-user data versions behind conditional GETs (ETag / Last-Modified)
+@receiver(post_save, sender=Field)
+@receiver(post_delete, sender=Field)
+def bump_fields_version(sender, instance, **kwargs):
+    UserDataVersion.bump(instance.user_id, "fields")
+
+
+@receiver(post_save, sender=Notification)
+@receiver(post_delete, sender=Notification)
+def bump_notifications_version(sender, instance, **kwargs):
+    UserDataVersion.bump(instance.receiver_id, "notifications")
+
+
+@receiver(post_save, sender=UserPlan)
+@receiver(post_delete, sender=UserPlan)
+def bump_plans_version(sender, instance, **kwargs):
+    UserDataVersion.bump(instance.user_id, "plans")
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+def bump_transactions_version(sender, instance, **kwargs):
+    UserDataVersion.bump(instance.user_id, "transactions")
+
+
+@receiver(post_save, sender=FieldIrrigationPractice)
+@receiver(post_delete, sender=FieldIrrigationPractice)
+def bump_practices_version(sender, instance, **kwargs):
+    user_id = Field.objects.filter(pk=instance.field_id).values_list("user_id", flat=True).first()
+    UserDataVersion.bump(user_id, "practices")
+
+
+# Incremental maintenance of IrrigationRollup: practices remember the values
+# they were loaded with, and a save moves their contribution between buckets.
+def _practice_rollup_state(instance):
+    data = instance.__dict__
+    if not {"field_id", "irrigation_method_id", "performed_at", "duration_minutes", "water_volume"} <= data.keys():
+        return _UNKNOWN
+    return (data["field_id"], data["irrigation_method_id"], data["performed_at"], data["duration_minutes"] or 0, data["water_volume"] or 0)
+
+
+def _stored_practice_rollup_state(pk):
+    """The rollup state of a practice as stored, for instances loaded with deferred fields."""
+    row = (
+        FieldIrrigationPractice.objects.filter(pk=pk)
+        .values_list("field_id", "irrigation_method_id", "performed_at", "duration_minutes", "water_volume")
+        .first()
+    )
+    return None if row is None else (*row[:3], row[3] or 0, row[4] or 0)
+
+
+def _apply_practice_rollup(state, sign):
+    field_id, method_id, performed_at, minutes, volume = state
+    user_id = Field.objects.filter(pk=field_id).values_list("user_id", flat=True).first()
+    IrrigationRollup.apply_delta(user_id, field_id, method_id, performed_at, sign, sign * minutes, sign * volume)
+
+
+@receiver(post_init, sender=FieldIrrigationPractice)
+def remember_practice_rollup_state(sender, instance, **kwargs):
+    instance._rollup_state = _practice_rollup_state(instance) if instance.pk else None
+
+
+@receiver(pre_save, sender=FieldIrrigationPractice)
+@receiver(pre_delete, sender=FieldIrrigationPractice)
+def load_deferred_practice_rollup_state(sender, instance, **kwargs):
+    if instance.pk and getattr(instance, "_rollup_state", None) is _UNKNOWN:
+        instance._rollup_state = _stored_practice_rollup_state(instance.pk)
+
+
+@receiver(post_save, sender=FieldIrrigationPractice)
+def update_irrigation_rollups_on_save(sender, instance, created, **kwargs):
+    old = None if created else getattr(instance, "_rollup_state", None)
+    new = _practice_rollup_state(instance)
+    if new is _UNKNOWN:
+        new = _stored_practice_rollup_state(instance.pk)
+    instance._rollup_state = new
+    if old == new:
+        return
+    if old is not None:
+        _apply_practice_rollup(old, -1)
+    _apply_practice_rollup(new, 1)
+
+
+@receiver(post_delete, sender=FieldIrrigationPractice)
+def update_irrigation_rollups_on_delete(sender, instance, **kwargs):
+    state = _practice_rollup_state(instance)
+    if state is _UNKNOWN:
+        # Read before the row was deleted
+        state = instance._rollup_state
+    if state is not None:
+        _apply_practice_rollup(state, -1)
+
+
+@receiver(post_save, sender=SoilReport)
+@receiver(post_delete, sender=SoilReport)
+def bump_soil_reports_version(sender, instance, **kwargs):
+    user_id = Field.objects.filter(pk=instance.field_id).values_list("user_id", flat=True).first()
+    UserDataVersion.bump(user_id, "soil_reports")
+
+
+# Field.latest_soil_report: a new report can only move the pointer forward,
+# so creation is a single conditional UPDATE; moves and deletes recompute it.
+@receiver(post_init, sender=SoilReport)
+def remember_soil_report_field(sender, instance, **kwargs):
+    instance._loaded_field_id = instance.__dict__.get("field_id") if instance.pk else None
+
+
+@receiver(post_save, sender=SoilReport)
+def update_latest_soil_report_on_save(sender, instance, created, **kwargs):
+    old_field_id = getattr(instance, "_loaded_field_id", None)
+    instance._loaded_field_id = instance.field_id
+    if created:
+        Field.objects.filter(Q(latest_soil_report__isnull=True) | Q(latest_soil_report_id__lt=instance.pk), pk=instance.field_id).update(
+            latest_soil_report_id=instance.pk
+        )
+    elif old_field_id != instance.field_id:
+        Field.refresh_latest_soil_reports({old_field_id, instance.field_id} - {None})
+
+
+@receiver(post_delete, sender=SoilReport)
+def update_latest_soil_report_on_delete(sender, instance, **kwargs):
+    # SET_NULL has already cleared the pointer if it named this report
+    Field.refresh_latest_soil_reports(
+        Field.objects.filter(pk=instance.field_id, latest_soil_report__isnull=True).values_list("pk", flat=True)
+    )
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
 from django.db import models
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+# Measurement columns of SoilReport, in model order
+NUTRIENT_FIELDS = ("ph", "ec", "nitrogen", "phosphorous", "potassium", "boron", "copper", "iron", "zinc", "manganese")
 
 
 class SoilTexture(models.Model):
@@ -26,6 +31,19 @@ class SoilReport(models.Model):
     soil_type = models.ForeignKey(SoilTexture, on_delete=models.CASCADE)
     report_link = models.URLField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            # A field's reports newest first: the latest-report lookup and per-field history
+            models.Index(fields=["field", "-id"], name="soilreport_field_latest_idx"),
+        ]
+
     def __str__(self) -> str:  # pragma: no cover - trivial
         return f"SoilReport - {self.field.name}"
 
+
+
+def latest_per_field(queryset):
+    """The newest report of each field in ``queryset``, ranked with ROW_NUMBER() over the field's reports."""
+    return queryset.annotate(
+        field_rank=Window(RowNumber(), partition_by=[F("field_id")], order_by=F("id").desc())
+    ).filter(field_rank=1)
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from celery import shared_task
+
+from .activity import write_activity_events_now
+
+
+@shared_task
+def write_activity_events(events: list) -> int:
+    write_activity_events_now(events)
+    return len(events)
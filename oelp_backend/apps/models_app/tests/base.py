@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+
+class MigrationTestCase(TransactionTestCase):
+    """Runs ``migrate_to`` over rows written with the models of ``migrate_from``.
+
+    ``setUpBeforeMigration(apps)`` creates the rows; afterwards
+    ``self.apps`` holds the models as of ``migrate_to``.
+    """
+
+    app_label = "models_app"
+    migrate_from = ""
+    migrate_to = ""
+
+    def setUp(self):
+        super().setUp()
+        executor = MigrationExecutor(connection)
+        self.latest = executor.loader.graph.leaf_nodes(self.app_label)
+        executor.migrate([(self.app_label, self.migrate_from)])
+        self.setUpBeforeMigration(executor.loader.project_state((self.app_label, self.migrate_from)).apps)
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate([(self.app_label, self.migrate_to)])
+        self.apps = executor.loader.project_state((self.app_label, self.migrate_to)).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(self.latest)
+        super().tearDown()
+
+    def setUpBeforeMigration(self, apps):
+        pass
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.models_app.activity import activity_batch
+from apps.models_app.farm import Farm
+from apps.models_app.field import Field
+from apps.models_app.models import UserActivity
+from apps.models_app.user import CustomUser
+
+
+class ActivityBatchingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(username="farmer", phone_number="100")
+        cls.farm = Farm.objects.create(user=cls.user, name="Home")
+
+    def create_fields(self, count: int) -> None:
+        for index in range(count):
+            Field.objects.create(user=self.user, farm=self.farm, name=f"Field {index}")
+
+    def activity_inserts(self, queries) -> int:
+        table = UserActivity._meta.db_table
+        return sum(1 for query in queries if query["sql"].startswith(f'INSERT INTO "{table}"'))
+
+    def test_transaction_writes_one_insert(self):
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                with transaction.atomic():
+                    self.create_fields(5)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self.activity_inserts(queries), 1)
+        self.assertEqual(UserActivity.objects.filter(user=self.user, action="create").count(), 5)
+
+    def test_nothing_is_written_before_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            with transaction.atomic():
+                self.create_fields(3)
+        self.assertFalse(UserActivity.objects.exists())
+        callbacks[0]()
+        self.assertEqual(UserActivity.objects.count(), 3)
+
+    def test_rolled_back_savepoint_drops_its_events(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.create_fields(2)
+                try:
+                    with transaction.atomic():
+                        Field.objects.create(user=self.user, farm=self.farm, name="Discarded")
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+        self.assertEqual(UserActivity.objects.count(), 2)
+
+    def test_next_transaction_gets_a_new_batch(self):
+        for _ in range(2):
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                with transaction.atomic():
+                    self.create_fields(2)
+            self.assertEqual(len(callbacks), 1)
+        self.assertEqual(UserActivity.objects.count(), 4)
+
+    def test_committed_events_join_the_request_batch(self):
+        with CaptureQueriesContext(connection) as queries:
+            with activity_batch():
+                for _ in range(3):
+                    with self.captureOnCommitCallbacks(execute=True):
+                        with transaction.atomic():
+                            self.create_fields(2)
+                self.assertFalse(UserActivity.objects.exists())
+        self.assertEqual(self.activity_inserts(queries), 1)
+        self.assertEqual(UserActivity.objects.count(), 6)
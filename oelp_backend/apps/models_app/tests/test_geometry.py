@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.models_app.farm import Farm
+from apps.models_app.field import Field
+from apps.models_app.geometry import boundary_bounds, boundary_contains, boundary_error, measure_boundaries, measure_boundary
+from apps.models_app.user import CustomUser
+
+
+def square(lon: float, lat: float, size: float) -> list:
+    return [[lon, lat], [lon + size, lat], [lon + size, lat + size], [lon, lat + size], [lon, lat]]
+
+
+SQUARE = {"type": "Polygon", "coordinates": [square(0, 0, 0.01)]}
+MALFORMED = [
+    {"type": "MultiPolygon", "coordinates": [1]},
+    {"type": "Polygon", "coordinates": 5},
+    {"type": "Polygon", "coordinates": [5]},
+    {"type": "Polygon", "coordinates": [[["a", 0], [1, 0], [1, 1], ["a", 0]]]},
+    {"type": "Point", "coordinates": [0, 0]},
+    "not geojson",
+]
+
+
+class GeometryTests(TestCase):
+    def test_square_area_and_centroid(self):
+        measured = measure_boundary(SQUARE)
+        # 0.01° x 0.01° at the equator is about 1.2364 km²
+        self.assertAlmostEqual(measured["hectares"], 123.64, delta=0.05)
+        self.assertEqual(measured["centroid"], [0.005, 0.005])
+
+    def test_hole_is_subtracted(self):
+        holed = {"type": "Polygon", "coordinates": [square(0, 0, 0.01), square(0.0025, 0.0025, 0.005)]}
+        self.assertAlmostEqual(measure_boundary(holed)["hectares"], 123.64 * 0.75, delta=0.05)
+        self.assertFalse(boundary_contains(holed, 0.005, 0.005))
+        self.assertTrue(boundary_contains(holed, 0.001, 0.001))
+
+    def test_batch_keeps_positions(self):
+        results = measure_boundaries([None, SQUARE, MALFORMED[0]])
+        self.assertIsNone(results[0])
+        self.assertIsNotNone(results[1])
+        self.assertIsNone(results[2])
+        self.assertEqual(boundary_bounds([SQUARE, None]), [(0.0, 0.0, 0.01, 0.01), None])
+
+    def test_malformed_boundaries_are_unmeasurable(self):
+        for boundary in MALFORMED:
+            with self.subTest(boundary=boundary):
+                measure_boundary(boundary)
+                boundary_bounds([boundary])
+                self.assertFalse(boundary_contains(boundary, 0.005, 0.005))
+                self.assertIsNotNone(boundary_error(boundary))
+
+    def test_well_formed_boundaries_have_no_error(self):
+        self.assertIsNone(boundary_error(SQUARE))
+        self.assertIsNone(boundary_error({"type": "Feature", "geometry": {"type": "MultiPolygon", "coordinates": [[square(1, 1, 1)]]}}))
+        self.assertEqual(
+            boundary_error({"type": "Polygon", "coordinates": [square(0, 0, 1)[:-1] + [[9, 9]]]}),
+            "Each ring must be closed: its first and last positions must be equal.",
+        )
+
+
+class FieldAreaTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(username="farmer", phone_number="100")
+        cls.farm = Farm.objects.create(user=cls.user, name="Home")
+
+    def test_save_derives_area_and_bounds(self):
+        field = Field.objects.create(user=self.user, farm=self.farm, name="North", boundary=SQUARE)
+        self.assertAlmostEqual(field.area["hectares"], 123.64, delta=0.05)
+        self.assertEqual((field.min_lon, field.max_lat), (0.0, 0.01))
+
+    def test_malformed_boundary_saves_without_area(self):
+        field = Field.objects.create(user=self.user, farm=self.farm, name="North", boundary=MALFORMED[0])
+        self.assertIsNone(field.area)
+        self.assertIsNone(field.min_lon)
+
+    def test_removing_boundary_clears_area(self):
+        field = Field.objects.create(user=self.user, farm=self.farm, name="North", boundary=SQUARE)
+        field.boundary = None
+        field.save()
+        field.refresh_from_db()
+        self.assertIsNone(field.area)
+        self.assertIsNone(field.min_lon)
+
+    def test_manual_area_without_boundary_is_kept(self):
+        field = Field.objects.create(user=self.user, farm=self.farm, name="North", area={"hectares": 2})
+        self.assertEqual(field.area, {"hectares": 2})
+
+    def test_backfill_matches_save(self):
+        stale = {"hectares": 9, "centroid": [1, 1]}
+        measurable = Field.objects.create(user=self.user, farm=self.farm, name="A")
+        broken = Field.objects.create(user=self.user, farm=self.farm, name="B", boundary=SQUARE)
+        manual = Field.objects.create(user=self.user, farm=self.farm, name="C", area={"hectares": 2})
+        # Rows written around save(), e.g. before the columns existed
+        Field.objects.filter(pk=measurable.pk).update(boundary=SQUARE)
+        Field.objects.filter(pk=broken.pk).update(boundary=MALFORMED[0], area=stale)
+        call_command("backfill_field_areas", stdout=StringIO())
+        for field in (measurable, broken, manual):
+            field.refresh_from_db()
+        self.assertAlmostEqual(measurable.area["hectares"], 123.64, delta=0.05)
+        self.assertEqual(measurable.max_lon, 0.01)
+        self.assertEqual((broken.area, broken.min_lon), (None, None))
+        self.assertEqual(manual.area, {"hectares": 2})
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.api.irrigation_series import compact_irrigation_history
+from apps.models_app.farm import Farm
+from apps.models_app.field import Field, FieldIrrigationPractice
+from apps.models_app.irrigation import IrrigationMethods
+from apps.models_app.irrigation_rollup import IrrigationRollup
+from apps.models_app.user import CustomUser
+
+
+@override_settings(IRRIGATION_RAW_RETENTION_DAYS=400, IRRIGATION_DAILY_ROLLUP_RETENTION_DAYS=100)
+class IrrigationRollupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(username="farmer", phone_number="100")
+        cls.field = Field.objects.create(user=cls.user, farm=Farm.objects.create(user=cls.user, name="Home"), name="North")
+        cls.drip = IrrigationMethods.objects.create(name="Drip")
+        cls.flood = IrrigationMethods.objects.create(name="Flood")
+
+    def irrigate(self, days_ago: float, minutes: float = 30, method=None) -> FieldIrrigationPractice:
+        return FieldIrrigationPractice.objects.create(
+            field=self.field,
+            irrigation_method=method or self.drip,
+            performed_at=timezone.now() - timedelta(days=days_ago),
+            duration_minutes=minutes,
+            water_volume=minutes * 10,
+        )
+
+    def buckets(self, granularity: str) -> dict:
+        return {
+            (row.irrigation_method_id, row.period_start): (row.events, row.duration_minutes)
+            for row in IrrigationRollup.objects.filter(field=self.field, granularity=granularity)
+        }
+
+    def test_writes_update_every_granularity(self):
+        practice = self.irrigate(2, 30)
+        self.irrigate(2, 15)
+        for granularity in IrrigationRollup.Granularity.values:
+            self.assertEqual(list(self.buckets(granularity).values()), [(2, 45.0)])
+        practice.delete()
+        self.assertEqual(list(self.buckets("month").values()), [(1, 15.0)])
+
+    def test_moving_an_event_moves_its_contribution(self):
+        practice = self.irrigate(2, 30)
+        practice.irrigation_method = self.flood
+        practice.save()
+        self.assertEqual([method for method, _ in self.buckets("day")], [self.flood.pk])
+
+    def test_deferred_save_and_delete_apply_stored_values(self):
+        practice = self.irrigate(2, 30)
+        deferred = FieldIrrigationPractice.objects.only("id").get(pk=practice.pk)
+        deferred.duration_minutes = 50
+        deferred.save()
+        self.assertEqual(list(self.buckets("week").values()), [(1, 50.0)])
+        FieldIrrigationPractice.objects.defer("duration_minutes").get(pk=practice.pk).delete()
+        self.assertEqual(self.buckets("week"), {})
+
+    def test_compaction_keeps_weekly_and_monthly_totals(self):
+        self.irrigate(500, 20)
+        self.irrigate(200, 10)
+        self.irrigate(2, 5)
+        months = self.buckets("month")
+        removed = compact_irrigation_history()
+        self.assertEqual(removed["raw_events"], 1)
+        self.assertEqual(FieldIrrigationPractice.objects.count(), 2)
+        self.assertEqual(self.buckets("month"), months)
+        self.assertEqual(len(self.buckets("day")), 1)
+
+    def test_rebuild_after_compaction_keeps_compacted_history(self):
+        self.irrigate(500, 20)
+        self.irrigate(2, 5)
+        compact_irrigation_history()
+        months = self.buckets("month")
+        IrrigationRollup.objects.filter(granularity="month").update(events=99)
+        IrrigationRollup.rebuild([self.field.pk])
+        rebuilt = self.buckets("month")
+        self.assertEqual(len(rebuilt), 2)
+        old_month = min(period for _, period in months)
+        self.assertEqual(rebuilt[(self.drip.pk, old_month)][0], 99)
+        self.assertEqual(sorted(rebuilt.values())[0], (1, 5.0))
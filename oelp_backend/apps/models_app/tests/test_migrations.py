@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from datetime import date
+
+from .base import MigrationTestCase
+
+SQUARE = {"type": "Polygon", "coordinates": [[[0, 0], [0.01, 0], [0.01, 0.01], [0, 0.01], [0, 0]]]}
+
+
+class FieldBoundsMigrationTests(MigrationTestCase):
+    migrate_from = "0006_reportjob"
+    migrate_to = "0007_field_bbox"
+
+    def setUpBeforeMigration(self, apps):
+        user = apps.get_model("models_app", "CustomUser").objects.create(username="farmer", phone_number="100")
+        farm = apps.get_model("models_app", "Farm").objects.create(user=user, name="Home")
+        Field = apps.get_model("models_app", "Field")
+        Field.objects.create(user=user, farm=farm, name="Square", boundary=SQUARE)
+        Field.objects.create(user=user, farm=farm, name="Broken", boundary={"type": "MultiPolygon", "coordinates": [1]})
+        Field.objects.create(user=user, farm=farm, name="Empty")
+
+    def test_existing_fields_get_bounds(self):
+        bounds = dict(
+            (name, (min_lon, min_lat, max_lon, max_lat))
+            for name, min_lon, min_lat, max_lon, max_lat in self.apps.get_model("models_app", "Field")
+            .objects.values_list("name", "min_lon", "min_lat", "max_lon", "max_lat")
+        )
+        self.assertEqual(bounds["Square"], (0.0, 0.0, 0.01, 0.01))
+        self.assertEqual(bounds["Broken"], (None,) * 4)
+        self.assertEqual(bounds["Empty"], (None,) * 4)
+
+
+class OpenSeasonMigrationTests(MigrationTestCase):
+    migrate_from = "0015_soil_report_latest"
+    migrate_to = "0016_crop_seasons"
+
+    def setUpBeforeMigration(self, apps):
+        user = apps.get_model("models_app", "CustomUser").objects.create(username="farmer", phone_number="100")
+        farm = apps.get_model("models_app", "Farm").objects.create(user=user, name="Home")
+        crop = apps.get_model("models_app", "Crop").objects.create(name="Test Wheat")
+        field = apps.get_model("models_app", "Field").objects.create(user=user, farm=farm, name="North", crop=crop, area={"hectares": 2})
+        Season = apps.get_model("models_app", "CropLifecycleDates")
+        self.older = Season.objects.create(field=field, sowing_date=date(2025, 6, 1), flowering_date=date(2025, 8, 1)).pk
+        self.current = Season.objects.create(field=field, sowing_date=date(2026, 6, 1)).pk
+        self.empty = Season.objects.create(field=field).pk
+        self.crop = crop.pk
+
+    def test_duplicate_open_seasons_are_closed(self):
+        seasons = {
+            season.pk: season for season in self.apps.get_model("models_app", "CropLifecycleDates").objects.all()
+        }
+        self.assertEqual(set(seasons), {self.older, self.current})
+        self.assertEqual(seasons[self.older].harvesting_date, date(2025, 8, 1))
+        self.assertIsNone(seasons[self.current].harvesting_date)
+        self.assertEqual((seasons[self.current].crop_id, seasons[self.current].area_hectares), (self.crop, 2))
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+
+class QueryPlanTests(TestCase):
+    def test_endpoints_stay_within_query_budget(self):
+        out = StringIO()
+        # Raises CommandError on a budget overrun or an unindexed plan
+        call_command("check_query_plans", stdout=out)
+        self.assertIn("All endpoints within query budget", out.getvalue())
@@ -1,17 +1,32 @@
 from __future__ import annotations
 
+import hashlib
+
 from django.db import models
 from django.utils import timezone
 
 from .user import CustomUser
 
 
+def digest_token(raw_token: str) -> str:
+    """Fixed-length lookup key for a bearer token (hex SHA-256)."""
+    return hashlib.sha256(raw_token.encode("utf-8")).hexdigest()
+
+
 class UserAuthToken(models.Model):
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, related_name="auth_token")
     access_token = models.TextField()
+    # Indexed digest of access_token; authentication looks tokens up by this column
+    token_digest = models.CharField(max_length=64, unique=True, null=True, blank=True, editable=False)
     last_login = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str:  # pragma: no cover - trivial
         username = self.user.username or self.user.email
         return f"{username} - Auth Token"
 
+    def save(self, *args, **kwargs):
+        self.token_digest = digest_token(self.access_token) if self.access_token else None
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "access_token" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "token_digest"}
+        super().save(*args, **kwargs)
@@ -9,7 +9,7 @@ from django.utils import timezone
 class CustomUserManager(BaseUserManager):
     use_in_migrations = True
 
-    def create_user(self, username: str, password: str | None = None, **extra_fields):
+    def create_user(self, username: str, password: str | None = None, *, password_hash: str | None = None, **extra_fields):
         if not username:
             raise ValueError("Users must have a username")
         # Auto-generate email if not provided, as per product spec
@@ -17,7 +17,10 @@ class CustomUserManager(BaseUserManager):
         email = self.normalize_email(email)
         extra_fields["email"] = email
         user = self.model(username=username, **extra_fields)
-        if password:
+        if password_hash:
+            # Already hashed by the caller (e.g. in the hashing pool)
+            user.password = password_hash
+        elif password:
             user.set_password(password)
         else:
             user.set_unusable_password()
@@ -18,6 +18,12 @@ class UserPlan(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # A user's active plan(s)
+            models.Index(fields=["user"], condition=models.Q(is_active=True), name="userplan_user_active_idx"),
+        ]
+
 
 class PlanFeatureUsage(models.Model):
     user_plan = models.ForeignKey(UserPlan, on_delete=models.CASCADE, related_name="feature_usages")
@@ -47,6 +53,18 @@ class Transaction(models.Model):
     currency = models.CharField(max_length=10, default="USD")
     status = models.CharField(max_length=20, default="paid")
     invoice_pdf = models.URLField(blank=True, null=True)
+    # Order at the payment gateway, and the client's key that makes creating it idempotent
+    gateway_order_id = models.CharField(max_length=64, unique=True, null=True, blank=True)
+    idempotency_key = models.CharField(max_length=64, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of a user's transactions on (created_at, id)
+            models.Index(fields=["user", "-created_at", "-id"], name="txn_user_keyset_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "idempotency_key"], name="txn_user_idempotency_key_uniq"),
+        ]
+
@@ -1,4 +1,6 @@
 from __future__ import annotations
 
-__all__ = []
+from .celery import app as celery_app
+
+__all__ = ["celery_app"]
 
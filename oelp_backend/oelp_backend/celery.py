@@ -0,0 +1,20 @@
+import os
+
+from celery import Celery
+from celery.signals import worker_init
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "oelp_backend.settings")
+
+app = Celery("oelp_backend")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
+
+
+@worker_init.connect
+def refuse_in_process_notification_broker(**kwargs):
+    """Notification events published by tasks never reach the web process's streams through the in-process broker."""
+    from apps.api.notification_stream import uses_in_process_broker
+
+    if uses_in_process_broker():
+        # Celery only logs exceptions raised by signal receivers, so exit outright
+        raise SystemExit("NOTIFICATION_BROKER 'memory' does not reach the web process from a worker; set REDIS_URL or NOTIFICATION_BROKER=redis.")
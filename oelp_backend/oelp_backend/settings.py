@@ -47,13 +47,14 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "apps.api.middleware.AsyncWhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "apps.api.middleware.ActivityBatchMiddleware",
 ]
 
 ROOT_URLCONF = "oelp_backend.urls"
@@ -162,17 +163,91 @@ REST_FRAMEWORK = {
 
 SPECTACULAR_SETTINGS = {"TITLE": "OELP API", "VERSION": "1.0.0"}
 
+# ------------------- AUTH TOKEN CACHE -------------------
+# Per-process LRU of verified tokens; TTL bounds staleness across workers
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+AUTH_TOKEN_CACHE_TTL = int(os.getenv("AUTH_TOKEN_CACHE_TTL", "60"))
+# Cached Role rows (per process) and role memberships (shared cache)
+ROLE_CACHE_TTL = int(os.getenv("ROLE_CACHE_TTL", "300"))
+
+# ------------------- CACHE -------------------
+# Redis makes cached catalogs and their versions shared by every worker
+REDIS_URL = os.getenv("REDIS_URL", "")
+if REDIS_URL:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": REDIS_URL}}
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "oelp"}}
+CATALOG_CACHE_TIMEOUT = int(os.getenv("CATALOG_CACHE_TIMEOUT", "86400"))
+# Without Redis, per-process catalog versions expire after this many seconds
+CATALOG_CACHE_LOCAL_TTL = int(os.getenv("CATALOG_CACHE_LOCAL_TTL", "30"))
+# Upper bound on how long a user's resolved plan-feature limits stay cached
+ENTITLEMENT_CACHE_TIMEOUT = int(os.getenv("ENTITLEMENT_CACHE_TIMEOUT", "3600"))
+# Soil analytics payloads, keyed by the user's data versions
+SOIL_ANALYTICS_CACHE_TIMEOUT = int(os.getenv("SOIL_ANALYTICS_CACHE_TIMEOUT", "3600"))
+# Crop season statistics, keyed the same way
+CROP_SEASON_STATS_CACHE_TIMEOUT = int(os.getenv("CROP_SEASON_STATS_CACHE_TIMEOUT", "3600"))
+
+# ------------------- NOTIFICATION STREAM -------------------
+# "memory" only reaches streams in the same process; use "redis" with several workers
+NOTIFICATION_BROKER = os.getenv("NOTIFICATION_BROKER", "redis" if REDIS_URL else "memory")
+NOTIFICATION_STREAM_KEEPALIVE = int(os.getenv("NOTIFICATION_STREAM_KEEPALIVE", "15"))
+NOTIFICATION_STREAM_MAX_AGE = int(os.getenv("NOTIFICATION_STREAM_MAX_AGE", "600"))
+NOTIFICATION_STREAM_RETRY_MS = int(os.getenv("NOTIFICATION_STREAM_RETRY_MS", "3000"))
+NOTIFICATION_STREAM_REPLAY_LIMIT = int(os.getenv("NOTIFICATION_STREAM_REPLAY_LIMIT", "100"))
+# Lifetime (seconds) of the stream-only tickets EventSource passes as ?ticket=
+NOTIFICATION_STREAM_TICKET_TTL = int(os.getenv("NOTIFICATION_STREAM_TICKET_TTL", "60"))
+NOTIFICATION_FANOUT_BATCH_SIZE = int(os.getenv("NOTIFICATION_FANOUT_BATCH_SIZE", "1000"))
+
 # ------------------- THIRD PARTY KEYS -------------------
 RAZORPAY_KEY_ID = os.getenv("RAZORPAY_KEY_ID", "")
 RAZORPAY_KEY_SECRET = os.getenv("RAZORPAY_KEY_SECRET", "")
+RAZORPAY_WEBHOOK_SECRET = os.getenv("RAZORPAY_WEBHOOK_SECRET", "")
+
+# ------------------- PAYMENTS -------------------
+# "razorpay", "fake" (in-memory, for local runs and load tests) or a dotted class path
+PAYMENT_GATEWAY = os.getenv("PAYMENT_GATEWAY", "razorpay")
+PAYMENT_GATEWAY_CONNECT_TIMEOUT = float(os.getenv("PAYMENT_GATEWAY_CONNECT_TIMEOUT", "3"))
+PAYMENT_GATEWAY_TIMEOUT = float(os.getenv("PAYMENT_GATEWAY_TIMEOUT", "10"))
+PAYMENT_GATEWAY_RETRIES = int(os.getenv("PAYMENT_GATEWAY_RETRIES", "2"))
+PAYMENT_GATEWAY_BACKOFF = float(os.getenv("PAYMENT_GATEWAY_BACKOFF", "0.3"))
+PAYMENT_GATEWAY_POOL_SIZE = int(os.getenv("PAYMENT_GATEWAY_POOL_SIZE", "10"))
+FAKE_GATEWAY_LATENCY_MS = int(os.getenv("FAKE_GATEWAY_LATENCY_MS", "0"))
+FAKE_GATEWAY_WEBHOOK_SECRET = os.getenv("FAKE_GATEWAY_WEBHOOK_SECRET", "fake-webhook-secret")
+# Webhook events applied per transaction by the background worker
+PAYMENT_EVENTS_BATCH_SIZE = int(os.getenv("PAYMENT_EVENTS_BATCH_SIZE", "200"))
 
 # ------------------- CELERY -------------------
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", CELERY_BROKER_URL)
+# Run tasks inline (e.g. with CELERY_BROKER_URL=memory://) for tests and local dev without Redis
+CELERY_TASK_ALWAYS_EAGER = os.getenv("CELERY_TASK_ALWAYS_EAGER", "false").lower() == "true"
+CELERY_TASK_EAGER_PROPAGATES = True
+
+# Daily irrigation history compaction (see compact_irrigation_history)
+CELERY_BEAT_SCHEDULE = {
+    "compact-irrigation-history": {"task": "apps.api.tasks.compact_irrigation_history", "schedule": 24 * 60 * 60},
+}
+
+# ------------------- REPORTS -------------------
+# Synchronous PDF exports above this many fields are queued as report jobs instead
+REPORT_SYNC_MAX_ROWS = int(os.getenv("REPORT_SYNC_MAX_ROWS", "500"))
+# Report jobs pending or running longer than this (seconds) are treated as failed and resubmitted
+REPORT_JOB_TIMEOUT = int(os.getenv("REPORT_JOB_TIMEOUT", "900"))
+
+# ------------------- IRRIGATION HISTORY -------------------
+# Raw irrigation events older than this are deleted; weekly and monthly rollups keep their totals
+IRRIGATION_RAW_RETENTION_DAYS = int(os.getenv("IRRIGATION_RAW_RETENTION_DAYS", "730"))
+# Daily rollups older than this are deleted; weekly and monthly rollups are kept
+IRRIGATION_DAILY_ROLLUP_RETENTION_DAYS = int(os.getenv("IRRIGATION_DAILY_ROLLUP_RETENTION_DAYS", "400"))
+IRRIGATION_COMPACTION_BATCH_SIZE = int(os.getenv("IRRIGATION_COMPACTION_BATCH_SIZE", "5000"))
+
+# ------------------- ACTIVITY LOG -------------------
+# Hand buffered UserActivity batches to a Celery worker instead of inserting inline
+ACTIVITY_LOG_ASYNC = os.getenv("ACTIVITY_LOG_ASYNC", "false").lower() == "true"
 
 # ------------------- PASSWORDS -------------------
 PASSWORD_HASHERS = [
-    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "apps.api.password_hashing.ConfigurableArgon2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
     "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
@@ -186,6 +261,19 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 AUTH_USER_MODEL = "models_app.CustomUser"
+# ModelBackend with password checks in the bounded hashing pool
+AUTHENTICATION_BACKENDS = ["apps.api.password_hashing.PooledHashingBackend"]
+
+# ------------------- PASSWORD HASHING -------------------
+# Argon2 cost (Django's defaults); raise until login p95 nears the latency SLO,
+# watching the Server-Timing header on login/signup responses
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "2"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "102400"))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "8"))
+# Concurrent hashes per process, extra requests allowed to queue, and how long they may wait (s)
+PASSWORD_HASHING_WORKERS = int(os.getenv("PASSWORD_HASHING_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASHING_MAX_PENDING = int(os.getenv("PASSWORD_HASHING_MAX_PENDING", "32"))
+PASSWORD_HASHING_WAIT_TIMEOUT = float(os.getenv("PASSWORD_HASHING_WAIT_TIMEOUT", "5"))
 
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = os.getenv("DJANGO_TIME_ZONE", "UTC")